@@ -0,0 +1,29 @@
+"""
+Board generation benchmark.
+
+Times every registered generator across board sizes up to 500x500 and prints
+the time per cell, which should stay flat if generation is linear.
+
+Usage (from the client folder):
+  python -m benchmarks.bench_board_generation
+"""
+import time
+from engine.maps.generators import generateBoard, getGeneratorNames
+
+SIZES = [(30, 15), (60, 30), (120, 60), (250, 250), (500, 500)]
+
+def benchGenerator(algorithm, width, height, seed=1234):
+  start = time.perf_counter()
+  generateBoard(width, height, seed, algorithm)
+  return time.perf_counter() - start
+
+def main():
+  print(f"{'generator':<12} {'size':>9} {'seconds':>10} {'us/cell':>9}")
+  for algorithm in getGeneratorNames():
+    for width, height in SIZES:
+      elapsed = benchGenerator(algorithm, width, height)
+      perCell = elapsed / (width * height) * 1e6
+      print(f"{algorithm:<12} {f'{width}x{height}':>9} {elapsed:>10.4f} {perCell:>9.3f}")
+
+if __name__ == '__main__':
+  main()
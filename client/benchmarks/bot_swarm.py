@@ -0,0 +1,521 @@
+"""
+Bot swarm load test.
+
+Runs N complete game clients headless (GameClient on a NullTerminal) against a
+running server. Each bot has its own Player, maps, Party and socket and plays
+through the same code paths as a person would: it walks through the city to the
+dungeon portal, hunts the enemies of each stage (answering combat with attacks),
+takes the portal to the next stage and respawns in the city when it dies. Bots
+are grouped into parties: the first bot of each group invites the others, who
+accept the invite.
+
+Reported:
+  - events sent/received per second (total and per event name)
+  - server fan-out latency: time from a bot emitting a 'move' to another bot on
+    the same map receiving it in a 'moved' delta (includes the server's tick batching)
+  - client CPU per bot: CPU time of the bot's game thread, and of the whole process
+    (socket threads included) divided by the number of bots
+  - move prediction: moves acked and replayed, corrections (the bot's predicted
+    position disagreed with the server's) and moves the server refused
+
+Bots run in threads, not asyncio: map transitions sleep, exactly like they do for
+a person at a terminal. Combat runs as a scene of the game loop, fed by the same
+scripted keys.
+
+Usage (from the client folder, with the server running):
+  python -m benchmarks.bot_swarm
+  python -m benchmarks.bot_swarm --bots 100 --party-size 4 --duration 60 --move-rate 5
+"""
+import argparse
+import bisect
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+import socketio
+from engine.core.game_client import GameClient
+from engine.core.null_terminal import NullTerminal, ScriptedInput
+from game.entities.player import Player
+from game.maps.city import City
+from game.maps.dungeon import Dungeon
+from game.maps.map_transition import DungeonToCityTransition
+from game.party import Party
+from game.server import Server
+
+MOVE_KEYS = {(-1, 0): 'w', (1, 0): 's', (0, -1): 'a', (0, 1): 'd'}
+SENT_MOVES_KEPT = 64  # Recent positions per bot kept to match 'moved' deltas against
+RENDER_LOCK = threading.Lock()  # GameClient.draw redirects the process-wide stdout
+
+class LatencyHistogram:
+  """Log-bucketed latency histogram (0.1ms to ~100s, 5% resolution) with O(1) memory"""
+
+  def __init__(self, lowest=0.0001, highest=100.0, growth=1.05):
+    count = int(math.log(highest / lowest) / math.log(growth)) + 1
+    self.bounds = [lowest * growth ** i for i in range(count)]
+    self.buckets = [0] * (count + 1)
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+
+  def record(self, seconds):
+    self.buckets[bisect.bisect_left(self.bounds, seconds)] += 1
+    self.count += 1
+    self.total += seconds
+    self.max = max(self.max, seconds)
+
+  def merge(self, other):
+    for i, value in enumerate(other.buckets):
+      self.buckets[i] += value
+    self.count += other.count
+    self.total += other.total
+    self.max = max(self.max, other.max)
+
+  def percentile(self, fraction):
+    """Upper bound of the bucket holding the given fraction of the samples"""
+    if self.count == 0:
+      return 0.0
+    target = fraction * self.count
+    seen = 0
+    for i, value in enumerate(self.buckets):
+      seen += value
+      if seen >= target:
+        return self.bounds[i] if i < len(self.bounds) else self.max
+    return self.max
+
+  def mean(self):
+    return self.total / self.count if self.count else 0.0
+
+class CountingClient(socketio.Client):
+  """socket.io client that counts the events it sends and handles and measures move fan-out"""
+
+  def __init__(self, registry, **kwargs):
+    super().__init__(**kwargs)
+    self.registry = registry  # Player name -> CountingClient of every bot
+    self.sent = Counter()
+    self.received = Counter()
+    self.sentMoves = {}  # Position -> perf_counter() when this bot sent it
+    self.sentOrder = deque()
+    self.latency = LatencyHistogram()
+
+  def emit(self, event, data=None, *args, **kwargs):
+    self.sent[event] += 1
+    if event == 'move':
+      position = tuple(json.loads(data)['playerPosition'])
+      if position not in self.sentMoves:
+        self.sentOrder.append(position)
+        if len(self.sentOrder) > SENT_MOVES_KEPT:
+          self.sentMoves.pop(self.sentOrder.popleft(), None)
+      self.sentMoves[position] = time.perf_counter()
+    return super().emit(event, data, *args, **kwargs)
+
+  def on(self, event, handler=None, namespace=None):
+    if handler is None:
+      return super().on(event, handler, namespace)
+
+    def counted(*args):
+      self.received[event] += 1
+      if event == 'moved' and args:
+        self.measureFanOut(args[0])
+      return handler(*args)
+    return super().on(event, counted, namespace)
+
+  def measureFanOut(self, data):
+    """Latency of every other bot's move in a 'moved' delta"""
+    now = time.perf_counter()
+    for player in data.get('players', []):
+      sender = self.registry.get(player['playerId'])
+      if sender is None or sender is self:
+        continue
+      sentAt = sender.sentMoves.get(tuple(player['playerPosition']))
+      if sentAt is not None and sentAt <= now:
+        self.latency.record(now - sentAt)
+
+class Bot:
+  """One headless game client driven by a simple brain"""
+
+  def __init__(self, index, args, registry, stopEvent, measureEvent):
+    self.index = index
+    self.args = args
+    self.stopEvent = stopEvent
+    self.measureEvent = measureEvent
+    self.name = f'{args.prefix}-{index}'
+    self.random = random.Random(args.seed * 100003 + index)
+    self.moveInterval = 1.0 / args.move_rate
+    self.nextMoveAt = 0.0
+    self.nextCombatKeyAt = 0.0
+    self.path = deque()
+    self.pathTarget = None
+    self.pathMapId = None
+    self.ready = threading.Event()
+    self.error = None
+
+    # Stats of the measured window (from measureEvent to the thread's end)
+    self.cpuStart = None
+    self.wallStart = None
+    self.cpuTime = 0.0
+    self.wallTime = 0.0
+    self.moves = 0
+    self.fights = 0
+    self.deaths = 0
+    self.wasInCombat = False
+
+    self.input = ScriptedInput(fallback=self.nextKey)
+    self.term = NullTerminal(input=self.input)
+    self.sio = CountingClient(registry, reconnection=False)
+    registry[self.name] = self.sio
+    self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+
+  # ==================== Setup ====================
+
+  def setup(self):
+    """Same wiring as game/main.py, minus the character creation UI and REST calls"""
+    self.client = BotGameClient(self.term, self.args.render)
+    self.city = City()
+    self.city.createBoard()
+    self.dungeon = Dungeon([], [], city_map=self.city, term=self.term, party=None, sio=self.sio, inbox=self.client.inbox)
+    self.party = Party(self.sio, self.name, on_party_joined_callback=self.onPartyJoined, inbox=self.client.inbox)
+    self.dungeon.party = self.party
+    self.dungeon.setCityMap(self.city)
+    self.city.sio = self.sio
+    self.city.setDungeonMap(self.dungeon)
+
+    cityInfo = [self.city.getLines(), self.city.getWindowWidth(), self.city.getWindowHeight()]
+    self.server = Server(self.sio, self.args.host, self.args.port, self.client.players, cityInfo, inbox=self.client.inbox)
+    playerClass = self.random.choice(sorted(Player.CLASSES))
+    self.player = Player(cityInfo[0], cityInfo[1], cityInfo[2], [0, 0], self.name, playerClass, self.term)
+
+    self.client.setCurrentMap(self.city)
+    self.client.setPlayer(self.player)
+    self.client.sio = self.sio
+    self.server.start()
+    self.server.join(self.player.getName(), self.player.getPlayerPosition(), self.client.current_map.getMapId(),
+                     player=self.player)
+    self.client.addMapChangeListener(
+      lambda map_obj: self.server.changeMap(map_obj.getMapId(), self.player.getPlayerPosition()))
+    self.party.request_current_party()
+
+  def onPartyJoined(self):
+    """Same as main.py: regenerate the dungeon when joining a party while in it"""
+    if self.client.current_map == self.dungeon:
+      dungeon = self.dungeon
+      dungeon.seed = None
+      dungeon.is_synced = False
+      dungeon.currentLevel = 1
+      dungeon.clearEntities()
+      dungeon.portalActive = False
+      dungeon.portalPosition = None
+      dungeon.createBoard()
+      dungeon.createRandomEnemies(5)
+      dungeon.createRandomChests(5)
+      self.client.setCurrentMap(dungeon)
+      self.path.clear()
+
+  # ==================== Loop ====================
+
+  def run(self):
+    try:
+      self.setup()
+      self.ready.set()
+      while not self.stopEvent.is_set():
+        if self.cpuStart is None and self.measureEvent.is_set():
+          self.startMeasuring()
+        if self.player.getHp() <= 0 and not self.client.scenes:
+          self.respawn()
+        self.acceptInvites()
+        self.client.scheduler.step(self.client.handleInput, self.client.update, self.render)
+    except Exception as error:  # Report it instead of killing the swarm
+      self.error = error
+      self.ready.set()
+    finally:
+      if self.cpuStart is not None:
+        self.cpuTime = time.thread_time() - self.cpuStart
+        self.wallTime = time.perf_counter() - self.wallStart
+
+  def startMeasuring(self):
+    self.cpuStart = time.thread_time()
+    self.wallStart = time.perf_counter()
+    self.moves = 0
+    self.fights = 0
+    self.deaths = 0
+
+  def render(self):
+    # Level up screens wait for stat choices, bots keep the default allocation
+    if self.player.pendingLevelUp:
+      self.player.pendingLevelUp = False
+    self.client.render()
+
+  def respawn(self):
+    """Back to the city with full HP and MP (a person would restart the client)"""
+    self.deaths += 1
+    self.player.setHp(self.player.getMaxHp())
+    self.player.setMP(self.player.maxMp)
+    if self.client.current_map == self.dungeon:
+      DungeonToCityTransition(self.city, self.city.getArrivalPosition()).execute(self.player, self.term)
+      self.client.setCurrentMap(self.city)
+    self.path.clear()
+
+  def acceptInvites(self):
+    if self.party.pending_invites and not self.party.is_in_party():
+      invite = self.party.pending_invites.pop(0)
+      self.party.accept_invite(invite['partyId'])
+
+  def close(self):
+    try:
+      self.sio.disconnect()
+    except Exception:
+      pass
+
+  # ==================== Brain ====================
+
+  def nextKey(self, timeout):
+    """Key the bot presses now, or None to let the read time out (called by ScriptedInput)"""
+    now = time.perf_counter()
+    if self.stopEvent.is_set():
+      # Let blocking screens finish so the thread can exit
+      return '1'
+
+    inCombat = self.inCombat()
+    if inCombat and not self.wasInCombat:
+      self.fights += 1
+    self.wasInCombat = inCombat
+    if inCombat:
+      # Attack, and press on through the "any key to continue" prompts
+      if now < self.nextCombatKeyAt:
+        return None
+      self.nextCombatKeyAt = now + self.args.think_time
+      return '1'
+    if self.client.scenes:
+      # End of a fight (loot screen), moves would only be queued by the scene
+      return None
+
+    if now < self.nextMoveAt:
+      return None
+    self.nextMoveAt = max(self.nextMoveAt + self.moveInterval, now)
+
+    key = self.step()
+    if key:
+      self.moves += 1
+    return key
+
+  def inCombat(self):
+    if self.client.current_map != self.dungeon:
+      return False
+    return any(enemy.getIsInCombat() for enemy in self.dungeon.getEnemies())
+
+  def step(self):
+    """Next movement key towards the current goal"""
+    target = self.goal()
+    if target is None:
+      return self.wander()
+
+    position = tuple(self.player.getPlayerPosition())
+    if self.path and self.path[0] == position:
+      self.path.popleft()
+
+    # Re-plan when the goal moved, the map changed or the bot got pushed off its path
+    mapId = self.client.current_map_id
+    if (target != self.pathTarget or mapId != self.pathMapId or not self.path
+        or (self.path[0][0] - position[0], self.path[0][1] - position[1]) not in MOVE_KEYS):
+      self.path = self.findPath(position, target)
+      self.pathTarget = target
+      self.pathMapId = mapId
+    if not self.path:
+      return self.wander()
+
+    nextCell = self.path[0]
+    return MOVE_KEYS[(nextCell[0] - position[0], nextCell[1] - position[1])]
+
+  def goal(self):
+    if self.client.current_map == self.city:
+      return tuple(self.city.getPortalPosition())
+
+    if self.dungeon.isPortalActive() and self.dungeon.getPortalPosition():
+      return tuple(self.dungeon.getPortalPosition())
+
+    # Hunt the closest enemy
+    position = self.player.getPlayerPosition()
+    closest = None
+    closestDistance = None
+    for enemy in self.dungeon.getEnemies():
+      enemyPosition = enemy.getEnemyPosition()
+      distance = abs(enemyPosition[0] - position[0]) + abs(enemyPosition[1] - position[1])
+      if closestDistance is None or distance < closestDistance:
+        closest, closestDistance = tuple(enemyPosition), distance
+    return closest
+
+  def isAvoided(self, cell):
+    """Cells that would open a blocking screen or leave the current map"""
+    if self.client.current_map == self.city:
+      return list(cell) == self.city.yagoPosition or self.city.doorIndex.isOccupied(cell)
+    return list(cell) == self.dungeon.exitPortalPosition
+
+  def findPath(self, start, target):
+    """Shortest walkable path (BFS) excluding start, empty if the target can't be reached"""
+    previous = {start: None}
+    frontier = deque([start])
+    while frontier:
+      cell = frontier.popleft()
+      if cell == target:
+        path = deque()
+        while cell != start:
+          path.appendleft(cell)
+          cell = previous[cell]
+        return path
+      for dy, dx in MOVE_KEYS:
+        neighbour = (cell[0] + dy, cell[1] + dx)
+        if neighbour in previous or self.player.pathIsBlocked(list(neighbour)):
+          continue
+        if neighbour != target and self.isAvoided(neighbour):
+          continue
+        previous[neighbour] = cell
+        frontier.append(neighbour)
+    return deque()
+
+  def wander(self):
+    position = self.player.getPlayerPosition()
+    options = []
+    for (dy, dx), key in MOVE_KEYS.items():
+      cell = [position[0] + dy, position[1] + dx]
+      if not self.player.pathIsBlocked(cell) and not self.isAvoided(cell):
+        options.append(key)
+    return self.random.choice(options) if options else None
+
+class BotGameClient(GameClient):
+  """GameClient that only draws when asked to, one bot at a time"""
+
+  def __init__(self, term, render):
+    super().__init__(term)
+    self.renderFrames = render
+
+  def draw(self):
+    if self.renderFrames:
+      with RENDER_LOCK:
+        super().draw()
+
+class NullWriter(io.TextIOBase):
+  """stdout sink for the prints of every bot"""
+
+  def write(self, text):
+    return len(text)
+
+def formParties(bots, partySize):
+  """The first bot of each group invites the rest"""
+  parties = 0
+  if partySize < 2:
+    return parties
+  for start in range(0, len(bots), partySize):
+    group = [bot for bot in bots[start:start + partySize] if bot.error is None]
+    if len(group) < 2:
+      continue
+    for member in group[1:]:
+      group[0].party.invite_player(member.name)
+    parties += 1
+  return parties
+
+def report(bots, elapsed, cpuProcess, parties, out):
+  active = [bot for bot in bots if bot.error is None]
+  sent = Counter()
+  received = Counter()
+  latency = LatencyHistogram()
+  for bot in active:
+    sent.update(bot.sio.sent)
+    received.update(bot.sio.received)
+    latency.merge(bot.sio.latency)
+
+  def line(text=''):
+    out.write(text + '\n')
+
+  line(f'bots: {len(active)}/{len(bots)} running, {parties} parties, {elapsed:.1f}s measured')
+  for bot in bots:
+    if bot.error is not None:
+      line(f'  {bot.name} failed: {bot.error!r}')
+  line()
+  line(f"{'events':<24} {'sent/s':>10} {'received/s':>12}")
+  line(f"{'total':<24} {sum(sent.values()) / elapsed:>10.1f} {sum(received.values()) / elapsed:>12.1f}")
+  for event in sorted(set(sent) | set(received), key=lambda name: -(sent[name] + received[name])):
+    line(f'{event:<24} {sent[event] / elapsed:>10.1f} {received[event] / elapsed:>12.1f}')
+  line()
+  line(f'move fan-out latency ({latency.count} samples): '
+       f'mean {latency.mean() * 1000:.1f}ms, p50 {latency.percentile(0.5) * 1000:.1f}ms, '
+       f'p95 {latency.percentile(0.95) * 1000:.1f}ms, p99 {latency.percentile(0.99) * 1000:.1f}ms, '
+       f'max {latency.max * 1000:.1f}ms')
+
+  if active:
+    # A bot's window ends when its thread gets out of whatever screen it was in
+    measured = [bot for bot in active if bot.wallTime > 0]
+    gameCpu = sum(bot.cpuTime / bot.wallTime for bot in measured) / max(1, len(measured))
+    line(f'client CPU per bot: game thread {gameCpu * 1000:.1f}ms/s, '
+         f'whole process {cpuProcess / len(active) / elapsed * 1000:.1f}ms/s')
+    line(f'progress: {sum(bot.moves for bot in active)} moves, {sum(bot.fights for bot in active)} fights, '
+         f'{sum(bot.player.getMaxDungeonLevel() for bot in active) / len(active):.1f} mean max stage, '
+         f'{sum(bot.deaths for bot in active)} deaths, '
+         f'{sum(1 for bot in active if bot.client.current_map == bot.dungeon)} bots in a dungeon at the end')
+
+    # Moves the server disagreed with (should stay 0 unless moves are refused)
+    prediction = Counter()
+    for bot in active:
+      prediction.update(bot.server.getMoveStats())
+      prediction.subtract(getattr(bot, 'moveStatsStart', {}))
+    line(f"move prediction: {prediction['sent']} sent, {prediction['acks']} acks, "
+         f"{prediction['replayed']} replayed, {prediction['corrections']} corrections "
+         f"({prediction['correctionDistance']} tiles), {prediction['rejected']} rejected by the server")
+
+def main():
+  parser = argparse.ArgumentParser(description='Load test the server with headless game clients')
+  parser.add_argument('--host', default='localhost')
+  parser.add_argument('--port', type=int, default=3001)
+  parser.add_argument('--bots', type=int, default=20)
+  parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+  parser.add_argument('--warmup', type=float, default=2.0, help='Seconds played before measuring')
+  parser.add_argument('--party-size', type=int, default=3, help='Bots per party (1 = no parties)')
+  parser.add_argument('--move-rate', type=float, default=4.0, help='Moves per second per bot')
+  parser.add_argument('--think-time', type=float, default=0.2, help='Seconds per key in combat')
+  parser.add_argument('--ramp', type=float, default=0.05, help='Seconds between bot connections')
+  parser.add_argument('--render', action='store_true', help='Also render frames (serialized across bots)')
+  parser.add_argument('--prefix', default='bot', help='Player name prefix')
+  parser.add_argument('--seed', type=int, default=1)
+  args = parser.parse_args()
+
+  out = sys.stdout
+  sys.stdout = NullWriter()  # Game screens print, nobody is watching
+  registry = {}
+  stopEvent = threading.Event()
+  measureEvent = threading.Event()
+  bots = [Bot(i, args, registry, stopEvent, measureEvent) for i in range(args.bots)]
+  try:
+    for bot in bots:
+      bot.thread.start()
+      bot.ready.wait()
+      time.sleep(args.ramp)
+    parties = formParties(bots, args.party_size)
+    time.sleep(args.warmup)
+
+    # Measure from here
+    for bot in bots:
+      if bot.error is None:
+        bot.sio.sent.clear()
+        bot.sio.received.clear()
+        bot.sio.latency = LatencyHistogram()
+        bot.moveStatsStart = bot.server.getMoveStats()
+    measureEvent.set()
+    cpuStart = time.process_time()
+    start = time.perf_counter()
+    time.sleep(args.duration)
+    elapsed = time.perf_counter() - start
+    cpuProcess = time.process_time() - cpuStart
+  finally:
+    stopEvent.set()
+    for bot in bots:
+      bot.thread.join(timeout=10)
+    for bot in bots:
+      bot.close()
+    sys.stdout = out
+
+  report(bots, elapsed, cpuProcess, parties, out)
+
+if __name__ == '__main__':
+  main()
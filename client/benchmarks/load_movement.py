@@ -0,0 +1,111 @@
+"""
+Movement broadcast load test.
+
+Connects N simulated players to a running server, has each of them random-walk
+at a fixed key rate and measures the 'moved' payload bytes a client receives per
+second. The last column is what the old full-snapshot broadcast (every player's
+position to every client on every move) would have cost for comparison.
+
+Usage (from the client folder, with the server running):
+  python -m benchmarks.load_movement
+  python -m benchmarks.load_movement --players 10 100 500 --duration 10 --move-rate 5
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import socketio
+
+OBSERVERS = 3  # Clients whose received bytes are measured
+
+class Bot:
+  """Simulated player that joins and random-walks on a 30x15 board"""
+
+  def __init__(self, url, playerId, measure=False):
+    self.playerId = playerId
+    self.position = [random.randint(0, 14), random.randint(0, 29)]
+    self.bytesReceived = 0
+    self.eventsReceived = 0
+    self.lock = threading.Lock()
+    self.sio = socketio.Client(reconnection=False)
+    if measure:
+      self.sio.on('moved', self.on_moved)
+    self.sio.connect(url, transports=['websocket'])
+    self.sio.emit('join', json.dumps({'playerId': playerId, 'playerPosition': self.position}))
+
+  def on_moved(self, data):
+    with self.lock:
+      self.bytesReceived += len(json.dumps(data, separators=(',', ':')))
+      self.eventsReceived += 1
+
+  def reset(self):
+    with self.lock:
+      self.bytesReceived = 0
+      self.eventsReceived = 0
+
+  def move(self):
+    axis = random.randint(0, 1)
+    limit = 14 if axis == 0 else 29
+    self.position[axis] = min(limit, max(0, self.position[axis] + random.choice((-1, 1))))
+    self.sio.emit('move', json.dumps({'playerId': self.playerId, 'playerPosition': self.position}))
+
+  def close(self):
+    self.sio.disconnect()
+
+def snapshotBytesPerSecond(players, moveRate):
+  """Bytes/sec per client if every move broadcast the full player list"""
+  snapshot = [{'playerId': f'bot-{i}', 'playerPosition': [7, 15]} for i in range(players)]
+  return len(json.dumps(snapshot, separators=(',', ':'))) * players * moveRate
+
+def run(url, players, duration, moveRate, warmup=1.0):
+  bots = []
+  try:
+    for i in range(players):
+      bots.append(Bot(url, f'bot-{i}', measure=i < OBSERVERS))
+    observers = bots[:OBSERVERS]
+
+    interval = 1.0 / moveRate
+    nextMove = time.perf_counter()
+    start = nextMove
+    measuredFrom = None
+    while True:
+      now = time.perf_counter()
+      if measuredFrom is None and now - start >= warmup:
+        for bot in observers:
+          bot.reset()
+        measuredFrom = now
+      if measuredFrom is not None and now - measuredFrom >= duration:
+        break
+      for bot in bots:
+        bot.move()
+      nextMove += interval
+      time.sleep(max(0.0, nextMove - time.perf_counter()))
+
+    elapsed = time.perf_counter() - measuredFrom
+    bytesPerSecond = sum(bot.bytesReceived for bot in observers) / len(observers) / elapsed
+    eventsPerSecond = sum(bot.eventsReceived for bot in observers) / len(observers) / elapsed
+    return bytesPerSecond, eventsPerSecond
+  finally:
+    for bot in bots:
+      bot.close()
+
+def main():
+  parser = argparse.ArgumentParser(description='Measure movement broadcast bandwidth per client')
+  parser.add_argument('--host', default='localhost')
+  parser.add_argument('--port', type=int, default=3001)
+  parser.add_argument('--players', type=int, nargs='+', default=[10, 100, 500])
+  parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per run')
+  parser.add_argument('--move-rate', type=float, default=5.0, help='Moves per second per player')
+  args = parser.parse_args()
+
+  url = f'http://{args.host}:{args.port}'
+  print(f"{'players':>8} {'bytes/s':>12} {'events/s':>9} {'snapshot bytes/s':>17}")
+  for players in args.players:
+    bytesPerSecond, eventsPerSecond = run(url, max(players, OBSERVERS), args.duration, args.move_rate)
+    baseline = snapshotBytesPerSecond(players, args.move_rate)
+    print(f"{players:>8} {bytesPerSecond:>12.0f} {eventsPerSecond:>9.1f} {baseline:>17.0f}")
+    time.sleep(1.0)  # Let the server flush the disconnects before the next run
+
+if __name__ == '__main__':
+  main()
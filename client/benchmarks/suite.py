@@ -0,0 +1,311 @@
+"""
+Client hot path benchmark suite.
+
+Times the client code that runs per frame, per tick or per network event and
+keeps the results in a JSON file, so every performance change can be compared
+with the run before it.
+
+Each benchmark is timed with timeit: the loop count is picked so one run takes
+at least 0.2s, the run is repeated and the fastest time per call is kept (the
+median is kept too, to spot noisy runs). Game screens are drawn on a
+NullTerminal, so render times don't include escape sequences.
+
+Usage (from the client folder):
+  python -m benchmarks.suite                            # run and print
+  python -m benchmarks.suite --filter render board      # only matching benchmarks
+  python -m benchmarks.suite --out results.json         # also save the results
+  python -m benchmarks.suite --compare                  # flag regressions against baselines.json
+  python -m benchmarks.suite --save-baseline            # make this run the new baselines.json
+
+--compare exits with status 1 when a benchmark got slower than the threshold,
+so it can gate a change. Timings only compare on the same machine and Python:
+record a baseline locally with --save-baseline before the change, then run
+--compare after it. A baseline recorded elsewhere (host, platform, machine or
+Python differ, like the committed baselines.json) is refused with status 2,
+--force compares anyway.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_THRESHOLD = 0.15  # Slower than baseline by more than this fraction is a regression
+ENVIRONMENT_KEYS = ('host', 'platform', 'machine', 'implementation', 'python')  # Must match to compare timings
+
+BENCHMARKS = []  # (name, factory returning the function to time)
+
+def benchmark(name, params=None, label=str):
+  """Register a benchmark factory, once per param if params are given (name[label(param)])"""
+  def register(factory):
+    if params is None:
+      BENCHMARKS.append((name, factory))
+    else:
+      for param in params:
+        BENCHMARKS.append((f'{name}[{label(param)}]', lambda param=param: factory(param)))
+    return factory
+  return register
+
+class NullWriter(io.TextIOBase):
+  """stdout sink for everything the benchmarked code prints"""
+
+  def write(self, text):
+    return len(text)
+
+# ==================== Benchmarks ====================
+
+@benchmark('board.generate', [(30, 15), (60, 30), (120, 60), (250, 250)], label=lambda size: f'{size[0]}x{size[1]}')
+def benchBoardGeneration(size):
+  from engine.maps.procedural_board import ProceduralBoard
+  width, height = size
+  board = ProceduralBoard([['.'] * width for _ in range(height)], width, height, seed=1234)
+  return board.procedurelyGeneratedBoard
+
+def makePlayer(term, lines, width, height, name='bench', playerClass='knight'):
+  from game.entities.player import Player
+  return Player(lines, width, height, [0, 0], name, playerClass, term)
+
+def renderFrame(gameMap, players, term):
+  """One frame, built the way GameClient.draw builds it"""
+  def frame():
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+      gameMap.init(players, term)
+    return buffer.getvalue()
+  return frame
+
+@benchmark('render.dungeon_frame')
+def benchDungeonFrame():
+  from engine.core.null_terminal import NullTerminal
+  from game.maps.dungeon import Dungeon
+  term = NullTerminal()
+  dungeon = Dungeon([], [], term=term)
+  dungeon.seed = 1234
+  dungeon.createBoard()
+  dungeon.createRandomEnemies(6)
+  dungeon.createRandomChests(4)
+  player = makePlayer(term, dungeon.getLines(), dungeon.getWindowWidth(), dungeon.getWindowHeight())
+  return renderFrame(dungeon, [player], term)
+
+@benchmark('render.city_frame', [1, 50], label=lambda players: f'{players}p')
+def benchCityFrame(playerCount):
+  from engine.core.null_terminal import NullTerminal
+  from game.maps.city import City
+  from game.server import RemotePlayer
+  term = NullTerminal()
+  city = City()
+  city.createBoard()
+  lines, width, height = city.getLines(), city.getWindowWidth(), city.getWindowHeight()
+  players = [makePlayer(term, lines, width, height)]
+  for i in range(playerCount - 1):
+    players.append(RemotePlayer(lines, width, height, [i % height, (i * 7) % width], f'remote-{i}'))
+  return renderFrame(city, players, term)
+
+@benchmark('inventory.getInventory', [10, 100, 1000])
+def benchGetInventory(stackCount):
+  """Item picked up and inventory read again (the view is rebuilt after every change)"""
+  from engine.core.null_terminal import NullTerminal
+  term = NullTerminal()
+  player = makePlayer(term, [['.'] * 30 for _ in range(15)], 30, 15)
+  for i in range(stackCount):
+    player.addToInventory({'id': f'item_{i}', 'name': f'Item {i}', 'type': 'material', 'value': i})
+  pickedUp = {'id': 'item_0', 'name': 'Item 0', 'type': 'material', 'value': 0}
+
+  def pickUpAndView():
+    player.addToInventory(pickedUp)
+    return player.getInventory()
+  return pickUpAndView
+
+def makeFight():
+  from engine.core.null_terminal import NullTerminal
+  from game.entities.enemies import Goblin
+  from game.mechanics.combat import CombatSystem
+  term = NullTerminal()
+  lines = [['.'] * 30 for _ in range(15)]
+  player = makePlayer(term, lines, 30, 15, playerClass='rogue')
+  enemy = Goblin([5, 5], lines, 3, term=term)
+  return CombatSystem(term), player, enemy
+
+@benchmark('combat.attack')
+def benchAttack():
+  combat, player, enemy = makeFight()
+
+  def attack():
+    enemy.hp = enemy.maxHp
+    return combat.attack(player, enemy, 'You', 'the enemy')
+  return attack
+
+@benchmark('combat.attack_skill')
+def benchSkillAttack():
+  combat, player, enemy = makeFight()
+
+  def attack():
+    enemy.hp = enemy.maxHp
+    enemy.dot_effects = []
+    enemy.stun = {'isStunned': False, 'duration': 0}
+    player.mp = player.maxMp
+    return combat.attack(player, enemy, 'You', 'the enemy', skillId='sinister_strike')
+  return attack
+
+@benchmark('server.on_player_move', [10, 100, 1000])
+def benchPlayerMove(remoteCount):
+  """'moved' delta where every remote player on the map moved"""
+  from game.server import Server
+  lines = [['.'] * 60 for _ in range(30)]
+  server = Server(None, 'localhost', 3001, [], [lines, 60, 30])
+  server.localPlayerId = 'bench'
+  server.on_player_join([{'playerId': f'remote-{i}', 'playerPosition': [0, 0]} for i in range(remoteCount)])
+  delta = {
+    'tick': 1,
+    'players': [{'playerId': f'remote-{i}', 'playerPosition': [i % 30, i % 60]} for i in range(remoteCount)],
+    'left': [],
+  }
+  return lambda: server.on_player_move(delta)
+
+@benchmark('grid_editor.render_grid', [5, 50, 200])
+def benchRenderGrid(pieceCount):
+  from engine.core.null_terminal import NullTerminal
+  from engine.ui.draggable import DraggableElement
+  from engine.ui.grid_editor import GridEditor
+  from game.arts.buildings import house, mushroom_house, bank, rank_board
+  arts = [house, mushroom_house, bank, rank_board]
+  editor = GridEditor(NullTerminal(), 80, 20)
+  for i in range(pieceCount):
+    editor.add_element(DraggableElement(1 + (i * 3) % 60, 1 + i % 10, arts[i % len(arts)], f'furniture_{i}'))
+  return editor.render_grid
+
+# ==================== Runner ====================
+
+def measure(function, repeat):
+  """Seconds per call: fastest and median of `repeat` runs of at least 0.2s each"""
+  timer = timeit.Timer(function)
+  loops, _ = timer.autorange()
+  perCall = [total / loops for total in timer.repeat(repeat, loops)]
+  return {'seconds': min(perCall), 'median': statistics.median(perCall), 'loops': loops, 'repeat': repeat}
+
+def gitCommit():
+  try:
+    return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                          timeout=5, check=True).stdout.strip()
+  except (OSError, subprocess.SubprocessError):
+    return None
+
+def run(filters, repeat, out):
+  results = {}
+  for name, factory in BENCHMARKS:
+    if filters and not any(text in name for text in filters):
+      continue
+    random.seed(1234)  # Same spawns, misses and crits on every run
+    with redirect_stdout(NullWriter()):
+      function = factory()
+      result = measure(function, repeat)
+    results[name] = result
+    out.write(f"{name:<36} {formatSeconds(result['seconds']):>10} {formatSeconds(result['median']):>10}\n")
+    out.flush()
+  return {
+    'meta': {
+      'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+      'commit': gitCommit(),
+      'python': platform.python_version(),
+      'implementation': platform.python_implementation(),
+      'platform': platform.platform(),
+      'machine': platform.machine(),
+      'host': platform.node(),
+    },
+    'results': results,
+  }
+
+def formatSeconds(seconds):
+  for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+    if seconds >= scale:
+      return f'{seconds / scale:.2f}{unit}'
+  return f'{seconds / 1e-9:.0f}ns'
+
+def environmentDifferences(current, baseline):
+  """(key, baseline value, current value) for every environment detail the two runs don't share"""
+  currentMeta = current.get('meta', {})
+  baselineMeta = baseline.get('meta', {})
+  return [(key, baselineMeta.get(key), currentMeta.get(key)) for key in ENVIRONMENT_KEYS
+          if baselineMeta.get(key) != currentMeta.get(key)]
+
+def compare(current, baseline, threshold, out):
+  """Print every benchmark against its baseline, returns the names that regressed"""
+  regressions = []
+  currentResults = current['results']
+  baselineResults = baseline['results']
+  meta = baseline.get('meta', {})
+  out.write(f"\nagainst baseline from {meta.get('date')} (commit {meta.get('commit')}, python {meta.get('python')}), "
+            f'threshold {threshold:.0%}\n')
+  out.write(f"{'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}\n")
+  for name, result in currentResults.items():
+    if name not in baselineResults:
+      out.write(f"{name:<36} {'-':>10} {formatSeconds(result['seconds']):>10} {'new':>8}\n")
+      continue
+    before = baselineResults[name]['seconds']
+    change = result['seconds'] / before - 1
+    flag = ''
+    if change > threshold:
+      flag = '  REGRESSION'
+      regressions.append(name)
+    elif change < -threshold:
+      flag = '  faster'
+    out.write(f"{name:<36} {formatSeconds(before):>10} {formatSeconds(result['seconds']):>10} {change:>+8.1%}{flag}\n")
+  return regressions
+
+def main():
+  parser = argparse.ArgumentParser(description='Benchmark the client hot paths')
+  parser.add_argument('--filter', nargs='+', default=[], help='Only run benchmarks whose name contains one of these')
+  parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+  parser.add_argument('--out', help='Write the results to this JSON file')
+  parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, help='Compare with a results file (default: baselines.json)')
+  parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Slowdown fraction flagged as a regression')
+  parser.add_argument('--force', action='store_true', help='Compare even with a baseline recorded on another machine or Python')
+  parser.add_argument('--save-baseline', action='store_true', help='Write the results to baselines.json')
+  parser.add_argument('--list', action='store_true', help='List the benchmarks and exit')
+  args = parser.parse_args()
+
+  if args.list:
+    for name, _ in BENCHMARKS:
+      print(name)
+    return
+
+  out = sys.stdout
+  out.write(f"{'benchmark':<36} {'best':>10} {'median':>10}\n")
+  start = time.perf_counter()
+  current = run(args.filter, args.repeat, out)
+  out.write(f'{len(current["results"])} benchmarks in {time.perf_counter() - start:.1f}s\n')
+
+  for path in filter(None, [args.out, BASELINE_PATH if args.save_baseline else None]):
+    with open(path, 'w') as file:
+      json.dump(current, file, indent=2, sort_keys=True)
+      file.write('\n')
+    out.write(f'results written to {path}\n')
+
+  if args.compare:
+    with open(args.compare) as file:
+      baseline = json.load(file)
+    differences = environmentDifferences(current, baseline)
+    if differences:
+      out.write(f'\nbaseline {args.compare} was recorded in another environment:\n')
+      for key, before, now in differences:
+        out.write(f'  {key}: {before} (baseline) vs {now} (this run)\n')
+      if not args.force:
+        out.write('timings from different environments are not comparable: record a baseline here with '
+                  '--save-baseline (before the change), or pass --force\n')
+        sys.exit(2)
+    regressions = compare(current, baseline, args.threshold, out)
+    if regressions:
+      out.write(f"\n{len(regressions)} regression(s): {', '.join(regressions)}\n")
+      sys.exit(1)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Callable, List, Optional
+
+class EventInbox:
+  """Hands socket events from the socket thread to the game loop
+
+  Handlers registered through listen() run on the loop thread: the socket thread only
+  decodes the payload and queues it, and the loop applies the queue with drain() once
+  per tick. Game state (players, enemies, the board) is then only touched by the loop,
+  so frames never see it half updated.
+
+  Events registered with a coalesce function are merged into the previous one when
+  it's still the last one waiting, so a burst of them is applied once per tick while
+  their order relative to other events is kept.
+  """
+
+  def __init__(self, maxPerDrain: Optional[int] = 256):
+    """
+    Args:
+      maxPerDrain: Most events applied per drain (the rest wait for the next one), None for all
+    """
+    self.lock = threading.Lock()
+    self.queue: List[list] = []  # [event, handler, payload, coalesce]
+    self.maxPerDrain = maxPerDrain
+
+    # Stats
+    self.received = 0
+    self.coalesced = 0
+    self.applied = 0
+    self.errors = 0
+    self.lastError = None
+
+  def listen(self, sio, event: str, handler: Callable[[Any], None], decode: Callable = None,
+             coalesce: Callable[[Any, Any], Any] = None):
+    """
+    Register a socket event whose handler runs on the loop thread
+
+    Args:
+      sio: socket.io client
+      event: Event name
+      handler: Called with the (decoded) payload when the inbox is drained
+      decode: Optional function applied to the payload on the socket thread (e.g. json.loads)
+      coalesce: Optional merge(queued, new) -> payload for back-to-back events of this type
+    """
+    def onEvent(data=None):
+      self.post(event, handler, decode(data) if decode else data, coalesce)
+    sio.on(event, onEvent)
+
+  def post(self, event: str, handler: Callable[[Any], None], payload: Any = None,
+           coalesce: Callable[[Any, Any], Any] = None):
+    """Queue handler(payload) for the next drain (safe from any thread)"""
+    with self.lock:
+      self.received += 1
+      if coalesce and self.queue and self.queue[-1][0] == event:
+        last = self.queue[-1]
+        last[2] = coalesce(last[2], payload)
+        self.coalesced += 1
+        return
+      self.queue.append([event, handler, payload, coalesce])
+
+  def drain(self) -> int:
+    """Apply the queued events in arrival order (call from the loop thread), returns how many ran"""
+    with self.lock:
+      if not self.queue:
+        return 0
+      if self.maxPerDrain is None or len(self.queue) <= self.maxPerDrain:
+        entries, self.queue = self.queue, []
+      else:
+        entries, self.queue = self.queue[:self.maxPerDrain], self.queue[self.maxPerDrain:]
+
+    for event, handler, payload, _ in entries:
+      try:
+        handler(payload)
+      except Exception as error:
+        # A bad payload shouldn't take the game loop down (it used to only kill the socket callback)
+        self.errors += 1
+        self.lastError = (event, error)
+    self.applied += len(entries)
+    return len(entries)
+
+  def __len__(self):
+    with self.lock:
+      return len(self.queue)
+
+def listen(sio, event: str, handler: Callable[[Any], None], inbox: Optional[EventInbox] = None,
+           decode: Callable = None, coalesce: Callable[[Any, Any], Any] = None):
+  """Register a socket event handler, through the inbox when there is one (else on the socket thread)"""
+  if inbox is not None:
+    inbox.listen(sio, event, handler, decode, coalesce)
+  elif decode:
+    sio.on(event, lambda data=None: handler(decode(data)))
+  else:
+    sio.on(event, handler)
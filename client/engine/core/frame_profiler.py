@@ -0,0 +1,126 @@
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+  from blessed import Terminal
+
+class FrameProfiler:
+  """Rolling per-subsystem frame timings, shown as a HUD under the player info
+
+  Sections are timed through time(), which only reads the clock while the profiler
+  is enabled, so leaving the hooks in costs one attribute check per call. Everything
+  timed runs on the loop thread: network time is the game loop draining the event
+  inbox, where socket handlers are applied.
+  """
+
+  SECTIONS = ('input', 'sim', 'net', 'render')
+
+  def __init__(self, window: int = 60):
+    """
+    Args:
+      window: Number of frames the averages are taken over
+    """
+    self.enabled = False
+    self.clock = time.perf_counter
+    self.window = window
+    self.current: Dict[str, float] = dict.fromkeys(self.SECTIONS, 0.0)
+    self.history: Dict[str, deque] = {section: deque(maxlen=window) for section in self.SECTIONS}
+    self.frameEnds = deque(maxlen=window)
+
+    # Socket round trip
+    self.rttInterval = 1.0
+    self.lastPing = None
+    self.rtts = deque(maxlen=10)
+
+  def toggle(self) -> bool:
+    self.setEnabled(not self.enabled)
+    return self.enabled
+
+  def setEnabled(self, enabled: bool):
+    if enabled and not self.enabled:
+      self.reset()
+    self.enabled = enabled
+
+  def reset(self):
+    for section in self.SECTIONS:
+      self.current[section] = 0.0
+      self.history[section].clear()
+    self.frameEnds.clear()
+    self.rtts.clear()
+    self.lastPing = None
+
+  # ==================== Timing ====================
+
+  def time(self, section: str, function: Callable, *args):
+    """Call function(*args), adding its duration to the section while enabled"""
+    if not self.enabled:
+      return function(*args)
+    start = self.clock()
+    try:
+      return function(*args)
+    finally:
+      self.current[section] += self.clock() - start
+
+  def endFrame(self):
+    """Close the current frame: its section totals go into the rolling window"""
+    if not self.enabled:
+      return
+    for section in self.SECTIONS:
+      self.history[section].append(self.current[section])
+      self.current[section] = 0.0
+    self.frameEnds.append(self.clock())
+
+  # ==================== Round trip ====================
+
+  def pingDue(self) -> bool:
+    """True (and the ping counted as sent) when it's time to measure the round trip again"""
+    now = self.clock()
+    if not self.enabled or (self.lastPing is not None and now - self.lastPing < self.rttInterval):
+      return False
+    self.lastPing = now
+    return True
+
+  def recordRtt(self, seconds: float):
+    self.rtts.append(seconds)
+
+  # ==================== Stats ====================
+
+  def getSectionTimes(self) -> Dict[str, float]:
+    """Average seconds per frame spent in each section"""
+    return {section: sum(samples) / len(samples) if samples else 0.0
+            for section, samples in self.history.items()}
+
+  def getFrameTime(self) -> float:
+    """Average seconds between frames"""
+    if len(self.frameEnds) < 2:
+      return 0.0
+    return (self.frameEnds[-1] - self.frameEnds[0]) / (len(self.frameEnds) - 1)
+
+  def getFps(self) -> float:
+    frameTime = self.getFrameTime()
+    return 1.0 / frameTime if frameTime > 0 else 0.0
+
+  def getRtt(self) -> Optional[float]:
+    """Average of the last round trips, None before the first answer"""
+    return sum(self.rtts) / len(self.rtts) if self.rtts else None
+
+  def getLines(self, term: 'Terminal') -> List[str]:
+    """HUD lines (none while disabled)"""
+    if not self.enabled:
+      return []
+    times = self.getSectionTimes()
+    rtt = self.getRtt()
+    rttText = f'{rtt * 1000:.0f}ms' if rtt is not None else '--'
+    work = sum(times.values())
+
+    stats = term.cyan(' | ').join(
+      term.cyan(f'{section}: ') + term.yellow(f'{times[section] * 1000:.2f}') for section in self.SECTIONS
+    )
+    return [
+      term.cyan('FPS: ') + term.bold_green(f'{self.getFps():.1f}')
+      + term.cyan(' | Frame: ') + term.yellow(f'{self.getFrameTime() * 1000:.1f}ms')
+      + term.cyan(' | Work: ') + term.yellow(f'{work * 1000:.2f}ms')
+      + term.cyan(' | RTT: ') + term.magenta(rttText),
+      stats + term.cyan(' (ms/frame)'),
+    ]
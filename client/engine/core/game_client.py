@@ -1,34 +1,73 @@
 from blessed import Terminal
 from engine.core.state_manager import StateManager
+from engine.core.renderer import FrameRenderer
+from engine.core.game_loop import LoopScheduler
+from engine.core.frame_profiler import FrameProfiler
+from engine.core.event_inbox import EventInbox
+from engine.ui.scene import Scene, SceneStack
 import io
 from contextlib import redirect_stdout
 
 class GameClient:
   """Main game client that manages the game loop and state"""
   
-  def __init__(self):
-    self.term = Terminal()
+  def __init__(self, term=None):
+    """
+    Args:
+      term: Terminal to draw to and read keys from (a blessed Terminal by default,
+            a NullTerminal to run headless)
+    """
+    self.term = term if term is not None else Terminal()
     self.state_manager = StateManager()
     self.players = []
     self.current_map = None
+    self.current_map_id = None
     self.player = None
     self.running = False
+    self.renderer = FrameRenderer(self.term)
+    self.scheduler = LoopScheduler(self.term)
+    self.profiler = FrameProfiler()  # Perf HUD, toggled with F3
+    self.inbox = EventInbox()  # Network events waiting to be applied by the loop
+    self.scenes = SceneStack(onEmpty=self.renderer.invalidate)  # Open UIs, drawn over the map
+    self.queuedScenes = []  # Opened once no scene is open
   
-  def registerSystem(self, name, system):
-    """Register a game system with the state manager"""
-    self.state_manager.registerSystem(name, system)
+  def registerSystem(self, name, system, interval=None, events=None):
+    """Register a game system with the state manager (see StateManager.registerSystem for the schedule)"""
+    self.state_manager.registerSystem(name, system, interval, events)
   
   def getSystem(self, name):
     """Get a registered system"""
     return self.state_manager.getSystem(name)
   
+  def subscribe(self, event, handler):
+    """Call handler(*args) when the event is emitted ('mapChanged', 'menu', 'levelUp'...)"""
+    self.state_manager.subscribe(event, handler)
+  
+  def emit(self, event, *args):
+    self.state_manager.emit(event, *args)
+  
+  def addMapChangeListener(self, callback):
+    """Register a callback(map_obj) called whenever the player ends up on another map instance"""
+    self.subscribe('mapChanged', callback)
+  
   def setCurrentMap(self, map_obj):
     """Set the current active map"""
     old_map = self.current_map
     self.current_map = map_obj
     
-    # Update board reference for all remote players when changing maps
-    if old_map != map_obj and map_obj:
+    # Same map object can be a new instance (e.g. the next dungeon stage)
+    map_id = map_obj.getMapId() if map_obj else None
+    newInstance = map_id != self.current_map_id
+    if newInstance:
+      self.current_map_id = map_id
+      self.emit('mapChanged', map_obj)
+    
+    if map_obj:
+      map_obj.hud = self.profiler if self.profiler.enabled else None
+    
+    # Update board reference for all remote players when changing maps (a new
+    # instance of the same map has its own board)
+    if (old_map != map_obj or newInstance) and map_obj:
       for player in self.players:
         if hasattr(player, 'setBoard'):
           player.setBoard(
@@ -37,37 +76,124 @@ class GameClient:
             map_obj.getWindowHeight()
           )
   
+  def openScene(self, scene, whenIdle=False):
+    """
+    Open a UI over the map, it gets the input until it closes (the world keeps ticking)
+    
+    Args:
+      scene: Scene to push
+      whenIdle: Wait until no scene is open (e.g. a level up during a fight)
+    """
+    if whenIdle and self.scenes:
+      self.queuedScenes.append(scene)
+    else:
+      self.scenes.push(scene)
+  
   def setPlayer(self, player):
     """Set the main player"""
     self.player = player
+    player.events = self.state_manager  # Menu keys and level ups are emitted as events
     if player not in self.players:
       self.players.append(player)
   
   def draw(self):
-    """Draw the current game state with double buffering to prevent flickering"""
+    """Draw the current game state, only sending the cells that changed since the last frame"""
     if self.current_map:
-      # Build the entire frame in a buffer first
-      buffer = io.StringIO()
-      with redirect_stdout(buffer):
-        self.current_map.init(self.players, self.term)
-      
-      # Print everything at once
-      print(self.term.home + self.term.clear + buffer.getvalue(), end='', flush=True)
+      self.profiler.time('render', self.drawFrame)
+      self.profiler.endFrame()
+  
+  def drawFrame(self):
+    # Build the entire frame in a buffer first
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+      self.current_map.init(self.players, self.term)
+    
+    self.renderer.present(buffer.getvalue())
+  
+  def redraw(self):
+    """Force a full redraw (used when something else has drawn over the map)"""
+    self.renderer.invalidate()
+    self.draw()
+  
+  def handleInput(self, key):
+    """Apply one key press read by the loop scheduler"""
+    if key.name == 'KEY_F3':
+      self.togglePerfOverlay()
+      return
+    if self.scenes:
+      self.profiler.time('input', self.scenes.handleInput, key)
+      return
+    if self.player:
+      self.profiler.time('input', self.player.handleInput, key, getattr(self, 'sio', None))
+    self.checkInteractions()
   
   def update(self):
-    """Update game state (called every frame)"""
+    """Advance the simulation by one tick"""
+    # Network events received since the last tick are applied here, on the loop thread
+    self.profiler.time('net', self.inbox.drain)
+    self.profiler.time('sim', self.simulate)
+    
+    if self.profiler.pingDue():
+      self.pingServer()
+    
+    if not self.scenes and self.queuedScenes:
+      self.scenes.push(self.queuedScenes.pop(0))
+    
+    if self.scenes:
+      # Timers and animations of the open UI, the map doesn't react to the player meanwhile
+      self.profiler.time('sim', self.scenes.update)
+    else:
+      self.checkInteractions()
+  
+  def simulate(self):
     # Update all registered systems
     self.state_manager.update()
     
-    # Check for portal transitions
+    if self.current_map:
+      self.current_map.update(self.players)
+  
+  # ==================== Perf overlay ====================
+  
+  def togglePerfOverlay(self):
+    """Show or hide the frame timings under the player info"""
+    enabled = self.profiler.toggle()
+    if self.current_map:
+      self.current_map.hud = self.profiler if enabled else None
+    self.renderer.invalidate()
+  
+  def pingServer(self):
+    """Measure the socket round trip, the server acks 'latency_ping' with what it was sent"""
+    sio = getattr(self, 'sio', None)
+    if not sio or not getattr(sio, 'connected', False):
+      return
+    clock = self.profiler.clock
+    sio.emit('latency_ping', clock(), callback=lambda sentAt: self.profiler.recordRtt(clock() - sentAt))
+  
+  def checkInteractions(self):
+    """Check portal transitions and collisions for the main player"""
+    if self.scenes:
+      return  # A key just opened a menu, the map waits for it to close
     if self.current_map and self.player:
       transition = self.current_map.checkPortalTransition(self.player)
       if transition:
         transition.execute(self.player, self.term)
         self.setCurrentMap(transition.getDestinationMap())  # Use setter to update remote players
+        self.renderer.invalidate()
       
-      # Handle collisions
-      self.current_map.handleCollisions(self.player, self.draw, self.term)
+      # Handle collisions (an NPC, a building or an enemy can open a UI)
+      result = self.current_map.handleCollisions(self.player, self.redraw, self.term)
+      if isinstance(result, Scene):
+        self.openScene(result)
+      elif result:
+        self.renderer.invalidate()
+  
+  def render(self):
+    """Draw a frame (called by the loop scheduler at the render rate)"""
+    if self.scenes:
+      self.profiler.time('render', self.scenes.render)
+      self.profiler.endFrame()
+    else:
+      self.draw()
   
   def gameLoop(self):
     """Main game loop"""
@@ -75,22 +201,11 @@ class GameClient:
     
     with self.term.fullscreen(), self.term.cbreak(), self.term.hidden_cursor():
       while self.running:
-        if self.player and self.player.getHp() <= 0:
+        if self.player and self.player.getHp() <= 0 and not self.scenes:
           self.showGameOver()
           break
         
-        # Check if inventory is open
-        if self.player and hasattr(self.player, 'getIsInventoryOpen') and self.player.getIsInventoryOpen():
-          # Inventory UI will be handled by the game-specific code
-          pass
-        else:
-          self.draw()
-        
-        # Handle player input
-        if self.player:
-          self.player.init(getattr(self, 'sio', None))
-        
-        self.update()
+        self.scheduler.step(self.handleInput, self.update, self.render)
   
   def showGameOver(self):
     """Display game over screen"""
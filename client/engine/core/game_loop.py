@@ -0,0 +1,132 @@
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, List
+
+if TYPE_CHECKING:
+  from blessed import Terminal
+
+class LoopScheduler:
+  """Fixed-timestep game loop: input is drained every step, the simulation ticks at a
+  fixed rate and rendering is capped independently"""
+
+  def __init__(self, term: 'Terminal', tickRate: float = 10, renderRate: float = 30,
+               maxTicksPerStep: int = 5, maxKeysPerStep: int = 32):
+    """
+    Args:
+      term: Blessed Terminal instance (input source)
+      tickRate: Simulation ticks per second (enemy AI, systems, network flush)
+      renderRate: Maximum frames drawn per second
+      maxTicksPerStep: Catch-up limit after a stall (e.g. a map transition), extra ticks are dropped
+      maxKeysPerStep: Maximum keys handled per step, the rest wait for the next step
+    """
+    self.term = term
+    self.tickInterval = 1.0 / tickRate
+    self.renderInterval = 1.0 / renderRate
+    self.maxTicksPerStep = maxTicksPerStep
+    self.maxKeysPerStep = maxKeysPerStep
+    self.clock = time.perf_counter
+
+    self.accumulator = 0.0
+    self.lastTime = None
+    self.lastRender = None
+    self.pendingKeys = []
+
+    # Frame pacing stats
+    self.ticks = 0
+    self.frames = 0
+    self.inputEvents = 0
+    self.droppedTicks = 0
+    self.lastFrameTime = 0.0
+    self.maxFrameTime = 0.0
+    self.frameTimestamps = deque(maxlen=60)
+
+  def setTickRate(self, tickRate: float):
+    self.tickInterval = 1.0 / tickRate
+
+  def setRenderRate(self, renderRate: float):
+    self.renderInterval = 1.0 / renderRate
+
+  def drainInput(self) -> List:
+    """Collect every key waiting in the input buffer without blocking"""
+    keys = self.pendingKeys
+    self.pendingKeys = []
+    while len(keys) < self.maxKeysPerStep:
+      key = self.term.inkey(timeout=0)
+      if not key:
+        break
+      keys.append(key)
+    return keys
+
+  def step(self, onInput: Callable, onTick: Callable, onRender: Callable):
+    """
+    Run one loop iteration
+
+    Args:
+      onInput: Called with each key read since the last step
+      onTick: Called once per elapsed simulation tick
+      onRender: Called when a frame is due
+    """
+    now = self.clock()
+    if self.lastTime is None:
+      self.lastTime = now
+    self.accumulator += now - self.lastTime
+    self.lastTime = now
+
+    for key in self.drainInput():
+      self.inputEvents += 1
+      onInput(key)
+
+    ticks = 0
+    while self.accumulator >= self.tickInterval:
+      if ticks == self.maxTicksPerStep:
+        # Too far behind (the loop was stalled), skip ahead instead of bursting
+        self.droppedTicks += int(self.accumulator / self.tickInterval)
+        self.accumulator %= self.tickInterval
+        break
+      onTick()
+      self.accumulator -= self.tickInterval
+      self.ticks += 1
+      ticks += 1
+
+    now = self.clock()
+    if self.lastRender is None or now - self.lastRender >= self.renderInterval:
+      onRender()
+      end = self.clock()
+      self.lastRender = now
+      self.frames += 1
+      self.lastFrameTime = end - now
+      self.maxFrameTime = max(self.maxFrameTime, self.lastFrameTime)
+      self.frameTimestamps.append(end)
+
+    self.wait()
+
+  def wait(self):
+    """Sleep until the next tick or frame is due, waking early on input"""
+    now = self.clock()
+    untilTick = self.tickInterval - self.accumulator - (now - self.lastTime)
+    untilRender = self.renderInterval - (now - self.lastRender) if self.lastRender is not None else 0
+    timeout = max(0.0, min(untilTick, untilRender))
+    key = self.term.inkey(timeout=timeout)
+    if key:
+      self.pendingKeys.append(key)
+
+  def getFps(self) -> float:
+    """Frames per second over the last 60 frames"""
+    if len(self.frameTimestamps) < 2:
+      return 0.0
+    elapsed = self.frameTimestamps[-1] - self.frameTimestamps[0]
+    return (len(self.frameTimestamps) - 1) / elapsed if elapsed > 0 else 0.0
+
+  def getStats(self) -> dict:
+    """Frame pacing stats"""
+    return {
+      'ticks': self.ticks,
+      'frames': self.frames,
+      'fps': self.getFps(),
+      'tickRate': 1.0 / self.tickInterval,
+      'renderRate': 1.0 / self.renderInterval,
+      'inputEvents': self.inputEvents,
+      'droppedTicks': self.droppedTicks,
+      'lastFrameTime': self.lastFrameTime,
+      'maxFrameTime': self.maxFrameTime
+    }
@@ -0,0 +1,108 @@
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+class ServerClock:
+  """Estimate of the server's clock, from the timestamps it puts on its broadcasts
+
+  Each broadcast gives `serverTime - localTime`: the clock offset minus however
+  long that message took to arrive. The least delayed message seen is the best
+  estimate, so a larger sample is taken at once, while smaller ones (a slower
+  network, clock drift) pull the estimate down slowly, so one late packet
+  doesn't shift it.
+  """
+
+  def __init__(self, adaptRate: float = 0.05):
+    """
+    Args:
+      adaptRate: Fraction of the gap closed per sample when samples come in below the estimate
+    """
+    self.clock = time.perf_counter
+    self.adaptRate = adaptRate
+    self.offset: Optional[float] = None  # Server seconds - local seconds
+
+  def observe(self, serverTime: float):
+    """Server time (seconds) stamped on a message that just arrived (call on receipt)"""
+    sample = serverTime - self.clock()
+    if self.offset is None or sample > self.offset:
+      self.offset = sample
+    else:
+      self.offset += (sample - self.offset) * self.adaptRate
+
+  def now(self) -> Optional[float]:
+    """Estimated server time, None before the first timestamp"""
+    if self.offset is None:
+      return None
+    return self.clock() + self.offset
+
+class SnapshotBuffer:
+  """Positions of one entity stamped with server time, sampled at any time between them
+
+  Rendering a little in the past (see ServerClock) almost always falls between two
+  snapshots: the entity then walks from one to the other instead of jumping at each
+  update, which is what lets updates be sent less often.
+  """
+
+  def __init__(self, size: int = 16, maxSpeed: float = 50.0):
+    """
+    Args:
+      size: Snapshots kept
+      maxSpeed: Tiles per second above which two snapshots are a teleport (no walking in between)
+    """
+    self.snapshots = deque(maxlen=size)  # (serverTime, position), oldest first
+    self.maxSpeed = maxSpeed
+
+  def push(self, serverTime: float, position: List[int]):
+    if self.snapshots and serverTime < self.snapshots[-1][0]:
+      return  # Out of order, older than what is already there
+    self.snapshots.append((serverTime, list(position)))
+
+  def reset(self, position: List[int] = None, serverTime: float = 0.0):
+    """Forget the history (start over at position if given)"""
+    self.snapshots.clear()
+    if position is not None:
+      self.snapshots.append((serverTime, list(position)))
+
+  def sample(self, renderTime: float, isBlocked: Callable[[List[int]], bool] = None) -> Optional[List[int]]:
+    """
+    Position at renderTime (server time)
+
+    Args:
+      renderTime: When to sample, clamped to the first and last snapshot (no extrapolation)
+      isBlocked: Optional check, a cell in between that is blocked shows the older snapshot instead
+
+    Returns:
+      The tile, None while empty
+    """
+    if not self.snapshots:
+      return None
+    if renderTime <= self.snapshots[0][0]:
+      return self.snapshots[0][1]
+
+    # Snapshots older than the one before renderTime are no longer needed
+    while len(self.snapshots) > 1 and self.snapshots[1][0] <= renderTime:
+      self.snapshots.popleft()
+    if len(self.snapshots) == 1:
+      return self.snapshots[0][1]
+
+    (startTime, start), (endTime, end) = self.snapshots[0], self.snapshots[1]
+    distance = abs(end[0] - start[0]) + abs(end[1] - start[1])
+    span = endTime - startTime
+    if distance == 0 or span <= 0 or distance > self.maxSpeed * span:
+      return start
+
+    fraction = (renderTime - startTime) / span
+    position = [round(start[0] + (end[0] - start[0]) * fraction),
+                round(start[1] + (end[1] - start[1]) * fraction)]
+    if isBlocked and isBlocked(position):
+      return start
+    return position
+
+  def latest(self) -> Optional[List[int]]:
+    return self.snapshots[-1][1] if self.snapshots else None
+
+  def latestTime(self) -> Optional[float]:
+    return self.snapshots[-1][0] if self.snapshots else None
+
+  def __len__(self):
+    return len(self.snapshots)
@@ -0,0 +1,94 @@
+from typing import Callable, Dict, Hashable, Iterator, List, Tuple, Union
+
+def itemKey(item: dict) -> Hashable:
+  """Stack key of an item: its id, or its name for items without one"""
+  return item.get('id', item.get('name'))
+
+class ItemStacks:
+  """Items grouped into stacks keyed by item id
+
+  Adding, removing and counting are O(1). Stacks keep the order they were first
+  added in (a stack that empties and comes back goes to the end), which is the
+  order inventories are listed and indexed in.
+  """
+
+  def __init__(self, keyFunc: Callable[[dict], Hashable] = itemKey):
+    self.keyFunc = keyFunc
+    self.stacks: Dict[Hashable, List] = {}  # key -> [item, count]
+    self.total = 0
+    self.version = 0  # Bumped on every change so views can cache
+    self.orderCache = None
+
+  def keyOf(self, itemOrKey: Union[dict, Hashable]) -> Hashable:
+    return self.keyFunc(itemOrKey) if isinstance(itemOrKey, dict) else itemOrKey
+
+  def add(self, item: dict, quantity: int = 1) -> Hashable:
+    """Add items to their stack (the first item added is the stack's representative)"""
+    key = self.keyFunc(item)
+    stack = self.stacks.get(key)
+    if stack is None:
+      self.stacks[key] = [item, quantity]
+      self.orderCache = None
+    else:
+      stack[1] += quantity
+    self.total += quantity
+    self.version += 1
+    return key
+
+  def remove(self, itemOrKey: Union[dict, Hashable], quantity: int = 1) -> int:
+    """Remove up to `quantity` items from a stack, returns how many were removed"""
+    key = self.keyOf(itemOrKey)
+    stack = self.stacks.get(key)
+    if stack is None:
+      return 0
+    removed = min(quantity, stack[1])
+    stack[1] -= removed
+    if stack[1] == 0:
+      del self.stacks[key]
+      self.orderCache = None
+    self.total -= removed
+    self.version += 1
+    return removed
+
+  def count(self, itemOrKey: Union[dict, Hashable]) -> int:
+    stack = self.stacks.get(self.keyOf(itemOrKey))
+    return stack[1] if stack else 0
+
+  def get(self, itemOrKey: Union[dict, Hashable]):
+    """Representative item of a stack, or None"""
+    stack = self.stacks.get(self.keyOf(itemOrKey))
+    return stack[0] if stack else None
+
+  def keys(self) -> List[Hashable]:
+    """Stack keys in display order (cached until a stack is added or emptied)"""
+    if self.orderCache is None:
+      self.orderCache = list(self.stacks)
+    return self.orderCache
+
+  def stackAt(self, index: int) -> Tuple[dict, int]:
+    """(item, count) of the stack at a display index"""
+    return tuple(self.stacks[self.keys()[index]])
+
+  def getStacks(self) -> List[Tuple[dict, int]]:
+    """(item, count) for every stack in display order"""
+    return [(item, count) for item, count in self.stacks.values()]
+
+  def getTotal(self) -> int:
+    """Number of items across all stacks"""
+    return self.total
+
+  def clear(self):
+    self.stacks.clear()
+    self.total = 0
+    self.version += 1
+    self.orderCache = None
+
+  def __len__(self):
+    return len(self.stacks)
+
+  def __contains__(self, itemOrKey):
+    return self.keyOf(itemOrKey) in self.stacks
+
+  def __iter__(self) -> Iterator[dict]:
+    """Representative item of each stack"""
+    return (stack[0] for stack in list(self.stacks.values()))
@@ -0,0 +1,104 @@
+from collections import deque
+from typing import Callable, List, Optional
+
+class MovePrediction:
+  """Client-side prediction of the local player's moves, reconciled with the server's acks
+
+  A move is applied locally right away and sent with a sequence number. The server
+  processes moves in order and acks the last one it got to along with the position it
+  left the player on. The acked moves are dropped and the ones still in flight are
+  replayed on top of that position: with a normal round trip that ends where the
+  player already is and nothing moves on screen, only a move the server refused (or
+  a position it changed) makes the player jump, which is counted as a correction.
+  """
+
+  def __init__(self, canEnter: Callable[[List[int]], bool] = None):
+    """
+    Args:
+      canEnter: Optional check for replayed steps, a step into a cell that is now blocked is skipped
+    """
+    self.canEnter = canEnter
+    self.seq = 0
+    self.pending = deque()  # (seq, [dy, dx] step or None, position for non-step moves)
+    self.lastAck = 0
+
+    # Stats
+    self.sent = 0
+    self.acks = 0
+    self.replayed = 0
+    self.corrections = 0
+    self.correctionDistance = 0  # Tiles the player was moved by corrections, summed
+    self.rejected = 0           # Moves the server refused (as it reports them)
+
+  def record(self, fromPosition: List[int], toPosition: List[int]) -> int:
+    """Number a move the player just made, returns its sequence number"""
+    step = [toPosition[0] - fromPosition[0], toPosition[1] - fromPosition[1]]
+    if abs(step[0]) + abs(step[1]) == 1:
+      return self.push(step, None)
+    return self.push(None, list(toPosition))
+
+  def teleport(self, position: List[int]) -> int:
+    """Number a position set outright (map change, spawn), the replay doesn't go through walls to it"""
+    return self.push(None, list(position))
+
+  def push(self, step: Optional[List[int]], position: Optional[List[int]]) -> int:
+    self.seq += 1
+    self.sent += 1
+    self.pending.append((self.seq, step, position))
+    return self.seq
+
+  def reconcile(self, ackSeq: int, serverPosition: List[int], currentPosition: List[int],
+                rejected: int = None) -> Optional[List[int]]:
+    """
+    Apply a server ack
+
+    Args:
+      ackSeq: Last move the server processed
+      serverPosition: Where that left the player on the server
+      currentPosition: Where the player is now on this client
+      rejected: Server's count of refused moves, if it sends one
+
+    Returns:
+      The position the player has to be moved to, None when the prediction was right
+    """
+    if ackSeq < self.lastAck:
+      return None  # Older than one already applied
+    self.lastAck = ackSeq
+    self.acks += 1
+    if rejected is not None:
+      self.rejected = rejected
+
+    while self.pending and self.pending[0][0] <= ackSeq:
+      self.pending.popleft()
+
+    position = list(serverPosition)
+    for _, step, target in self.pending:
+      if step is None:
+        position = list(target)
+        continue
+      nextPosition = [position[0] + step[0], position[1] + step[1]]
+      if self.canEnter is None or self.canEnter(nextPosition):
+        position = nextPosition
+    self.replayed += len(self.pending)
+
+    if position == list(currentPosition):
+      return None
+    self.corrections += 1
+    self.correctionDistance += abs(position[0] - currentPosition[0]) + abs(position[1] - currentPosition[1])
+    return position
+
+  def reset(self):
+    """Forget the moves in flight (new connection), numbering goes on"""
+    self.pending.clear()
+    self.lastAck = self.seq
+
+  def getStats(self) -> dict:
+    return {
+      'sent': self.sent,
+      'pending': len(self.pending),
+      'acks': self.acks,
+      'replayed': self.replayed,
+      'corrections': self.corrections,
+      'correctionDistance': self.correctionDistance,
+      'rejected': self.rejected
+    }
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Iterable, Optional
+
+class Keystroke(str):
+  """Key read from a NullTerminal, mimics blessed's Keystroke (a str with a name)"""
+
+  def __new__(cls, text: str = '', name: Optional[str] = None):
+    key = super().__new__(cls, text)
+    key.name = name
+    key.code = None
+    return key
+
+  @property
+  def is_sequence(self) -> bool:
+    return self.name is not None
+
+class ScriptedInput:
+  """Thread-safe key source for a NullTerminal
+
+  Keys pushed from any thread are returned first, in order. When none are queued the
+  optional fallback(timeout) is asked for one (a bot deciding its next key) and may
+  return None to let the read time out like a real terminal.
+  """
+
+  def __init__(self, keys: Iterable[str] = (), fallback: Callable[[Optional[float]], Optional[str]] = None):
+    self.keys = deque(keys)
+    self.fallback = fallback
+    self.condition = threading.Condition()
+    self.keysRead = 0
+
+  def push(self, *keys: str):
+    with self.condition:
+      self.keys.extend(keys)
+      self.condition.notify_all()
+
+  def read(self, timeout: Optional[float] = None) -> str:
+    """Next key, waiting up to timeout seconds (None waits until there is one)"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      with self.condition:
+        if self.keys:
+          self.keysRead += 1
+          return self.keys.popleft()
+      if self.fallback:
+        key = self.fallback(timeout)
+        if key:
+          self.keysRead += 1
+          return key
+      with self.condition:
+        if self.keys:
+          continue
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+          return ''
+        # With a fallback, poll it again at least every 50ms
+        if self.fallback:
+          remaining = 0.05 if remaining is None else min(remaining, 0.05)
+        self.condition.wait(remaining)
+
+class NullFormatter(str):
+  """Formatting string that styles nothing: term.red('x') == 'x' and str(term.red) == ''"""
+
+  def __call__(self, *args) -> str:
+    return ''.join(str(arg) for arg in args)
+
+class NullTerminal:
+  """Headless stand-in for a blessed Terminal
+
+  Styles and cursor moves are empty strings, context managers do nothing and keys come
+  from a ScriptedInput, so game code can run without a tty (bots, benchmarks).
+  """
+
+  def __init__(self, width: int = 80, height: int = 24, input: ScriptedInput = None):
+    self.width = width
+    self.height = height
+    self.input = input if input is not None else ScriptedInput()
+    self.number_of_colors = 0
+    self.does_styling = False
+    self.is_a_tty = False
+
+  def __getattr__(self, name: str) -> NullFormatter:
+    # Any style name (bold_red, black_on_white, normal, clear, home...) is a no-op
+    if name.startswith('_'):
+      raise AttributeError(name)
+    return NullFormatter('')
+
+  def inkey(self, timeout: Optional[float] = None, esc_delay: float = 0.35) -> Keystroke:
+    key = self.input.read(timeout)
+    return key if isinstance(key, Keystroke) else Keystroke(key)
+
+  # ==================== Cursor ====================
+
+  def move_xy(self, x: int, y: int) -> str:
+    return ''
+
+  def move_yx(self, y: int, x: int) -> str:
+    return ''
+
+  def move_x(self, x: int) -> str:
+    return ''
+
+  def move_y(self, y: int) -> str:
+    return ''
+
+  def move(self, y: int, x: int) -> str:
+    return ''
+
+  def location(self, x: int = None, y: int = None):
+    return nullcontext()
+
+  def get_location(self, timeout: float = None):
+    return (0, 0)
+
+  # ==================== Modes ====================
+
+  def fullscreen(self):
+    return nullcontext()
+
+  def cbreak(self):
+    return nullcontext()
+
+  def raw(self):
+    return nullcontext()
+
+  def hidden_cursor(self):
+    return nullcontext()
+
+  # ==================== Text ====================
+
+  def center(self, text: str, width: int = None, fillchar: str = ' ') -> str:
+    return str(text).center(width or self.width, fillchar)
+
+  def ljust(self, text: str, width: int = None, fillchar: str = ' ') -> str:
+    return str(text).ljust(width or self.width, fillchar)
+
+  def rjust(self, text: str, width: int = None, fillchar: str = ' ') -> str:
+    return str(text).rjust(width or self.width, fillchar)
+
+  def length(self, text: str) -> int:
+    return len(text)
+
+  def strip_seqs(self, text: str) -> str:
+    return text
+
+  def color_rgb(self, red: int, green: int, blue: int) -> NullFormatter:
+    return NullFormatter('')
+
+  def on_color_rgb(self, red: int, green: int, blue: int) -> NullFormatter:
+    return NullFormatter('')
@@ -1,6 +1,7 @@
 import time
 from typing import TYPE_CHECKING, List
 from typing import TypedDict
+from engine.core.item_stacks import ItemStacks
 
 class Item(TypedDict, total=False):
   name: str
@@ -53,7 +54,9 @@ class Player:
     self.xpToNextLevel = 100
     
     # Inventory system
-    self.inventory = []
+    self.inventory = ItemStacks()
+    self.inventoryView = None
+    self.inventoryViewVersion = -1
     self.isInventoryOpen = False
     self.gold = 0
     
@@ -61,63 +64,82 @@ class Player:
     self.notificationMessage = ''
     self.notificationTime = 0
     
+    # Event bus (the GameClient's StateManager), menus are flags to poll without one
+    self.events = None
+    
     # Player character on map
     self.playerChar = 'X'
   
   # ==================== Movement ====================
   
   def movePlayer(self, network_callback=None):
+    """
+    Read a key (waiting up to 50ms) and handle it
+    
+    Args:
+      network_callback: Optional callback(new_position) for multiplayer sync
+    """
+    key = self.term.inkey(timeout=0.05)
+    self.handleInput(key, network_callback)
+  
+  def handleInput(self, key, network_callback=None):
     """
     Handle player movement with WASD or arrow keys
     
     Args:
+      key: Keystroke already read from the terminal
       network_callback: Optional callback(new_position) for multiplayer sync
     """
     newPlayerPosition = self.playerPosition.copy()
-    key = self.term.inkey(timeout=0.05)
     
     if key.name == 'KEY_UP' or key == 'w':
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
       if not self.pathIsBlocked([self.playerPosition[0]-1, self.playerPosition[1]]):
         newPlayerPosition[0] -= 1
     
     elif key.name == 'KEY_DOWN' or key == 's':
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
       if not self.pathIsBlocked([self.playerPosition[0]+1, self.playerPosition[1]]):
         newPlayerPosition[0] += 1
     
     elif key.name == 'KEY_LEFT' or key == 'a':
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
       if not self.pathIsBlocked([self.playerPosition[0], self.playerPosition[1]-1]):
         newPlayerPosition[1] -= 1
     
     elif key.name == 'KEY_RIGHT' or key == 'd':
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
       if not self.pathIsBlocked([self.playerPosition[0], self.playerPosition[1]+1]):
         newPlayerPosition[1] += 1
     
     elif key == 'i':
-      self.isInventoryOpen = not self.isInventoryOpen
+      self.requestMenu('inventory', 'isInventoryOpen')
     
     elif key.lower() == 'k':
       # Toggle skills menu if the player has this attribute (for MMO player)
       if hasattr(self, 'isSkillsMenuOpen'):
-        self.isSkillsMenuOpen = not self.isSkillsMenuOpen
+        self.requestMenu('skills', 'isSkillsMenuOpen')
     
     elif key.lower() == 'p':
       # Toggle party menu if the player has this attribute
       if hasattr(self, 'isPartyMenuOpen'):
-        self.isPartyMenuOpen = not self.isPartyMenuOpen
+        self.requestMenu('party', 'isPartyMenuOpen')
     
     elif key.lower() == 'h':
       # Toggle house editor if the player has this attribute
       if hasattr(self, 'isHouseEditorOpen'):
-        self.isHouseEditorOpen = not self.isHouseEditorOpen
+        self.requestMenu('houseEditor', 'isHouseEditorOpen')
     
     if newPlayerPosition != self.playerPosition:
-      if network_callback:
-        network_callback(newPlayerPosition)
-      self.playerPosition = newPlayerPosition
+      self.moveTo(newPlayerPosition, network_callback)
+  
+  def moveTo(self, position: List[int], network_callback=None):
+    """
+    Move the player as a move of its own (synced like a key press, unlike setPlayerPosition)
+    
+    Args:
+      position: New position [y, x]
+      network_callback: Optional callback(new_position) for multiplayer sync
+    """
+    if network_callback:
+      network_callback(position)
+    self.playerPosition = position
   
   def pathIsBlocked(self, position: List[int]) -> bool:
     """Check if a position is blocked"""
@@ -129,13 +151,9 @@ class Player:
       return True
     return False
   
-  def drawPlayer(self):
-    """Draw player on the board"""
-    self.lines[self.playerPosition[0]][self.playerPosition[1]] = self.playerChar
-  
-  def removePlayer(self):
-    """Remove player from current position"""
-    self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
+  def drawPlayer(self, layer):
+    """Draw player on the map's entity layer (the terrain in `lines` is never written)"""
+    layer.draw(self.playerPosition, self.playerChar)
   
   # ==================== Position ====================
   
@@ -212,29 +230,36 @@ class Player:
   # ==================== Inventory ====================
   
   def getInventory(self) -> List[dict]:
-    """Get inventory with item quantities"""
-    inventory = self.inventory.copy()
-    
-    for item in inventory:
-      item['quantity'] = self.inventory.count(item)
-    
-    # Remove duplicates
-    inventory = list({v['name']:v for v in inventory}.values())
-    
-    return inventory
+    """Get inventory stacks as item copies with a quantity (rebuilt only after a change)"""
+    if self.inventoryViewVersion != self.inventory.version:
+      self.inventoryView = [{**item, 'quantity': count} for item, count in self.inventory.getStacks()]
+      self.inventoryViewVersion = self.inventory.version
+    return self.inventoryView
   
-  def addToInventory(self, item: Item):
+  def addToInventory(self, item: Item, quantity: int = 1):
     """Add item to inventory"""
-    self.inventory.append(item)
-    self.showNotification(f"Collected: {item['name']}!")
+    self.inventory.add(item, quantity)
+    if quantity == 1:
+      self.showNotification(f"Collected: {item['name']}!")
+    else:
+      self.showNotification(f"Collected: {quantity}x {item['name']}!")
+  
+  def removeFromInventory(self, item, quantity: int = 1) -> int:
+    """Remove items by item dict or stack key, returns how many were removed"""
+    return self.inventory.remove(item, quantity)
+  
+  def getItemCount(self, item) -> int:
+    """Number of an item (item dict or stack key) in the inventory"""
+    return self.inventory.count(item)
   
   def dropItem(self, itemIndex: int):
-    """Remove item from inventory"""
-    self.inventory.remove(self.inventory[itemIndex])
+    """Remove one item of the stack at an inventory index"""
+    item, _ = self.inventory.stackAt(itemIndex)
+    self.inventory.remove(item)
   
   def equipItem(self, itemIndex: int):
     """Equip an item (apply its effects)"""
-    item = self.inventory[itemIndex]
+    item, _ = self.inventory.stackAt(itemIndex)
     
     if 'hp' in item:
       self.hp = min(self.hp + item['hp'], self.maxHp)
@@ -243,6 +268,13 @@ class Player:
     if 'defense' in item:
       self.defense += item['defense']
   
+  def requestMenu(self, menu: str, flag: str):
+    """Ask for a menu: a 'menu' event with its name, or toggle its flag when there's no event bus"""
+    if self.events:
+      self.events.emit('menu', menu)
+    else:
+      setattr(self, flag, not getattr(self, flag))
+  
   def getIsInventoryOpen(self) -> bool:
     return self.isInventoryOpen
   
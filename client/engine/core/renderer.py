@@ -0,0 +1,117 @@
+import re
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+  from blessed import Terminal
+
+Cell = Tuple[str, str]
+
+class FrameRenderer:
+  """Keeps the last frame sent to the terminal and only writes the cells that changed"""
+
+  # CSI sequences (colors, cursor moves), charset selection and other two-byte escapes
+  SEQUENCE = re.compile(r'(\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[()][0-9A-Za-z]|\x1b[@-Z\\-_])')
+  RESETS = ('\x1b[m', '\x1b[0m')
+
+  def __init__(self, term: 'Terminal'):
+    self.term = term
+    self.previous: Optional[List[List[Cell]]] = None
+    self.size = None
+
+    # Bandwidth stats
+    self.frames = 0
+    self.fullRedraws = 0
+    self.lastFrameBytes = 0
+    self.totalBytes = 0
+
+  def invalidate(self):
+    """Forget the last frame so the next one is a full redraw (e.g. after a UI cleared the screen)"""
+    self.previous = None
+
+  def parse(self, text: str) -> List[List[Cell]]:
+    """Turn printed output into rows of (style, char) cells"""
+    rows = []
+    row = []
+    style = ''
+    for token in self.SEQUENCE.split(text):
+      if not token:
+        continue
+      if token[0] == '\x1b':
+        style = '' if token in self.RESETS else style + token
+        continue
+      for char in token:
+        if char == '\n':
+          rows.append(row)
+          row = []
+        else:
+          row.append((style, char))
+    if row:
+      rows.append(row)
+    return rows
+
+  def diff(self, cells: List[List[Cell]]) -> str:
+    """Build the escape sequences that turn the previous frame into this one"""
+    term = self.term
+    out = []
+    cursor = None
+    style = None
+
+    for y in range(max(len(cells), len(self.previous))):
+      new = cells[y] if y < len(cells) else []
+      old = self.previous[y] if y < len(self.previous) else []
+
+      for x, cell in enumerate(new):
+        if x < len(old) and old[x] == cell:
+          continue
+        if cursor != (x, y):
+          out.append(term.move_xy(x, y))
+        if cell[0] != style:
+          out.append(term.normal + cell[0])
+          style = cell[0]
+        out.append(cell[1])
+        cursor = (x + 1, y)
+
+      # Row got shorter, wipe the leftover tail
+      if len(old) > len(new):
+        if cursor != (len(new), y):
+          out.append(term.move_xy(len(new), y))
+        if style:
+          out.append(term.normal)
+          style = ''
+        out.append(term.clear_eol)
+        cursor = (len(new), y)
+
+    if style:
+      out.append(term.normal)
+    return ''.join(out)
+
+  def present(self, text: str):
+    """Send a frame to the terminal, falling back to a full redraw on the first frame or a resize"""
+    cells = self.parse(text)
+    size = (self.term.width, self.term.height)
+
+    if self.previous is None or size != self.size:
+      out = self.term.home + self.term.clear + text
+      self.fullRedraws += 1
+    else:
+      out = self.diff(cells)
+
+    self.previous = cells
+    self.size = size
+
+    if out:
+      print(out, end='', flush=True)
+
+    self.frames += 1
+    self.lastFrameBytes = len(out.encode('utf-8'))
+    self.totalBytes += self.lastFrameBytes
+
+  def getStats(self) -> dict:
+    """Bytes written per frame, to measure how much the diffing saves"""
+    return {
+      'frames': self.frames,
+      'fullRedraws': self.fullRedraws,
+      'lastFrameBytes': self.lastFrameBytes,
+      'averageFrameBytes': self.totalBytes / self.frames if self.frames else 0,
+      'totalBytes': self.totalBytes
+    }
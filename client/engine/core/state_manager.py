@@ -1,19 +1,166 @@
+import heapq
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class ScheduledSystem:
+  """A registered system with its schedule and timing stats"""
+
+  def __init__(self, name: str, system: Any, interval: Optional[float]):
+    self.name = name
+    self.system = system
+    self.interval = interval  # None: only runs on events
+    self.handlers = []        # (event, handler) subscribed for this system
+    self.generation = 0       # Bumped when rescheduled, older heap entries are skipped
+
+    # Stats
+    self.calls = 0
+    self.totalTime = 0.0
+    self.maxTime = 0.0
+    self.lastTime = 0.0
+
+  def record(self, seconds: float):
+    self.calls += 1
+    self.totalTime += seconds
+    self.lastTime = seconds
+    if seconds > self.maxTime:
+      self.maxTime = seconds
+
+  def getStats(self) -> dict:
+    return {
+      'interval': self.interval,
+      'calls': self.calls,
+      'totalTime': self.totalTime,
+      'meanTime': self.totalTime / self.calls if self.calls else 0.0,
+      'maxTime': self.maxTime,
+      'lastTime': self.lastTime
+    }
+
 class StateManager:
-  """Manages persistent game state and systems (Farm, Quests, etc.)"""
-  
+  """Manages persistent game state and systems (Farm, Quests, etc.)
+
+  Systems say when they need to run instead of being updated every tick: every
+  `interval` seconds (0 for every tick) and/or when an event they subscribed to is
+  emitted. Due systems are kept in a heap, so a tick only touches the ones whose
+  time has come. Time spent in each system (updates and event handlers) is recorded.
+  """
+
   def __init__(self):
-    self.systems = {}
-  
-  def registerSystem(self, name, system):
-    """Register a game system"""
-    self.systems[name] = system
-  
-  def getSystem(self, name):
+    self.systems: Dict[str, ScheduledSystem] = {}
+    self.schedule = []  # Heap of (dueAt, order, generation, ScheduledSystem)
+    self.listeners: Dict[str, List[Callable]] = {}
+    self.clock = time.perf_counter
+    self.order = 0  # Tie-breaker, systems due at the same time run in registration order
+
+  def registerSystem(self, name: str, system: Any, interval: Optional[float] = None,
+                     events: Dict[str, Any] = None):
+    """
+    Register a game system
+
+    Args:
+      name: Name to get it back with
+      system: The system, its update() is called on schedule
+      interval: Seconds between update() calls, 0 for every tick. Defaults to the system's
+                `updateInterval` attribute (None: only its events), else every tick when
+                it has an update()
+      events: {event: handler} to call when the event is emitted, a handler can be a
+              callable or the name of one of the system's methods
+    """
+    if name in self.systems:
+      self.unregisterSystem(name)
+
+    if interval is None:
+      interval = getattr(system, 'updateInterval', 0 if hasattr(system, 'update') else None)
+    scheduled = ScheduledSystem(name, system, interval)
+    self.systems[name] = scheduled
+
+    for event, handler in (events or {}).items():
+      if isinstance(handler, str):
+        handler = getattr(system, handler)
+      timed = self.timed(scheduled, handler)
+      scheduled.handlers.append((event, timed))
+      self.subscribe(event, timed)
+
+    if interval is not None:
+      self.reschedule(scheduled, self.clock() + interval)
+
+  def unregisterSystem(self, name: str):
+    scheduled = self.systems.pop(name, None)
+    if scheduled:
+      scheduled.generation += 1  # Drops it from the schedule
+      for event, handler in scheduled.handlers:
+        self.unsubscribe(event, handler)
+
+  def getSystem(self, name: str):
     """Get a registered system"""
-    return self.systems.get(name)
-  
+    scheduled = self.systems.get(name)
+    return scheduled.system if scheduled else None
+
+  def setInterval(self, name: str, interval: Optional[float]):
+    """Change how often a system runs (None: only on its events)"""
+    scheduled = self.systems[name]
+    scheduled.interval = interval
+    scheduled.generation += 1
+    if interval is not None:
+      self.reschedule(scheduled, self.clock() + interval)
+
+  def reschedule(self, scheduled: ScheduledSystem, dueAt: float):
+    self.order += 1
+    heapq.heappush(self.schedule, (dueAt, self.order, scheduled.generation, scheduled))
+
+  # ==================== Events ====================
+
+  def subscribe(self, event: str, handler: Callable):
+    """Call handler(*args) whenever the event is emitted"""
+    self.listeners.setdefault(event, []).append(handler)
+
+  def unsubscribe(self, event: str, handler: Callable):
+    handlers = self.listeners.get(event)
+    if handlers and handler in handlers:
+      handlers.remove(handler)
+
+  def emit(self, event: str, *args):
+    """Call the event's handlers now, in subscription order (from the loop thread)"""
+    for handler in list(self.listeners.get(event, ())):
+      handler(*args)
+
+  def timed(self, scheduled: ScheduledSystem, function: Callable) -> Callable:
+    """function, with its time added to the system's stats"""
+    def run(*args):
+      start = self.clock()
+      try:
+        return function(*args)
+      finally:
+        scheduled.record(self.clock() - start)
+    return run
+
+  # ==================== Tick ====================
+
   def update(self):
-    """Update all systems that need per-frame updates"""
-    for system in self.systems.values():
-      if hasattr(system, 'update'):
-        system.update()
+    """Update the systems that are due (called once per simulation tick)"""
+    now = self.clock()
+    due = []
+    while self.schedule and self.schedule[0][0] <= now:
+      dueAt, _, generation, scheduled = heapq.heappop(self.schedule)
+      if self.systems.get(scheduled.name) is scheduled and scheduled.generation == generation:
+        due.append((dueAt, scheduled))
+
+    due.reverse()
+    try:
+      while due:
+        dueAt, scheduled = due.pop()
+        start = self.clock()
+        try:
+          scheduled.system.update()
+        finally:
+          end = self.clock()
+          scheduled.record(end - start)
+          # Keep the cadence, but don't queue up missed runs after a stall
+          self.reschedule(scheduled, max(dueAt + scheduled.interval, end))
+    finally:
+      # A system that raised doesn't make the others miss their turn
+      for dueAt, scheduled in due:
+        self.reschedule(scheduled, dueAt)
+
+  def getStats(self) -> Dict[str, dict]:
+    """Timing stats per system"""
+    return {name: scheduled.getStats() for name, scheduled in self.systems.items()}
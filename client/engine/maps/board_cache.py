@@ -0,0 +1,137 @@
+from array import array
+from collections import OrderedDict
+from typing import List
+from engine.maps.generators import generateBoard, DEFAULT_GENERATOR
+
+def largestRegion(cells: bytes, width: int) -> List[int]:
+  """Flat indices of the largest group of 4-connected floor cells, in board order"""
+  floor = ord('.')
+  height = len(cells) // width
+  seen = bytearray(len(cells))
+  best = []
+  for start, cell in enumerate(cells):
+    if cell != floor or seen[start]:
+      continue
+    seen[start] = 1
+    region = [start]
+    for index in region:  # Grows while it's walked (breadth-first flood fill)
+      y, x = divmod(index, width)
+      for neighbour, inside in ((index - width, y > 0), (index + width, y < height - 1),
+                                (index - 1, x > 0), (index + 1, x < width - 1)):
+        if inside and not seen[neighbour] and cells[neighbour] == floor:
+          seen[neighbour] = 1
+          region.append(neighbour)
+    if len(region) > len(best):
+      best = region
+  best.sort()
+  return best
+
+class BoardLayout:
+  """Immutable generated layout stored compactly (one byte per cell plus the floor cell list)"""
+
+  __slots__ = ('width', 'height', 'cells', 'floorCells')
+
+  def __init__(self, width: int, height: int, cells: bytes, floorCells: array):
+    self.width = width
+    self.height = height
+    self.cells = cells
+    # Flat indices (y * width + x) of the largest connected walkable area, used as spawn
+    # points so nothing lands in a pocket the player can't reach
+    self.floorCells = floorCells
+
+  @classmethod
+  def fromBoard(cls, board: List[List[str]], width: int, height: int) -> 'BoardLayout':
+    cells = ''.join(''.join(row[:width]) for row in board[:height]).encode('ascii')
+    floorCells = array('I', largestRegion(cells, width))
+    return cls(width, height, cells, floorCells)
+
+  def toLines(self) -> List[List[str]]:
+    """Fresh, mutable copy of the board for a map to draw on"""
+    text = self.cells.decode('ascii')
+    return [list(text[i:i + self.width]) for i in range(0, len(text), self.width)]
+
+  def getFloorPosition(self, index: int) -> List[int]:
+    """Convert a floor cell index into a [y, x] position"""
+    return list(divmod(self.floorCells[index], self.width))
+
+  def getSize(self) -> int:
+    """Approximate memory used by the layout in bytes"""
+    return len(self.cells) + self.floorCells.itemsize * len(self.floorCells)
+
+class BoardCache:
+  """LRU cache of generated layouts keyed by (seed, level, width, height, algorithm)
+
+  Generators are deterministic for a given seed, so a cached layout is exactly
+  what a fresh generation would produce.
+  """
+
+  def __init__(self, maxBytes: int = 4 * 1024 * 1024, verify: bool = False):
+    """
+    Args:
+      maxBytes: Memory cap for stored layouts, least recently used ones are evicted first
+      verify: Regenerate on every hit and check it matches the cached layout (debugging)
+    """
+    self.maxBytes = maxBytes
+    self.verify = verify
+    self.layouts = OrderedDict()
+    self.currentBytes = 0
+
+    # Stats
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def generate(self, seed, width: int, height: int, algorithm: str) -> BoardLayout:
+    return BoardLayout.fromBoard(generateBoard(width, height, seed, algorithm), width, height)
+
+  def getLayout(self, seed, level: int, width: int, height: int, algorithm: str = DEFAULT_GENERATOR) -> BoardLayout:
+    """Get a layout, generating and caching it on a miss"""
+    key = (seed, level, width, height, algorithm)
+    layout = self.layouts.get(key)
+
+    if layout is not None:
+      self.hits += 1
+      self.layouts.move_to_end(key)
+      if self.verify:
+        fresh = self.generate(seed, width, height, algorithm)
+        if fresh.cells != layout.cells:
+          raise RuntimeError(f"Cached board for {key} differs from a fresh generation")
+      return layout
+
+    self.misses += 1
+    layout = self.generate(seed, width, height, algorithm)
+
+    # Layouts bigger than the whole cache are returned without being stored
+    if layout.getSize() <= self.maxBytes:
+      self.layouts[key] = layout
+      self.currentBytes += layout.getSize()
+      self.evict()
+    return layout
+
+  def evict(self):
+    """Drop least recently used layouts until under the memory cap"""
+    while self.currentBytes > self.maxBytes and self.layouts:
+      _, layout = self.layouts.popitem(last=False)
+      self.currentBytes -= layout.getSize()
+      self.evictions += 1
+
+  def setMaxBytes(self, maxBytes: int):
+    self.maxBytes = maxBytes
+    self.evict()
+
+  def clear(self):
+    self.layouts.clear()
+    self.currentBytes = 0
+
+  def getStats(self) -> dict:
+    return {
+      'entries': len(self.layouts),
+      'bytes': self.currentBytes,
+      'maxBytes': self.maxBytes,
+      'hits': self.hits,
+      'misses': self.misses,
+      'evictions': self.evictions
+    }
+
+# Shared by every map in the process so re-generations of the same floor are instant
+boardCache = BoardCache()
@@ -0,0 +1,42 @@
+from itertools import groupby
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+  from blessed import Terminal
+
+class BoardRenderer:
+  """Renders board rows from a char -> style palette resolved once per terminal"""
+
+  def __init__(self, term: 'Terminal', palette: Dict[str, str], defaultStyle: str = 'normal'):
+    """
+    Args:
+      term: Blessed Terminal instance
+      palette: Maps a board char to a blessed style name, e.g. {'#': 'bold_white'}
+      defaultStyle: Style for chars not in the palette
+    """
+    self.term = term
+    self.normal = str(term.normal)
+    self.default = self.resolve(defaultStyle)
+    self.styles = {char: self.resolve(style) for char, style in palette.items()}
+
+  def resolve(self, style: str) -> str:
+    """Get the raw escape sequence for a blessed style name"""
+    if style == 'normal':
+      return ''
+    return str(getattr(self.term, style))
+
+  def renderRow(self, row: List[str]) -> str:
+    """Render one row, merging runs of same-styled cells into one escape sequence"""
+    styles = self.styles
+    default = self.default
+    parts = []
+    for sequence, run in groupby(row, key=lambda char: styles.get(char, default)):
+      if sequence:
+        parts.append(sequence + ''.join(run) + self.normal)
+      else:
+        parts.append(''.join(run))
+    return ''.join(parts)
+
+  def render(self, lines: List[List[str]], width: int, height: int) -> List[str]:
+    """Render the visible part of the board, one string per row"""
+    return [self.renderRow(row[:width]) for row in lines[:height]]
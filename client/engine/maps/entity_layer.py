@@ -0,0 +1,23 @@
+from typing import Dict, Optional, Sequence
+
+class EntityLayer:
+  """Overlay of entity glyphs (players, enemies, chests, portals) kept apart from a map's
+  terrain, cleared and redrawn every frame and composed over the terrain at render time"""
+
+  def __init__(self):
+    self.rows: Dict[int, Dict[int, str]] = {}  # y -> {x: char}
+
+  def draw(self, position: Sequence[int], char: str):
+    """Put a glyph on a cell (later draws cover earlier ones)"""
+    self.rows.setdefault(position[0], {})[position[1]] = char
+
+  def getAt(self, position: Sequence[int]) -> Optional[str]:
+    """Glyph drawn on a cell this frame, or None"""
+    row = self.rows.get(position[0])
+    return row.get(position[1]) if row else None
+
+  def clear(self):
+    self.rows.clear()
+
+  def __len__(self):
+    return sum(len(row) for row in self.rows.values())
@@ -0,0 +1,180 @@
+"""
+Board generators for procedural maps.
+
+Every generator takes a private random.Random instance plus the board size and
+returns a height x width grid of '#' (wall) and '.' (floor). They all run in
+time linear in the number of cells, so large boards stay cheap.
+"""
+import random
+from typing import Callable, Dict, List
+
+Board = List[List[str]]
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DEFAULT_GENERATOR = 'backtracker'
+
+GENERATORS: Dict[str, Callable[[random.Random, int, int], Board]] = {}
+
+def registerGenerator(name: str):
+  """Decorator that registers a board generator under a name"""
+  def decorator(generator):
+    GENERATORS[name] = generator
+    return generator
+  return decorator
+
+def getGeneratorNames() -> List[str]:
+  return list(GENERATORS.keys())
+
+def generateBoard(width: int, height: int, seed=None, algorithm: str = DEFAULT_GENERATOR) -> Board:
+  """
+  Generate a board with a registered algorithm
+
+  Args:
+    width: Board width
+    height: Board height
+    seed: Seed for the generator's own Random instance (global random is untouched)
+    algorithm: Registered generator name
+
+  Returns:
+    height x width grid of '#' and '.'
+  """
+  if algorithm not in GENERATORS:
+    raise ValueError(f"Unknown board generator '{algorithm}' (available: {', '.join(GENERATORS)})")
+  return GENERATORS[algorithm](random.Random(seed), width, height)
+
+@registerGenerator('backtracker')
+def backtracker(rng: random.Random, width: int, height: int) -> Board:
+  """Depth-first random walk with backtracking: the final walk is left as walls,
+  backtracked cells become floor"""
+  board = [['.'] * width for _ in range(height)]
+  remaining = width * height
+
+  y, x = rng.randrange(height), rng.randrange(width)
+  board[y][x] = 'X'
+  remaining -= 1
+  path = [(y, x)]
+
+  def unvisitedNeighbours(y, x):
+    cells = []
+    for dy, dx in DIRECTIONS:
+      ny, nx = y + dy, x + dx
+      if 0 <= ny < height and 0 <= nx < width and board[ny][nx] == '.':
+        cells.append((ny, nx))
+    return cells
+
+  while remaining:
+    cells = unvisitedNeighbours(y, x)
+    if not cells:
+      # Backtrack until a cell with unvisited neighbours shows up
+      while path:
+        y, x = path.pop()
+        board[y][x] = 'O'
+        cells = unvisitedNeighbours(y, x)
+        if cells:
+          break
+      if not cells:
+        break
+
+    y, x = rng.choice(cells)
+    board[y][x] = 'X'
+    remaining -= 1
+    path.append((y, x))
+
+  for row in board:
+    for j in range(width):
+      row[j] = '#' if row[j] == 'X' else '.'
+  return board
+
+@registerGenerator('prim')
+def prim(rng: random.Random, width: int, height: int) -> Board:
+  """Randomized Prim's maze: rooms on even coordinates, walls in between"""
+  board = [['#'] * width for _ in range(height)]
+  frontier = []
+
+  def addFrontier(y, x):
+    for dy, dx in DIRECTIONS:
+      ny, nx = y + dy * 2, x + dx * 2
+      if 0 <= ny < height and 0 <= nx < width and board[ny][nx] == '#':
+        frontier.append((y + dy, x + dx, ny, nx))
+
+  y, x = rng.randrange(0, height, 2), rng.randrange(0, width, 2)
+  board[y][x] = '.'
+  addFrontier(y, x)
+
+  while frontier:
+    # Swap-remove a random frontier edge in O(1)
+    index = rng.randrange(len(frontier))
+    frontier[index], frontier[-1] = frontier[-1], frontier[index]
+    wallY, wallX, y, x = frontier.pop()
+    if board[y][x] == '#':
+      board[wallY][wallX] = '.'
+      board[y][x] = '.'
+      addFrontier(y, x)
+
+  return board
+
+@registerGenerator('caves')
+def caves(rng: random.Random, width: int, height: int, fill: float = 0.45, iterations: int = 4) -> Board:
+  """Cellular-automata caves: random fill smoothed by the 4-5 rule"""
+  walls = [[1 if rng.random() < fill else 0 for _ in range(width)] for _ in range(height)]
+
+  # Out of bounds counts as wall so caves close at the edges
+  wallRow = [3] * width
+  for _ in range(iterations):
+    # 3x3 wall counts from horizontal then vertical running sums, O(cells) per pass
+    sums = []
+    for row in walls:
+      padded = [1] + row + [1]
+      sums.append([a + b + c for a, b, c in zip(padded, padded[1:], padded[2:])])
+    above = [wallRow] + sums[:-1]
+    below = sums[1:] + [wallRow]
+    walls = [
+      [1 if a + b + c >= 5 else 0 for a, b, c in zip(up, mid, down)]
+      for up, mid, down in zip(above, sums, below)
+    ]
+
+  return [['#' if wall else '.' for wall in row] for row in walls]
+
+@registerGenerator('bsp')
+def bsp(rng: random.Random, width: int, height: int, minLeaf: int = 6) -> Board:
+  """Binary space partition: one room per leaf, sibling rooms joined by L-shaped corridors"""
+  board = [['#'] * width for _ in range(height)]
+
+  def carve(y, x):
+    board[y][x] = '.'
+
+  def corridor(a, b):
+    (y1, x1), (y2, x2) = a, b
+    for x in range(min(x1, x2), max(x1, x2) + 1):
+      carve(y1, x)
+    for y in range(min(y1, y2), max(y1, y2) + 1):
+      carve(y, x2)
+
+  def split(top, left, h, w):
+    """Partition a region and return a floor cell inside it"""
+    canSplitY = h >= minLeaf * 2
+    canSplitX = w >= minLeaf * 2
+    if not canSplitY and not canSplitX:
+      roomH = rng.randint(max(1, h // 2), max(1, h - 1))
+      roomW = rng.randint(max(1, w // 2), max(1, w - 1))
+      roomTop = top + rng.randint(0, h - roomH)
+      roomLeft = left + rng.randint(0, w - roomW)
+      for y in range(roomTop, roomTop + roomH):
+        for x in range(roomLeft, roomLeft + roomW):
+          carve(y, x)
+      return (roomTop + roomH // 2, roomLeft + roomW // 2)
+
+    splitY = canSplitY and (not canSplitX or h > w or (h == w and rng.random() < 0.5))
+    if splitY:
+      cut = rng.randint(minLeaf, h - minLeaf)
+      first = split(top, left, cut, w)
+      second = split(top + cut, left, h - cut, w)
+    else:
+      cut = rng.randint(minLeaf, w - minLeaf)
+      first = split(top, left, h, cut)
+      second = split(top, left + cut, h, w - cut)
+    corridor(first, second)
+    return first
+
+  split(0, 0, height, width)
+  return board
@@ -1,22 +1,91 @@
+from engine.maps.board_renderer import BoardRenderer
+from engine.maps.entity_layer import EntityLayer
+
 class Map:
-  """Base class for all maps in the game (Dungeon, City, Farm, etc.)"""
+  """Base class for all maps in the game (Dungeon, City, Farm, etc.)
+
+  The board has two layers: `lines` is the terrain, which only changes when the map
+  builds it, and `entities` is an overlay redrawn every frame. Entities never write
+  into the terrain, they are composed over it when the board is rendered.
+  """
+  
+  # Board char -> blessed style name, declared by each map
+  palette = {}
+  defaultStyle = 'normal'
   
   def __init__(self, width, height):
     self.windowWidth = width
     self.windowHeight = height
     self.lines = []
+    self.entities = EntityLayer()
+    self.boardRenderer = None
+    
+    # Rendered terrain rows, reused until the terrain or renderer changes
+    self.terrainRows = None
+    self.terrainSource = None
+    self.terrainRenderer = None
+    
+    # Optional overlay (getLines(term)) printed between the player info and the board
+    self.hud = None
   
   def createBoard(self):
     """Creates the initial board/map layout"""
     raise NotImplementedError("Subclasses must implement createBoard()")
   
+  def getBoardRenderer(self, term):
+    """Get the renderer for this map's palette (resolved once per terminal)"""
+    if self.boardRenderer is None or self.boardRenderer.term is not term:
+      self.boardRenderer = BoardRenderer(term, self.palette, self.defaultStyle)
+    return self.boardRenderer
+  
+  def invalidateTerrain(self):
+    """Call after changing the terrain in place so its rows get rendered again"""
+    self.terrainRows = None
+  
+  def renderBoard(self, term):
+    """Render the visible board, one string per row
+    
+    Terrain rows are rendered once and reused, only rows with an entity on them are
+    composed and rendered again each frame.
+    """
+    renderer = self.getBoardRenderer(term)
+    if self.terrainRows is None or self.terrainSource is not self.lines or self.terrainRenderer is not renderer:
+      self.terrainRows = renderer.render(self.lines, self.windowWidth, self.windowHeight)
+      self.terrainSource = self.lines
+      self.terrainRenderer = renderer
+    
+    rows = list(self.terrainRows)
+    for y, cells in self.entities.rows.items():
+      if not 0 <= y < len(rows):
+        continue
+      row = self.lines[y][:self.windowWidth]
+      for x, char in cells.items():
+        if 0 <= x < len(row):
+          row[x] = char
+      rows[y] = renderer.renderRow(row)
+    return rows
+  
+  def printHud(self, term):
+    """Print the HUD overlay, if one is attached"""
+    if self.hud is not None:
+      for line in self.hud.getLines(term):
+        print(line)
+  
   def printBoard(self, term):
     """Renders the map to the terminal"""
-    raise NotImplementedError("Subclasses must implement printBoard()")
+    print('\n'.join(self.renderBoard(term)))
+  
+  def getMapId(self):
+    """Identity of the map instance players share (used as the server's interest room)"""
+    return type(self).__name__.lower()
   
   def getLines(self):
+    """Terrain layer (entities are drawn on getEntities())"""
     return self.lines
   
+  def getEntities(self):
+    return self.entities
+  
   def getWindowWidth(self):
     return self.windowWidth
   
@@ -27,10 +96,17 @@ class Map:
     """Initialize and draw the map"""
     raise NotImplementedError("Subclasses must implement init()")
   
-  def handleCollisions(self, player, draw, term):
-    """Handle collision logic specific to this map (enemies, NPCs, etc.)"""
+  def update(self, players):
+    """Advance map simulation (enemy AI, spawns, etc.), called at the simulation tick rate"""
     pass
   
+  def handleCollisions(self, player, draw, term):
+    """Handle collision logic specific to this map (enemies, NPCs, etc.)
+    
+    Returns the Scene of a UI to open over the map (True if something else drew over it)
+    """
+    return None
+  
   def checkPortalTransition(self, player):
     """Check if player is on a portal and return the transition object"""
     return None
@@ -40,6 +116,7 @@ class Map:
       for x in range(len(art[y])):
         if startY + y < self.windowHeight and startX + x < self.windowWidth:
           self.lines[startY + y][startX + x] = art[y][x]
+    self.invalidateTerrain()
 
   def convertArtToBoardItem(self, art: str):
     return [list(line) for line in art.split('\n')]
@@ -0,0 +1,71 @@
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+class SpatialIndex:
+  """Occupancy grid mapping board cells to the entities on them, updated incrementally
+  on spawn, move and despawn so lookups don't scan every entity"""
+
+  def __init__(self):
+    self.cells: Dict[Cell, Dict[Hashable, Any]] = {}
+    self.positions: Dict[Hashable, Cell] = {}
+
+  def add(self, entityId: Hashable, position: Sequence[int], entity: Any):
+    """Register an entity at a position (re-adding an id moves it)"""
+    if entityId in self.positions:
+      self.remove(entityId)
+    cell = (position[0], position[1])
+    self.cells.setdefault(cell, {})[entityId] = entity
+    self.positions[entityId] = cell
+
+  def remove(self, entityId: Hashable):
+    """Unregister an entity (ignored if it isn't indexed)"""
+    cell = self.positions.pop(entityId, None)
+    if cell is None:
+      return
+    occupants = self.cells[cell]
+    entity = occupants.pop(entityId)
+    if not occupants:
+      del self.cells[cell]
+    return entity
+
+  def move(self, entityId: Hashable, position: Sequence[int]):
+    """Update an entity's position (no-op if it didn't change)"""
+    cell = (position[0], position[1])
+    oldCell = self.positions.get(entityId)
+    if oldCell is None or oldCell == cell:
+      return
+    occupants = self.cells[oldCell]
+    entity = occupants.pop(entityId)
+    if not occupants:
+      del self.cells[oldCell]
+    self.cells.setdefault(cell, {})[entityId] = entity
+    self.positions[entityId] = cell
+
+  def getAt(self, position: Sequence[int]) -> List[Any]:
+    """All entities on a cell"""
+    occupants = self.cells.get((position[0], position[1]))
+    return list(occupants.values()) if occupants else []
+
+  def getFirstAt(self, position: Sequence[int]) -> Optional[Any]:
+    """Any one entity on a cell, or None"""
+    occupants = self.cells.get((position[0], position[1]))
+    if occupants:
+      return next(iter(occupants.values()))
+    return None
+
+  def isOccupied(self, position: Sequence[int]) -> bool:
+    return (position[0], position[1]) in self.cells
+
+  def getPosition(self, entityId: Hashable) -> Optional[Cell]:
+    return self.positions.get(entityId)
+
+  def clear(self):
+    self.cells.clear()
+    self.positions.clear()
+
+  def __len__(self):
+    return len(self.positions)
+
+  def __contains__(self, entityId: Hashable):
+    return entityId in self.positions
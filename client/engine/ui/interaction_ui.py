@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from engine.ui.scene import ScriptScene, waitKey, runIfScript
 
 if TYPE_CHECKING:
   from player import Player
@@ -61,21 +62,21 @@ class InteractionUI:
     """Default exit behavior: move player forward and close UI"""
     if key.lower() == 'q':
       currentPosition = self.player.getPlayerPosition()
-      self.player.setPlayerPosition([currentPosition[0] + 1, currentPosition[1]])
+      self.player.moveTo([currentPosition[0] + 1, currentPosition[1]])
       self.isOpen = False
   
-  def get_number_input(self, prompt: str) -> int:
-    """Get a numeric input from the user"""
+  def get_number_input(self, prompt: str):
+    """Get a numeric input from the user (number = yield from ui.get_number_input(...))"""
     while True:
       print(self.term.move_y(self.term.height - 2) + self.term.clear_eol + self.term.center(self.term.white(prompt)).rstrip())
-      inp = self.term.inkey()
+      inp = yield waitKey()
       if inp.isdigit():
         return int(inp)
       else:
-        self.showMessage('Please enter a valid number.', 'red')
+        yield from self.showMessage('Please enter a valid number.', 'red')
 
   def handleInput(self, key):
-    """Handle user input based on configured options"""
+    """Handle user input based on configured options (a script: actions may wait for keys)"""
     self.handleExit(key)
     
     # Check configured options
@@ -83,14 +84,14 @@ class InteractionUI:
       if key.lower() == option['key'].lower():
         action = option.get('action')
         if action and callable(action):
-          action()
+          yield from runIfScript(action())
         return
     
     # Check number keys for items (1-9)
     if key.isdigit() and self.items:
       index = int(key) - 1
       if 0 <= index < len(self.items):
-        self.handleItemSelection(index)
+        yield from self.handleItemSelection(index)
   
   def handleItemSelection(self, index):
     """Handle item selection - verifies gold and delegates to custom action"""
@@ -101,12 +102,12 @@ class InteractionUI:
     
     # Check if already owned
     if item.get('owned', False):
-      self.showMessage('You already own this!', 'red')
+      yield from self.showMessage('You already own this!', 'red')
       return
     
     # Check if player has enough gold
     if self.player.getGold() < item['price']:
-      self.showMessage('Not enough gold!', 'red')
+      yield from self.showMessage('Not enough gold!', 'red')
       return
     
     # Deduct gold
@@ -118,12 +119,12 @@ class InteractionUI:
     # Call custom action if provided
     action = item.get('action')
     if action and callable(action):
-      action(item, self)
+      yield from runIfScript(action(item, self))
     
-    self.showMessage(f"Purchased {item['name']}!", 'green')
+    yield from self.showMessage(f"Purchased {item['name']}!", 'green')
   
   def showMessage(self, message, color='white'):
-    """Show a temporary message at the bottom of the screen"""
+    """Show a temporary message at the bottom of the screen (yield from ui.showMessage(...))"""
     color_func = getattr(self.term, color, self.term.white)
     if color == 'green':
       color_func = self.term.bold_green
@@ -131,15 +132,19 @@ class InteractionUI:
       color_func = self.term.red
     
     print(self.term.move_y(self.term.height - 2) + self.term.center(color_func(message)).rstrip())
-    self.term.inkey(timeout=2)
+    yield waitKey(2)
   
-  def open(self):
-    """Open the interaction UI and handle user input"""
+  def open(self) -> ScriptScene:
+    """Scene showing the interaction UI, for the game's scene stack"""
+    return ScriptScene(self.run())
+  
+  def run(self):
+    """Draw the UI and handle user input until it's closed"""
     self.isOpen = True
     
     while self.isOpen:
       self.draw()
       
-      key = self.term.inkey(timeout=None)
+      key = yield waitKey()
       
-      self.handleInput(key)
+      yield from self.handleInput(key)
@@ -0,0 +1,187 @@
+import inspect
+import time
+from collections import deque
+from typing import Callable, Generator, List, Optional
+from engine.core.null_terminal import Keystroke
+
+NO_KEY = Keystroke('')  # What a wait that timed out gets, like blessed's inkey(timeout=...)
+
+class Scene:
+  """Screen run by the game loop instead of its own blocking loop
+
+  While a scene is on top of the SceneStack it gets every key press, a call per
+  simulation tick and a call per frame; the map below it is neither drawn nor
+  given input, but the simulation and the network keep running at their rate.
+  """
+
+  def __init__(self):
+    self.isOpen = False
+
+  def onEnter(self):
+    """Called when the scene is pushed"""
+    pass
+
+  def onExit(self):
+    """Called when the scene is removed from the stack"""
+    pass
+
+  def onResume(self):
+    """Called when the scene above this one closed (it drew over this one)"""
+    pass
+
+  def handleInput(self, key):
+    pass
+
+  def update(self):
+    """Called once per simulation tick while on top"""
+    pass
+
+  def render(self):
+    """Called at the render rate while on top"""
+    pass
+
+  def close(self):
+    self.isOpen = False
+
+class Wait:
+  """What a script yields: resume after `timeout` seconds, or on the next key when `takesKey`"""
+
+  def __init__(self, timeout: Optional[float], takesKey: bool):
+    self.timeout = timeout
+    self.takesKey = takesKey
+
+def waitKey(timeout: Optional[float] = None) -> Wait:
+  """key = yield waitKey(): next key press, NO_KEY after `timeout` seconds (None waits for a key)"""
+  return Wait(timeout, True)
+
+def sleep(seconds: float) -> Wait:
+  """yield sleep(1): pause the script, keys pressed meanwhile go to its next waitKey()"""
+  return Wait(seconds, False)
+
+def runIfScript(result):
+  """`yield from runIfScript(callback())`: follows the callback's script when it returned one,
+  so callbacks that wait for keys (generators) and plain ones can be mixed"""
+  if inspect.isgenerator(result):
+    return (yield from result)
+  return result
+
+class ScriptScene(Scene):
+  """Scene running a generator written like the old blocking UI loops
+
+  The script prints its screens as before and yields where it used to block:
+  `key = yield waitKey()` instead of term.inkey(), `yield sleep(2)` instead of
+  time.sleep(2). Sub-flows are generators too (`yield from self.prompt()`).
+  The scene closes when the script returns.
+  """
+
+  def __init__(self, script: Generator, onClose: Callable = None):
+    """
+    Args:
+      script: Generator yielding waitKey()/sleep()
+      onClose: Optional callback when the script has returned or the scene was closed
+    """
+    super().__init__()
+    self.script = script
+    self.onClose = onClose
+    self.clock = time.perf_counter
+    self.waiting: Optional[Wait] = None
+    self.deadline = None
+    self.keys = deque()
+
+  def onEnter(self):
+    self.advance(None)
+
+  def onExit(self):
+    self.script.close()
+    if self.onClose:
+      self.onClose()
+
+  def handleInput(self, key):
+    self.keys.append(key)
+    self.resume()
+
+  def update(self):
+    self.resume()
+
+  def resume(self):
+    """Run the script for as long as what it waits for is already there"""
+    while self.isOpen and self.waiting:
+      if self.waiting.takesKey and self.keys:
+        self.advance(self.keys.popleft())
+      elif self.deadline is not None and self.clock() >= self.deadline:
+        self.advance(NO_KEY if self.waiting.takesKey else None)
+      else:
+        break
+
+  def advance(self, value):
+    try:
+      self.waiting = self.script.send(value)
+    except StopIteration:
+      self.waiting = None
+      self.close()
+      return
+    timeout = self.waiting.timeout if self.waiting else None
+    self.deadline = self.clock() + timeout if timeout is not None else None
+
+class SceneStack:
+  """Open scenes, the top one is the one the game loop runs"""
+
+  def __init__(self, onEmpty: Callable = None):
+    """
+    Args:
+      onEmpty: Called when the last scene closed (the map has to be drawn again in full)
+    """
+    self.scenes: List[Scene] = []
+    self.onEmpty = onEmpty
+
+  def push(self, scene: Scene):
+    self.scenes.append(scene)
+    scene.isOpen = True
+    scene.onEnter()
+    self.removeClosed()
+
+  def pop(self) -> Optional[Scene]:
+    if not self.scenes:
+      return None
+    scene = self.scenes[-1]
+    scene.close()
+    self.removeClosed()
+    return scene
+
+  def top(self) -> Optional[Scene]:
+    return self.scenes[-1] if self.scenes else None
+
+  def clear(self):
+    while self.scenes:
+      self.pop()
+
+  def handleInput(self, key):
+    if self.scenes:
+      self.scenes[-1].handleInput(key)
+      self.removeClosed()
+
+  def update(self):
+    if self.scenes:
+      self.scenes[-1].update()
+      self.removeClosed()
+
+  def render(self):
+    if self.scenes:
+      self.scenes[-1].render()
+
+  def removeClosed(self):
+    """Drop the scenes that closed themselves, the one below gets resumed"""
+    removed = False
+    while self.scenes and not self.scenes[-1].isOpen:
+      self.scenes.pop().onExit()
+      removed = True
+      if self.scenes:
+        self.scenes[-1].onResume()
+    if removed and not self.scenes and self.onEmpty:
+      self.onEmpty()
+
+  def __len__(self):
+    return len(self.scenes)
+
+  def __bool__(self):
+    return bool(self.scenes)
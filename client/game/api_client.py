@@ -1,12 +1,116 @@
+import atexit
+import queue
+import threading
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class APIClient:
-  """Client for communicating with the game API"""
+  """Client for communicating with the game API
   
-  def __init__(self, base_url='http://localhost:3001'):
+  Requests go through one pooled keep-alive session with timeouts. Writes the game
+  doesn't wait on (stat syncs) can be queued with the *Async methods, a background
+  worker sends them so the game loop never blocks on the network.
+  """
+  
+  def __init__(self, base_url='http://localhost:3001', timeout=(3.05, 5), retries=3, pool_size=4):
+    """
+    Args:
+      base_url: API server address
+      timeout: Seconds for (connect, read), no request waits longer than this
+      retries: Retries for failed connections and 502/503/504 (idempotent methods only)
+      pool_size: Keep-alive connections kept open to the server
+    """
     self.base_url = base_url
     self.player_id = None
+    self.timeout = timeout
+    
+    # POST isn't retried: a retried create could run twice on the server
+    retry = Retry(
+      total=retries,
+      backoff_factor=0.2,
+      status_forcelist=(502, 503, 504),
+      allowed_methods=frozenset(['GET', 'PATCH'])
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    self.session = requests.Session()
+    self.session.mount('http://', adapter)
+    self.session.mount('https://', adapter)
+    
+    # Background writes
+    self.queue = queue.Queue()
+    self.worker = None
+    self.pending = 0
+    self.idle = threading.Condition()
+    self.closed = False
+    atexit.register(self.close)
+    
+    # Failures of calls made on the worker, recorded instead of printed: the worker
+    # writing to the terminal would land in the middle of the game's frame
+    self.errors = 0
+    self.lastError = None
+  
+  # ==================== Background Worker ====================
+  
+  def submit(self, method, *args, **kwargs):
+    """Queue a call to run on the background worker and return immediately"""
+    if self.closed:
+      return
+    with self.idle:
+      self.pending += 1
+    if self.worker is None:
+      self.worker = threading.Thread(target=self._work, name='api-client', daemon=True)
+      self.worker.start()
+    self.queue.put((method, args, kwargs))
+  
+  def _work(self):
+    while True:
+      call = self.queue.get()
+      if call is None:
+        return
+      method, args, kwargs = call
+      try:
+        method(*args, **kwargs)
+      except Exception as e:
+        self._recordError(f"Background API call failed: {e}")
+      finally:
+        with self.idle:
+          self.pending -= 1
+          self.idle.notify_all()
+  
+  def flush(self, timeout=None):
+    """
+    Wait until every queued call has been sent
+    
+    Returns:
+      True if the queue drained, False if the timeout ran out first
+    """
+    with self.idle:
+      return self.idle.wait_for(lambda: self.pending == 0, timeout)
+  
+  def getPendingCount(self):
+    return self.pending
+  
+  def _recordError(self, message):
+    with self.idle:
+      self.errors += 1
+      self.lastError = message
+  
+  def getLastError(self):
+    """Last failure of a call made on the worker (None if there was none)"""
+    return self.lastError
+  
+  def close(self, timeout=5):
+    """Flush pending writes, stop the worker and close pooled connections (safe to call twice)"""
+    if self.closed:
+      return
+    self.flush(timeout)
+    self.closed = True
+    if self.worker is not None:
+      self.queue.put(None)
+      self.worker.join(timeout)
+    self.session.close()
   
   def createPlayer(self, name, player_class, maxDungeonLevel=0, maxGold=0, maxLevelReached=1):
     """
@@ -23,7 +127,7 @@ class APIClient:
       Player data from server or None if failed
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/player',
         json={
           'name': name,
@@ -32,7 +136,8 @@ class APIClient:
           'maxGold': maxGold,
           'maxLevelReached': maxLevelReached
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 201:
@@ -46,7 +151,7 @@ class APIClient:
       print(f"Failed to create player: {e}")
       return None
   
-  def updatePlayer(self, player_class=None, maxDungeonLevel=None, maxGold=None, maxLevelReached=None):
+  def updatePlayer(self, player_class=None, maxDungeonLevel=None, maxGold=None, maxLevelReached=None, player_id=None):
     """
     Update player stats via PATCH request
     
@@ -55,12 +160,15 @@ class APIClient:
       maxDungeonLevel: Updated max dungeon level (optional)
       maxGold: Updated max gold (optional)
       maxLevelReached: Updated max level (optional)
+      player_id: Player ID (uses stored ID if not provided)
     
     Returns:
-      Updated player data or None if failed
+      Updated player data or None if failed (the error is kept in lastError, this
+      runs on the background worker)
     """
-    if not self.player_id:
-      print("No player ID set. Create player first.")
+    pid = player_id or self.player_id
+    if not pid:
+      self._recordError("No player ID set. Create player first.")
       return None
     
     try:
@@ -75,21 +183,26 @@ class APIClient:
       if maxLevelReached is not None:
         payload['maxLevelReached'] = maxLevelReached
       
-      response = requests.patch(
-        f'{self.base_url}/api/player/{self.player_id}',
+      response = self.session.patch(
+        f'{self.base_url}/api/player/{pid}',
         json=payload,
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
         return response.json()
       else:
-        print(f"Error updating player: {response.status_code} - {response.text}")
+        self._recordError(f"Error updating player: {response.status_code} - {response.text}")
         return None
     except Exception as e:
-      print(f"Failed to update player: {e}")
+      self._recordError(f"Failed to update player: {e}")
       return None
   
+  def updatePlayerAsync(self, **fields):
+    """Queue updatePlayer on the background worker (same arguments, returns immediately)"""
+    self.submit(self.updatePlayer, **fields)
+  
   def getPlayer(self, player_id=None):
     """
     Get player data by ID
@@ -106,7 +219,7 @@ class APIClient:
       return None
     
     try:
-      response = requests.get(f'{self.base_url}/api/player/{pid}')
+      response = self.session.get(f'{self.base_url}/api/player/{pid}', timeout=self.timeout)
       
       if response.status_code == 200:
         return response.json()
@@ -135,7 +248,7 @@ class APIClient:
       return None
     
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/account',
         json={
           'accountId': account_id,
@@ -143,7 +256,8 @@ class APIClient:
           'password': password,
           'gold': initial_gold
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 201:
@@ -170,13 +284,14 @@ class APIClient:
       Account data if valid, None otherwise
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/account/verify',
         json={
           'accountId': account_id,
           'password': password
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
@@ -199,9 +314,10 @@ class APIClient:
       Account data or None if failed
     """
     try:
-      response = requests.get(
+      response = self.session.get(
         f'{self.base_url}/api/bank/account/{account_id}',
-        params={'password': password}
+        params={'password': password},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
@@ -225,14 +341,15 @@ class APIClient:
       Updated account data or None if failed
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/deposit/gold',
         json={
           'accountId': account_id,
           'password': password,
           'amount': amount
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
@@ -257,14 +374,15 @@ class APIClient:
       Updated account data or None if failed
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/withdraw/gold',
         json={
           'accountId': account_id,
           'password': password,
           'amount': amount
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
@@ -289,14 +407,15 @@ class APIClient:
       Updated account data or None if failed
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/deposit/item',
         json={
           'accountId': account_id,
           'password': password,
           'itemId': item_id
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
@@ -321,14 +440,15 @@ class APIClient:
       Updated account data or None if failed
     """
     try:
-      response = requests.post(
+      response = self.session.post(
         f'{self.base_url}/api/bank/withdraw/item',
         json={
           'accountId': account_id,
           'password': password,
           'itemId': item_id
         },
-        headers={'Content-Type': 'application/json'}
+        headers={'Content-Type': 'application/json'},
+        timeout=self.timeout
       )
       
       if response.status_code == 200:
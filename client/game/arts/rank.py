@@ -1,9 +1,10 @@
-def draw_rank_board(rankPosition, rankType, rankList):
+def draw_rank_board(rankPosition, rankType, rankList, total=None):
   """
   Draw rank board with scroll support
-  rankPosition: current scroll position (0-based)
+  rankPosition: current scroll position (0-based), the rank of rankList[0]
   rankType: 'gold', 'level', or 'dungeon'
-  rankList: list of player rank data [{'name': str, 'value': int}, ...]
+  rankList: visible player rank data [{'name': str, 'value': int}, ...]
+  total: number of ranked players (defaults to the end of rankList)
   """
   if rankType == 'gold':
     rankTitle = 'Gold Rank Board'
@@ -27,12 +28,14 @@ def draw_rank_board(rankPosition, rankType, rankList):
   # Max 10 entries displayed
   max_display = 10
   start_idx = rankPosition
-  end_idx = min(start_idx + max_display, len(rankList))
+  end_idx = start_idx + min(max_display, len(rankList))
+  if total is None:
+    total = rankPosition + len(rankList)
   
   # Display rankings
   for i in range(start_idx, end_idx):
     rank_num = i + 1
-    player_data = rankList[i]
+    player_data = rankList[i - start_idx]
     name = player_data.get('name', 'Unknown')[:15]  # Limit name length
     value = player_data.get('value', 0)
     
@@ -53,8 +56,8 @@ def draw_rank_board(rankPosition, rankType, rankList):
   board.append('  |===================================|')
   
   # Scroll indicator
-  if len(rankList) > max_display:
-    scroll_info = f"  Showing {start_idx + 1}-{end_idx} of {len(rankList)}"
+  if total > max_display:
+    scroll_info = f"  Showing {start_idx + 1}-{end_idx} of {total}"
     board.append(scroll_info)
   
   return '\n'.join(board)
@@ -1,6 +1,5 @@
 import random
-from game.items.potions import potions
-from game.items.swords import swords
+from game.items.registry import potions, swords
 
 class Chest:
   def __init__(self, position, lines):
@@ -11,11 +10,11 @@ class Chest:
     #self.loot = potions[0]
     self.id = random.randint(0, 1000000)  # Unique ID for sync
 
-  def drawChest(self):
+  def drawChest(self, layer):
     if self.open == False:
-      self.lines[self.position[0]][self.position[1]] = '▣'
+      layer.draw(self.position, '▣')
     else:
-      self.lines[self.position[0]][self.position[1]] = '□'
+      layer.draw(self.position, '□')
 
   def getPosition(self):
     return self.position
@@ -27,9 +26,5 @@ class Chest:
     self.open = True
     return self.getLoot()
   
-  def removeChest(self):
-    """Remove chest from board"""
-    self.lines[self.position[0]][self.position[1]] = '.'
-  
   def getID(self):
     return self.id
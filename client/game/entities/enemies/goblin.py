@@ -1,6 +1,6 @@
 import random
 from game.entities.enemy import Enemy
-from game.items.materials import seeds
+from game.items.registry import items
 from game.skills.fighting_abilities import fighting_abilities
 
 class Goblin(Enemy):
@@ -18,7 +18,6 @@ class Goblin(Enemy):
     # Goblin skills - rogue/dirty fighter
     self.skills = ["dirty_trick", "goblin_backstab", "sneak_attack"]
     
-    mushroom_seed = next(s for s in seeds if s['name'] == 'Mushroom Seed')
     self.item_drops = [
-      {'item': mushroom_seed, 'chance': 0.05}
+      {'item': items['mushroom_seed'], 'chance': 0.05}
     ]
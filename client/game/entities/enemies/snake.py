@@ -1,6 +1,6 @@
 import random
 from game.entities.enemy import Enemy
-from game.items.materials import materials
+from game.items.registry import items
 from game.skills.fighting_abilities import fighting_abilities
 
 class Snake(Enemy):
@@ -18,7 +18,6 @@ class Snake(Enemy):
     # Snake skills - poison focused
     self.skills = ["poison_bite", "venomous_strike"]
     
-    snake_skin = next(m for m in materials if m['name'] == 'Snake Skin')
     self.item_drops = [
-      {'item': snake_skin, 'chance': 0.3}
+      {'item': items['snake_skin'], 'chance': 0.3}
     ]
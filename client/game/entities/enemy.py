@@ -83,27 +83,19 @@ class Enemy(CombatEntity):
       if direction == 0:
         if self.pathIsBlocked([self.enemyPosition[0]-1, self.enemyPosition[1]], boardWidth, boardHeight) == False:
           newEnemyPosition[0] -= 1
-          self.removeEnemy(lines)
           self.enemyPosition = newEnemyPosition
-          self.drawEnemy(lines)
       elif direction == 1:
         if self.pathIsBlocked([self.enemyPosition[0]+1, self.enemyPosition[1]], boardWidth, boardHeight) == False:
           newEnemyPosition[0] += 1
-          self.removeEnemy(lines)
           self.enemyPosition = newEnemyPosition
-          self.drawEnemy(lines)
       elif direction == 2:
         if self.pathIsBlocked([self.enemyPosition[0], self.enemyPosition[1]-1], boardWidth, boardHeight) == False:
           newEnemyPosition[1] -= 1
-          self.removeEnemy(lines)
           self.enemyPosition = newEnemyPosition
-          self.drawEnemy(lines)
       elif direction == 3:
         if self.pathIsBlocked([self.enemyPosition[0], self.enemyPosition[1]+1], boardWidth, boardHeight) == False:
           newEnemyPosition[1] += 1
-          self.removeEnemy(lines)
           self.enemyPosition = newEnemyPosition
-          self.drawEnemy(lines)
 
 
   def getIsInCombat(self):
@@ -128,11 +120,11 @@ class Enemy(CombatEntity):
   def getEnemyPosition(self):
     return self.enemyPosition
   
-  def drawEnemy(self, lines):
+  def drawEnemy(self, layer):
     if self.isBoss:
-      lines[self.enemyPosition[0]][self.enemyPosition[1]] = 'B'
+      layer.draw(self.enemyPosition, 'B')
     else:
-      lines[self.enemyPosition[0]][self.enemyPosition[1]] = 'E'
+      layer.draw(self.enemyPosition, 'E')
 
   # getHp, setHp, getMP, setMP, getAttack, setAttack, getDefense, getLuck are inherited from CombatEntity
 
@@ -160,9 +152,6 @@ class Enemy(CombatEntity):
   def getIsBoss(self):
     return self.isBoss
 
-  def removeEnemy(self, lines):
-    lines[self.enemyPosition[0]][self.enemyPosition[1]] = '.'
-  
   def get_drops(self):
     """Retorna os drops do inimigo (gold, xp e items)"""
     drops = {
@@ -188,11 +177,11 @@ class Enemy(CombatEntity):
       # 40% chance to use a skill if enemy has skills and MP
       if self.skills and len(self.skills) > 0 and random.random() < 0.4:
         # Try to find a skill we can afford
-        from game.skills.fighting_abilities import fighting_abilities
+        from game.skills.registry import skills
         affordable_skills = []
         
         for skill_id in self.skills:
-          skill = next((s for s in fighting_abilities if s["id"] == skill_id), None)
+          skill = skills.get(skill_id)
           if skill and self.mp >= skill["mpCost"]:
             affordable_skills.append(skill_id)
         
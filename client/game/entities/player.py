@@ -5,6 +5,7 @@ from game.helper import blockers
 from game.mechanics.farm import Farm
 from game.mechanics.combat import CombatSystem
 from game.entities.combat_entity import CombatEntity
+from game.stat_sync import StatSync
 
 class Player(BasePlayer, CombatEntity):
   """MMO Player - extends engine Player with MMO-specific features"""
@@ -86,8 +87,12 @@ class Player(BasePlayer, CombatEntity):
     # Combat system
     self.combat = CombatSystem(term)
     
-    # API client for syncing with server
+    # API client for syncing with server (stats are written behind, see StatSync)
     self.api_client = api_client
+    self.statSync = StatSync(api_client) if api_client else None
+    
+    # Server.sendMove once joined: moves are then numbered and reconciled with the server
+    self.moveSender = None
     
     # Track previous values to detect changes
     self._prev_maxGold = 0
@@ -123,12 +128,30 @@ class Player(BasePlayer, CombatEntity):
 
   # ==================== Overrides ====================
   
-  def movePlayer(self, sio):
-    """Override to add multiplayer network sync"""
+  def _moveEmitter(self, sio):
+    """Network callback that broadcasts our new position"""
+    if self.moveSender:
+      return self.moveSender
+    if not sio:
+      return None
+    
     def network_callback(new_position):
       sio.emit('move', json.dumps({"playerId": self.name, "playerPosition": new_position}))
     
-    super().movePlayer(network_callback)
+    return network_callback
+  
+  def movePlayer(self, sio):
+    """Override to add multiplayer network sync"""
+    super().movePlayer(self._moveEmitter(sio))
+  
+  def handleInput(self, key, sio):
+    """Handle a key read by the game loop (with multiplayer network sync)"""
+    super().handleInput(key, self._moveEmitter(sio))
+    self.inventoryControl()
+  
+  def moveTo(self, position, network_callback=None):
+    """Override so moves made by UIs are synced too"""
+    super().moveTo(position, network_callback or self._moveEmitter(None))
   
   def levelUp(self):
     """Override to add luck stat increase and trigger UI"""
@@ -147,6 +170,8 @@ class Player(BasePlayer, CombatEntity):
       self.skillLevels[skillId] += 1
     
     self.pendingLevelUp = True  # Set flag to show level up UI
+    if self.events:
+      self.events.emit('levelUp')
     self._syncStatsToServer()  # Sync max level to server
 
   def interactWithChest(self, chest, sio=None, party=None):
@@ -215,7 +240,6 @@ class Player(BasePlayer, CombatEntity):
     
     if enemyDied:
       print(self.term.bold_green("You killed the enemy!"))
-      enemy.removeEnemy(self.lines)
       return True
     
     # Enemy counterattacks if still alive
@@ -288,6 +312,6 @@ class Player(BasePlayer, CombatEntity):
       self._prev_maxLevelReached = self.maxLevelReached
       changed = True
     
-    # Send PATCH request if anything changed
+    # Merged with other pending changes and sent on the next flush
     if changed:
-      self.api_client.updatePlayer(**updates)
+      self.statSync.record(**updates)
@@ -2,6 +2,7 @@ from game.arts.materials import *
 
 materials = [
   {
+    'id': 'snake_skin',
     'name': 'Snake Skin',
     'category': 'material',
     'rarity': 'common',
@@ -10,6 +11,7 @@ materials = [
     'origins': ['enemy_drop']
   },
   {
+    'id': 'mushroom',
     'name': 'Mushroom',
     'category': 'material',
     'rarity': 'uncommon',
@@ -21,6 +23,7 @@ materials = [
 
 seeds = [
   {
+    'id': 'mushroom_seed',
     'name': 'Mushroom Seed',
     'category': 'seed',
     'rarity': 'uncommon',
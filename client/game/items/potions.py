@@ -1,7 +1,7 @@
 from game.arts.potions import *
 
 potions = [
-  {'name': 'Small Healing Potion', 'hp': 10, 'price': 10, 'category': 'Potion', 'art': smallPotion},
-  {'name': 'Medium Healing Potion', 'hp': 20, 'price': 15, 'category': 'Potion', 'art': mediumPotion},
-  {'name': 'Great Healing Potion', 'hp': 50, 'price': 50, 'category': 'Potion', 'art': smallPotion},
+  {'id': 'small_healing_potion', 'name': 'Small Healing Potion', 'hp': 10, 'price': 10, 'category': 'Potion', 'art': smallPotion},
+  {'id': 'medium_healing_potion', 'name': 'Medium Healing Potion', 'hp': 20, 'price': 15, 'category': 'Potion', 'art': mediumPotion},
+  {'id': 'great_healing_potion', 'name': 'Great Healing Potion', 'hp': 50, 'price': 50, 'category': 'Potion', 'art': smallPotion},
 ]
@@ -0,0 +1,80 @@
+from typing import Dict, Iterable, List, Optional
+from game.items.materials import materials as materialDefinitions, seeds as seedDefinitions
+from game.items.potions import potions as potionDefinitions
+from game.items.swords import swords as swordDefinitions
+
+class ItemPrototype(dict):
+  """Read-only item definition shared by every holder of the item
+
+  Still a dict so existing item['name'] / item.get() / {**item} code keeps working,
+  but any attempt to change it raises TypeError. Copy it ({**item}) for a variant.
+  """
+  __slots__ = ()
+
+  def _readOnly(self, *args, **kwargs):
+    raise TypeError(f"Item '{self.get('id')}' is a shared prototype and can't be modified")
+
+  __setitem__ = __delitem__ = __ior__ = _readOnly
+  clear = pop = popitem = setdefault = update = _readOnly
+
+  def __hash__(self):
+    return hash(self['id'])
+
+  def __reduce__(self):
+    return (ItemPrototype, (dict(self),))
+
+class ItemRegistry:
+  """Item prototypes indexed by id and by name, built once at import"""
+
+  def __init__(self):
+    self.byId: Dict[str, ItemPrototype] = {}
+    self.byName: Dict[str, ItemPrototype] = {}
+
+  def register(self, definition: dict) -> ItemPrototype:
+    """
+    Register an item definition
+
+    Args:
+      definition: Item dict with a unique 'id' (lists in it are frozen to tuples)
+
+    Returns:
+      The shared prototype
+    """
+    itemId = definition.get('id')
+    if not itemId:
+      raise ValueError(f"Item '{definition.get('name')}' has no id")
+    if itemId in self.byId:
+      raise ValueError(f"Duplicate item id '{itemId}'")
+
+    prototype = ItemPrototype({
+      key: tuple(value) if isinstance(value, list) else value
+      for key, value in definition.items()
+    })
+    self.byId[itemId] = prototype
+    # Names aren't unique (two swords are called 'Iron Sword'), the first one registered wins
+    self.byName.setdefault(prototype['name'], prototype)
+    return prototype
+
+  def registerAll(self, definitions: Iterable[dict]) -> List[ItemPrototype]:
+    return [self.register(definition) for definition in definitions]
+
+  def get(self, itemId: str) -> Optional[ItemPrototype]:
+    return self.byId.get(itemId)
+
+  def getByName(self, name: str) -> Optional[ItemPrototype]:
+    return self.byName.get(name)
+
+  def __getitem__(self, itemId: str) -> ItemPrototype:
+    return self.byId[itemId]
+
+  def __contains__(self, itemId):
+    return itemId in self.byId
+
+  def __len__(self):
+    return len(self.byId)
+
+items = ItemRegistry()
+potions = items.registerAll(potionDefinitions)
+swords = items.registerAll(swordDefinitions)
+materials = items.registerAll(materialDefinitions)
+seeds = items.registerAll(seedDefinitions)
@@ -1,8 +1,8 @@
 from game.arts.swords import *
 
 swords = [
-  {'name': 'Iron Sword', 'attack': 4, 'price': 6, 'category': 'Sword', 'art': rusty_iron_sword},
-  {'name': 'Iron Sword', 'attack': 8, 'price': 15, 'category': 'Sword', 'art': iron_sword},
+  {'id': 'rusty_iron_sword', 'name': 'Iron Sword', 'attack': 4, 'price': 6, 'category': 'Sword', 'art': rusty_iron_sword},
+  {'id': 'iron_sword', 'name': 'Iron Sword', 'attack': 8, 'price': 15, 'category': 'Sword', 'art': iron_sword},
   #{'name': 'Steel Sword', 'attack': 12, 'price': 25, 'category': 'Sword', 'art': ""},
   #{'name': 'Golden Sword', 'attack': 15, 'price': 40, 'category': 'Sword', 'art': ""},
   #{'name': 'Silver Sword', 'attack': 10, 'price': 30, 'category': 'Sword', 'art': ""},
@@ -11,5 +11,5 @@ swords = [
   #{'name': 'Obsidian Sword', 'attack': 18, 'price': 45, 'category': 'Sword', 'art': ""},
   #{'name': 'Dragonbone Sword', 'attack': 25, 'price': 60, 'category': 'Sword', 'art': ""},
   #{'name': 'Mystic Blade', 'attack': 22, 'price': 55, 'category': 'Sword', 'art': ""},
-  {'name': 'Rusty Dagger', 'attack': 3, 'price': 5, 'category': 'Sword', 'art': rusty_dagger},
+  {'id': 'rusty_dagger', 'name': 'Rusty Dagger', 'attack': 3, 'price': 5, 'category': 'Sword', 'art': rusty_dagger},
 ]
@@ -14,13 +14,14 @@ from game.ui.house_editor_ui import HouseEditorUI
 from game.server import Server
 from game.party import Party
 from game.api_client import APIClient
+from game.stat_sync import StatSync
 import socketio
 import time
 
 def main():
   # Initialize terminal and game client
   term = Terminal()
-  client = GameClient()
+  client = GameClient(term)
   
   # Initialize network
   enemies = []
@@ -32,7 +33,7 @@ def main():
   city = City()
   city.createBoard()
   
-  dungeon = Dungeon(enemies, chests, city_map=city, term=term, party=None, sio=sio)
+  dungeon = Dungeon(enemies, chests, city_map=city, term=term, party=None, sio=sio, inbox=client.inbox)
   
   # Callback to regenerate dungeon when joining party while in dungeon
   def on_party_joined():
@@ -42,25 +43,26 @@ def main():
       dungeon.seed = None
       dungeon.is_synced = False
       dungeon.currentLevel = 1
-      dungeon.enemies.clear()
-      dungeon.chests.clear()
+      dungeon.clearEntities()
       dungeon.portalActive = False
       dungeon.portalPosition = None
       dungeon.createBoard()
       dungeon.createRandomEnemies(5)
       dungeon.createRandomChests(5)
+      client.setCurrentMap(dungeon)  # Now in the party's dungeon instance
       print("[Party] Dungeon regenerated to sync with party leader!")
   
   # Initialize party system with callback
-  party = Party(sio, None, on_party_joined_callback=on_party_joined)
+  party = Party(sio, None, on_party_joined_callback=on_party_joined, inbox=client.inbox)
   dungeon.party = party  # Link party to dungeon
   dungeon.setCityMap(city)
+  city.sio = sio  # Rank board gets live updates
   city.setDungeonMap(dungeon)
   
   cityInfo = [city.getLines(), city.getWindowWidth(), city.getWindowHeight()]
   
   # Use client.players directly instead of a separate list
-  server = Server(sio, 'localhost', 3001, client.players, cityInfo)
+  server = Server(sio, 'localhost', 3001, client.players, cityInfo, inbox=client.inbox)
   
   # Player creation UI
   with term.fullscreen(), term.cbreak(), term.hidden_cursor():
@@ -117,6 +119,8 @@ def main():
     
     if server_response:
       print(term.center(term.green(f"Player created on server with ID: {server_response['id']}")).rstrip())
+      # Stats a previous session couldn't send before it ended
+      StatSync.recoverPending(api_client)
       time.sleep(1)
     else:
       print(term.center(term.yellow("Warning: Could not connect to server. Playing offline mode.")).rstrip())
@@ -141,7 +145,31 @@ def main():
     client.sio = sio  # Store sio for network updates
     
     server.start()
-    server.join(player.getName(), player.getPlayerPosition())
+    server.join(player.getName(), player.getPlayerPosition(), client.current_map.getMapId(), player=player)
+    
+    # Only players on the same map (city or dungeon instance) are sent to us
+    client.addMapChangeListener(lambda map_obj: server.changeMap(map_obj.getMapId(), player.getPlayerPosition()))
+    
+    # Ranking stats are written behind: flushed on an interval and at map transitions
+    if player.statSync:
+      client.registerSystem('statSync', player.statSync, interval=1.0,
+                            events={'mapChanged': lambda map_obj: player.statSync.flush()})
+    client.registerSystem('farm', player.farm)  # Growth checked every second
+    
+    # Screens open when asked for instead of being polled every frame
+    menus = {
+      'inventory': inventoryUI,
+      'skills': skillsUI,
+      'party': partyUI,
+      'houseEditor': houseEditorUI
+    }
+    client.subscribe('menu', lambda menu: client.openScene(menus[menu].open()))
+    
+    def onLevelUp():
+      # A level up during a fight waits for the fight to end
+      player.pendingLevelUp = False
+      client.openScene(levelUpUI.open(), whenIdle=True)
+    client.subscribe('levelUp', onLevelUp)
     
     # Request current party state
     party.request_current_party()
@@ -149,7 +177,7 @@ def main():
   # Custom game loop (override GameClient's loop for now)
   with term.fullscreen(), term.cbreak(), term.hidden_cursor():
     while True:
-      if player.getHp() <= 0:
+      if player.getHp() <= 0 and not client.scenes:
         print(term.home + term.clear)
         print(term.move_y(term.height // 2 - 3) + term.center(term.bold_red('=== GAME OVER ===')).rstrip())
         print(term.move_y(term.height // 2 - 1) + term.center(term.yellow('You have been defeated...')).rstrip())
@@ -163,26 +191,13 @@ def main():
         term.inkey()
         break
       
-      # Check for pending level up first
-      if player.pendingLevelUp:
-        levelUpUI.show()
-        player.pendingLevelUp = False
-      elif player.getIsInventoryOpen():
-        inventoryUI.draw()
-      elif player.getIsSkillsMenuOpen():
-        skillsUI.open()
-        player.setIsSkillsMenuOpen(False)  # Reset after closing
-      elif player.isPartyMenuOpen:
-        partyUI.open()
-        player.isPartyMenuOpen = False  # Reset after closing
-      elif player.isHouseEditorOpen:
-        houseEditorUI.render()
-        player.isHouseEditorOpen = False  # Reset after closing
-      else:
-        client.draw()
-      
-      player.init(sio)
-      client.update()
+      client.scheduler.step(client.handleInput, client.update, client.render)
+
+  # Send stat updates still pending before exiting
+  if player.statSync:
+    player.statSync.close()
+  if api_client:
+    api_client.close()
 
 if __name__ == '__main__':
   main()
@@ -1,4 +1,5 @@
 from engine.maps.map import Map
+from engine.maps.spatial_index import SpatialIndex
 from game.arts.buildings import *
 from game.ui.interactiveuis.landlord_ui import LandlordUI
 from game.ui.interactiveuis.yago_ui import YagoUI
@@ -6,12 +7,23 @@ from game.ui.interactiveuis.rank_ui import RankUI
 from game.maps.map_transition import CityToDungeonTransition
 
 class City(Map):
+  palette = {
+    '#': 'bold_white',
+    'X': 'bold_cyan',
+    'P': 'bold_yellow',  # Remote player
+    'D': 'bold_blue_reverse',
+    'Y': 'bold_magenta'
+  }
+  defaultStyle = 'green'
+
   def __init__(self, dungeon_map=None):
     super().__init__(60, 30)
     self.buildings = []
+    self.doorIndex = SpatialIndex()  # Door cell -> building
     self.portalPosition = [self.windowHeight // 2, self.windowWidth - 1]
     self.yagoPosition = [0, self.windowWidth - 1]
     self.dungeon_map = dungeon_map
+    self.sio = None  # Socket for live UIs (rank board), set by the game
 
   def calculateDoorPositions(self, art):
     doors = []
@@ -22,13 +34,14 @@ class City(Map):
     return doors if doors else [(0, 0)]
 
   def onEnterBuilding(self, buildingName, player, term):
+    """Scene of the building's UI (None for buildings without one)"""
     # Map building names to their UI classes
     ui_map = {
       'LandLordHouse': LandlordUI,
       'FarmHouse': lambda p, t: __import__('game.ui.interactiveuis.farmui', fromlist=['FarmUI']).FarmUI(p, t),
       'AlchemistHouse': lambda p, t: __import__('game.ui.interactiveuis.alchemist_ui', fromlist=['AlchemistUI']).AlchemistUI(p, t),
       'Yago': YagoUI,
-      'RankBoard': RankUI,
+      'RankBoard': lambda p, t: RankUI(p, t, sio=self.sio),
       'Bank': lambda p, t: __import__('game.ui.interactiveuis.bank_ui', fromlist=['BankUI']).BankUI(p, t)
     }
     
@@ -40,9 +53,13 @@ class City(Map):
       else:
         # It's a class
         ui = ui_class(player, term)
-      ui.open()
+      return ui.open()
+    return None
 
   def generateHouses(self):
+    self.buildings = []
+    self.doorIndex.clear()
+    
     building_configs = [
       ('LandLordHouse', house, 8, 5, None),
       ('AlchemistHouse', mushroom_house, 18, 5, None),
@@ -62,27 +79,29 @@ class City(Map):
         doors = self.calculateDoorPositions(building_art)
         door_positions = [(start_y + door[0], start_x + door[1]) for door in doors]
       
-      self.buildings.append({
+      building = {
         'name': name,
         'startY': start_y,
         'startX': start_x,
         'art': building_art,
         'onEnter': self.onEnterBuilding,
         'doorPositions': door_positions
-      })
+      }
+      self.buildings.append(building)
+      
+      for doorPosition in door_positions:
+        self.doorIndex.add((name, doorPosition), doorPosition, building)
 
   def handleCollisions(self, player, draw, term):
     # Check Yago collision
     if player.getPlayerPosition() == self.yagoPosition:
-      self.onEnterBuilding('Yago', player, term)
-      return
+      return self.onEnterBuilding('Yago', player, term)
     
     # Check building collisions
-    for building in self.buildings:
-      for doorPosition in building['doorPositions']:
-        if player.getPlayerPosition() == list(doorPosition):
-          building['onEnter'](building['name'], player, term)
-          break
+    building = self.doorIndex.getFirstAt(player.getPlayerPosition())
+    if building:
+      return building['onEnter'](building['name'], player, term)
+    return None
 
   def initBuildings(self):
     self.generateHouses()
@@ -104,26 +123,6 @@ class City(Map):
 
     return self.lines
 
-  def printBoard(self, term):
-    for i in range(self.windowHeight):
-      line = ''
-      for j in range(self.windowWidth):
-        char = self.lines[i][j]
-        if char == '#':
-          line += term.bold_white(char)
-        elif char == 'X':
-          line += term.bold_cyan(char)
-        elif char == 'P':  # Remote player
-          line += term.bold_yellow(char)
-        elif char == 'D':
-          line += term.bold_blue_reverse(char)
-        elif char == 'Y':
-          line += term.bold_magenta(char)
-        else:
-          line += term.green(char)
-      print(line)
-
-
   def printPlayerInfo(self, player, term):
     print(term.bold_white('=' * self.windowWidth))
     hp_color = term.green if player.getHp() > player.getMaxHp() * 0.5 else term.yellow if player.getHp() > player.getMaxHp() * 0.2 else term.red
@@ -137,40 +136,31 @@ class City(Map):
       print(term.bold_green(notification))
     print(term.bold_white('=' * self.windowWidth))
   
-  def drawPortal(self):
-    """Always draw dungeon entrance portal"""
-    self.lines[self.portalPosition[0]][self.portalPosition[1]] = 'D'
-  
-  def drawYago(self):
-    """Always draw Yago"""
-    self.lines[self.yagoPosition[0]][self.yagoPosition[1]] = 'Y'
-  
-  def redrawBuildings(self):
-    """Redraw all buildings (in case they were overwritten by player movement)"""
-    for building in self.buildings:
-      self.placeArt(building['startY'], building['startX'], building['art'])
-  
   def init(self, players, term):
     if len(self.lines) == 0:
       self.createBoard()
     
-    self.redrawBuildings()
-    self.drawPortal()
-    self.drawYago()
-    
+    # Buildings, the portal and Yago are terrain, only players are drawn per frame
+    self.entities.clear()
     for player in players:
-      player.drawPlayer()
+      player.drawPlayer(self.entities)
     
     self.printPlayerInfo(players[0], term)
+    self.printHud(term)
     self.printBoard(term)
 
   def getPortalPosition(self):
     return self.portalPosition
   
+  def getArrivalPosition(self):
+    """Where players coming back from the dungeon appear, 2 tiles left of the portal
+    (the server puts them there too, CITY_ARRIVAL in server/index.js)"""
+    return [self.portalPosition[0], self.portalPosition[1] - 2]
+  
   def setDungeonMap(self, dungeon_map):
     self.dungeon_map = dungeon_map
   
   def checkPortalTransition(self, player):
     if self.portalPosition == player.getPlayerPosition() and self.dungeon_map:
-      return CityToDungeonTransition(self.dungeon_map, [0, 0])
+      return CityToDungeonTransition(self.dungeon_map)
     return None
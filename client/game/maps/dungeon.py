@@ -1,26 +1,56 @@
 import random
 from game.entities.enemy import Enemy
-from engine.maps.procedural_board import ProceduralBoard
+from engine.maps.generators import GENERATORS
+from engine.maps.board_cache import boardCache
+from engine.maps.spatial_index import SpatialIndex
 from game.entities.chest import Chest
 from engine.maps.map import Map
+from engine.core.event_inbox import listen
 from game.maps.map_transition import DungeonNextLevelTransition, DungeonToCityTransition
 
+# Where players arrive on every stage, the server puts them there too (DUNGEON_SPAWN in server/index.js)
+DUNGEON_SPAWN = (0, 0)
+
+# Stages cycle through the board generators unless one is set with setGeneratorForLevel
+LEVEL_GENERATORS = ('backtracker', 'caves', 'bsp', 'prim')
+
 class Dungeon(Map):
-  def __init__(self, enemies, chests, city_map=None, term=None, party=None, sio=None):
+  palette = {
+    '#': 'bold_white',
+    'X': 'bold_cyan',
+    'P': 'bold_yellow',  # Remote player
+    'B': 'bold_red_reverse',
+    'E': 'bold_red',
+    'C': 'bold_yellow',
+    'U': 'bold_magenta'
+  }
+  defaultStyle = 'green'
+
+  def __init__(self, enemies, chests, city_map=None, term=None, party=None, sio=None, inbox=None):
     super().__init__(30, 15)
     self.enemies = enemies
     self.chests = chests
+    
+    # Cell -> entity lookups for collisions and chest pickup
+    self.enemyIndex = SpatialIndex()
+    self.chestIndex = SpatialIndex()
     self.currentLevel = 1
     self.portalPosition = None
     self.portalActive = False
+    self.spawnPosition = [0, 0]       # Where players arrive, placed with each board
     self.exitPortalPosition = [0, 1]  # Exit portal next to spawn point
     self.city_map = city_map
     self.term = term
     self.party = party
     self.sio = sio
+    self.inbox = inbox  # Sync handlers run on the game loop when set (EventInbox)
     self.seed = None
     self.is_synced = False
     
+    # Board generator per stage ({level: generator name}), anything missing follows LEVEL_GENERATORS
+    self.levelGenerators = {}
+    self.layout = None
+    
     # Setup sync listeners if party exists
     if self.sio and self.party:
       self._setup_sync_listeners()
@@ -29,57 +59,45 @@ class Dungeon(Map):
     """Setup WebSocket listeners for party dungeon sync"""
     import json
     
-    def on_dungeon_seed(data):
-      seed_data = json.loads(data)
+    def on_dungeon_seed(seed_data):
       self.seed = seed_data['seed']
       self.currentLevel = seed_data['level']
       self.is_synced = True
       # Regenerate board with new seed
       self.createBoard()
     
-    def on_enemy_spawned(data):
-      enemy_data = json.loads(data)
+    def on_enemy_spawned(enemy_data):
       # Will be handled when enemies are spawned
       pass
     
-    def on_enemy_removed(data):
-      enemy_data = json.loads(data)
+    def on_enemy_removed(enemy_data):
       enemyId = enemy_data['enemyId']
       # Remove enemy from list
       self.enemies = [e for e in self.enemies if e.getID() != enemyId]
-      for enemy in self.enemies:
-        if enemy.getID() == enemyId:
-          enemy.removeEnemy(self.lines)
+      self.enemyIndex.remove(enemyId)
     
-    def on_chest_opened_sync(data):
-      chest_data = json.loads(data)
+    def on_chest_opened_sync(chest_data):
       position = chest_data['position']
       # Mark chest as opened
-      for chest in self.chests:
-        if chest.getPosition() == position:
-          chest.open = True
-          chest.removeChest()
+      for chest in self.chestIndex.getAt(position):
+        chest.open = True
     
-    def on_portal_spawned_sync(data):
-      portal_data = json.loads(data)
+    def on_portal_spawned_sync(portal_data):
       self.portalPosition = portal_data['position']
       self.portalActive = True
     
-    def on_stage_changed_sync(data):
-      stage_data = json.loads(data)
+    def on_stage_changed_sync(stage_data):
       self.currentLevel = stage_data['newLevel']
       # Will trigger board regeneration
     
-    self.sio.on('dungeon_seed', on_dungeon_seed)
-    self.sio.on('enemy_spawned', on_enemy_spawned)
-    self.sio.on('enemy_removed', on_enemy_removed)
-    self.sio.on('chest_opened_sync', on_chest_opened_sync)
-    self.sio.on('portal_spawned_sync', on_portal_spawned_sync)
-    self.sio.on('stage_changed_sync', on_stage_changed_sync)
+    listen(self.sio, 'dungeon_seed', on_dungeon_seed, self.inbox, json.loads)
+    listen(self.sio, 'enemy_spawned', on_enemy_spawned, self.inbox, json.loads)
+    listen(self.sio, 'enemy_removed', on_enemy_removed, self.inbox, json.loads)
+    listen(self.sio, 'chest_opened_sync', on_chest_opened_sync, self.inbox, json.loads)
+    listen(self.sio, 'portal_spawned_sync', on_portal_spawned_sync, self.inbox, json.loads)
+    listen(self.sio, 'stage_changed_sync', on_stage_changed_sync, self.inbox, json.loads)
   
   def createBoard(self):
-    board = [['.' for i in range(self.windowWidth + 1)] for j in range(self.windowHeight + 1)]
-    
     # Generate or use existing seed for party sync
     if self.seed is None and self.party and self.party.is_in_party():
       # Leader generates seed
@@ -105,53 +123,74 @@ class Dungeon(Map):
       import time
       self.seed = int(time.time() * 1000) % (2**31)
 
-    proceduralBoard = ProceduralBoard(board, self.windowWidth, self.windowHeight, self.seed)
-    proceduralBoard.procedurelyGeneratedBoard()
+    # Same seed, stage and size always give the same layout, so party members and
+    # repeated regenerations of a floor come straight from the cache
+    self.layout = boardCache.getLayout(self.seed, self.currentLevel, self.windowWidth, self.windowHeight, self.getGeneratorForLevel(self.currentLevel))
+    
+    # The generator has its own Random, so seed the shared one explicitly to keep
+    # enemy and chest spawns identical for party members on the same seed
+    random.seed(self.seed)
 
-    generatedBoard = proceduralBoard.getBoard()
+    # Fresh copy of the cached layout as this floor's terrain
+    self.lines = self.layout.toLines()
+    self.placeSpawn()
 
-    # Clear existing board before regenerating
-    self.lines = []
-    for i in range(self.windowHeight):
-      self.lines.append([])
-      for j in range(self.windowWidth):
-        self.lines[i].append(generatedBoard[i][j])
+    return self.lines
+  
+  def placeSpawn(self):
+    """Open the spawn corner and the exit portal next to it, with a corridor to the nearest
+    cell of the floor area spawns are picked from (the server places arriving players
+    on DUNGEON_SPAWN, so it can't move with the layout)"""
+    self.spawnPosition = list(DUNGEON_SPAWN)
+    self.exitPortalPosition = [DUNGEON_SPAWN[0], DUNGEON_SPAWN[1] + 1]
+    for y, x in (self.spawnPosition, self.exitPortalPosition):
+      self.lines[y][x] = '.'
     
-    # Ensure exit portal position is always walkable
-    self.lines[self.exitPortalPosition[0]][self.exitPortalPosition[1]] = '.'
+    if not self.layout.floorCells:
+      return
+    spawnY, spawnX = self.spawnPosition
+    targetY, targetX = min((self.layout.getFloorPosition(i) for i in range(len(self.layout.floorCells))),
+                           key=lambda cell: abs(cell[0] - spawnY) + abs(cell[1] - spawnX))
+    # L-shaped: along the spawn's row, then down the target's column
+    for x in range(min(spawnX, targetX), max(spawnX, targetX) + 1):
+      self.lines[spawnY][x] = '.'
+    for y in range(min(spawnY, targetY), max(spawnY, targetY) + 1):
+      self.lines[y][targetX] = '.'
+  
+  def getSpawnPosition(self):
+    return list(self.spawnPosition)
+  
+  def getGeneratorForLevel(self, level):
+    """Board generator used for a stage"""
+    return self.levelGenerators.get(level, LEVEL_GENERATORS[(level - 1) % len(LEVEL_GENERATORS)])
 
-    return self.lines
+  def setGeneratorForLevel(self, level, algorithm):
+    """Select a registered board generator for a stage"""
+    if algorithm not in GENERATORS:
+      raise ValueError(f"Unknown board generator '{algorithm}'")
+    self.levelGenerators[level] = algorithm
+  
+  def randomSpawnPosition(self):
+    """Random floor cell from the layout's spawn list, off the player spawn and exit portal
+    (any cell if there is no layout yet)"""
+    if self.layout and len(self.layout.floorCells) > 2:
+      while True:
+        position = self.layout.getFloorPosition(random.randrange(len(self.layout.floorCells)))
+        if position != self.spawnPosition and position != self.exitPortalPosition:
+          return position
+    if self.layout and len(self.layout.floorCells) > 0:
+      return self.layout.getFloorPosition(random.randrange(len(self.layout.floorCells)))
+    return [random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)]
   
   def printEnemies(self):
     for enemy in self.enemies:
-      enemy.drawEnemy(self.getLines())
+      # Enemies killed this tick stay listed until the next update
+      if enemy.getHp() > 0:
+        enemy.drawEnemy(self.entities)
 
   def printChests(self):
     for chest in self.chests:
-      chest.drawChest()
-
-  def printBoard(self, term):
-    for i in range(self.windowHeight):
-      line = ''
-      for j in range(self.windowWidth):
-        char = self.lines[i][j]
-        if char == '#':
-          line += term.bold_white(char)
-        elif char == 'X':
-          line += term.bold_cyan(char)
-        elif char == 'P':  # Remote player
-          line += term.bold_yellow(char)
-        elif char == 'B':
-          line += term.bold_red_reverse(char)
-        elif char == 'E':
-          line += term.bold_red(char)
-        elif char == 'C':
-          line += term.bold_yellow(char)
-        elif char == 'U':
-          line += term.bold_magenta(char)
-        else:
-          line += term.green(char)
-      print(line)
+      chest.drawChest(self.entities)
 
   def getEnemies(self):
     return self.enemies
@@ -181,31 +220,37 @@ class Dungeon(Map):
   def getCurrentLevel(self):
     return self.currentLevel
   
+  def getMapId(self):
+    """Each party (or solo player) has its own dungeon instance per stage"""
+    if self.party and self.party.is_in_party():
+      instance = f"party-{self.party.party_id}"
+    elif self.party:
+      instance = self.party.player_id
+    else:
+      instance = 'solo'
+    return f"dungeon:{instance}:{self.currentLevel}"
+  
   def spawnPortal(self):
-    import random
-    while True:
-      pos = [random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)]
-      if self.lines[pos[0]][pos[1]] == '.':
-        self.portalPosition = pos
-        self.portalActive = True
-        
-        # Sync portal spawn with party if in party
-        if self.sio and self.party and self.party.is_in_party():
-          import json
-          self.sio.emit('portal_spawned', json.dumps({
-            'playerId': self.party.player_id,
-            'position': pos
-          }))
-        break
+    # On the area reachable from the spawn (a random floor cell could be a closed pocket)
+    pos = self.randomSpawnPosition()
+    self.portalPosition = pos
+    self.portalActive = True
+    
+    # Sync portal spawn with party if in party
+    if self.sio and self.party and self.party.is_in_party():
+      import json
+      self.sio.emit('portal_spawned', json.dumps({
+        'playerId': self.party.player_id,
+        'position': pos
+      }))
   
   def drawPortal(self):
     if self.portalActive and self.portalPosition:
-      self.lines[self.portalPosition[0]][self.portalPosition[1]] = 'U'
+      self.entities.draw(self.portalPosition, 'U')
   
   def drawExitPortal(self):
-    """Draw exit portal at spawn point (returns to city)"""
-    if self.lines[self.exitPortalPosition[0]][self.exitPortalPosition[1]] == '.':
-      self.lines[self.exitPortalPosition[0]][self.exitPortalPosition[1]] = 'U'
+    """Draw exit portal next to the spawn point (returns to city)"""
+    self.entities.draw(self.exitPortalPosition, 'U')
   
   def getPortalPosition(self):
     return self.portalPosition
@@ -213,13 +258,28 @@ class Dungeon(Map):
   def isPortalActive(self):
     return self.portalActive
   
-  def nextLevel(self):
-    self.currentLevel += 1
+  def clearEntities(self):
+    """Remove all enemies and chests along with their index entries"""
     self.enemies.clear()
     self.chests.clear()
+    self.enemyIndex.clear()
+    self.chestIndex.clear()
+  
+  def addEnemy(self, enemy):
+    self.enemies.append(enemy)
+    self.enemyIndex.add(enemy.getID(), enemy.getEnemyPosition(), enemy)
+  
+  def addChest(self, chest):
+    self.chests.append(chest)
+    self.chestIndex.add(chest.getID(), chest.getPosition(), chest)
+  
+  def nextLevel(self):
+    self.currentLevel += 1
+    self.clearEntities()
     self.portalActive = False
     self.portalPosition = None
     self.seed = None  # Reset seed for new level generation
+    self.is_synced = False  # Party members wait for the leader's seed of this stage
     
     # Sync stage change with party if in party
     if self.sio and self.party and self.party.is_in_party():
@@ -229,6 +289,8 @@ class Dungeon(Map):
         'newLevel': self.currentLevel
       }))
     
+    # New board for the stage (its generator comes from getGeneratorForLevel)
+    self.createBoard()
     self.createRandomEnemies(5 + self.currentLevel)
     self.createRandomChests(3 + self.currentLevel // 2)
   
@@ -236,14 +298,20 @@ class Dungeon(Map):
     return self.currentLevel % 5 == 0
   
   def handleCollisions(self, player, draw, term):
-    """Handle enemy collisions in dungeon"""
-    if player.collidedWithEnemy(self.enemies):
-      for enemy in self.enemies:
-        if enemy.getEnemyPosition() == player.getPlayerPosition():
-          from game.ui.combatui import CombatUI
-          combat = CombatUI(player, enemy, draw, term, self.party, self.sio)
-          combat.start()
-          break
+    """Handle chest pickups and enemy collisions in dungeon"""
+    position = player.getPlayerPosition()
+    
+    # Only the main player can interact with chests
+    if hasattr(player, 'interactWithChest'):
+      for chest in self.chestIndex.getAt(position):
+        player.interactWithChest(chest)
+
+    enemy = self.enemyIndex.getFirstAt(position)
+    if enemy:
+      from game.ui.combatui import CombatUI
+      combat = CombatUI(player, enemy, draw, term, self.party, self.sio)
+      return combat.open()
+    return None
   
   def setCityMap(self, city_map):
     self.city_map = city_map
@@ -252,13 +320,11 @@ class Dungeon(Map):
     """Check if player stepped on a portal"""
     # Exit portal - return to city (spawn away from entrance portal)
     if self.exitPortalPosition == player.getPlayerPosition() and self.city_map:
-      city_portal = self.city_map.getPortalPosition()
-      safe_spawn = [city_portal[0], city_portal[1] - 2]  # Spawn 2 tiles left of portal
-      return DungeonToCityTransition(self.city_map, safe_spawn)
+      return DungeonToCityTransition(self.city_map, self.city_map.getArrivalPosition())
     
     # Next level portal
     if self.isPortalActive() and self.getPortalPosition() == player.getPlayerPosition():
-      return DungeonNextLevelTransition(self, [0, 0])
+      return DungeonNextLevelTransition(self)
     
     return None
   def createRandomEnemies(self, amount):
@@ -267,27 +333,27 @@ class Dungeon(Map):
     if self.isBossStage():
       numMinions = random.randint(2, 5)
       
-      boss = Enemy([random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)], self.lines, self.currentLevel, isBoss=True, term=self.term)
+      boss = Enemy(self.randomSpawnPosition(), self.lines, self.currentLevel, isBoss=True, term=self.term)
       boss.name = 'Shadow Lord'
       boss.base_hp = 20
       boss.base_attack = 10
       boss.base_defense = 5
       boss._calculate_stats()
-      self.enemies.append(boss)
+      self.addEnemy(boss)
       
       for i in range(numMinions):
         enemy_type = random.choice([Snake, Goblin])
-        pos = [random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)]
-        self.enemies.append(enemy_type(pos, self.lines, self.currentLevel, term=self.term))
+        pos = self.randomSpawnPosition()
+        self.addEnemy(enemy_type(pos, self.lines, self.currentLevel, term=self.term))
     else:
       for i in range(amount):
         enemy_type = random.choice([Snake, Goblin])
-        pos = [random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)]
-        self.enemies.append(enemy_type(pos, self.lines, self.currentLevel, term=self.term))
+        pos = self.randomSpawnPosition()
+        self.addEnemy(enemy_type(pos, self.lines, self.currentLevel, term=self.term))
 
   def createRandomChests(self, amount):
     for i in range(amount):
-      self.chests.append(Chest([random.randint(0, self.windowHeight-1), random.randint(0, self.windowWidth-1)], self.lines))
+      self.addChest(Chest(self.randomSpawnPosition(), self.lines))
 
   def init(self, players, term):
     # Store term for enemy creation
@@ -298,11 +364,9 @@ class Dungeon(Map):
     if len(self.lines) == 0:
       self.createBoard()
     
+    self.entities.clear()
     self.printEnemies()
     self.printChests()
-
-    if len(self.enemies) == 0 and not self.portalActive:
-      self.spawnPortal()
     
     if self.portalActive:
       self.drawPortal()
@@ -311,20 +375,25 @@ class Dungeon(Map):
     self.drawExitPortal()
 
     for player in players:
-      player.drawPlayer()
+      player.drawPlayer(self.entities)
 
-    # Only the main player (players[0]) can interact with chests
-    if len(players) > 0 and hasattr(players[0], 'interactWithChest'):
-      for chest in self.chests:
-        if chest.getPosition() == players[0].getPlayerPosition():
-          players[0].interactWithChest(chest)
+    self.printPlayerInfo(players[0], term)
+    self.printHud(term)
+    self.printBoard(term)
 
-    for enemy in self.enemies:
+  def update(self, players):
+    """Move enemies and spawn the portal (runs at the simulation tick rate, not per frame)"""
+    if len(self.lines) == 0:
+      return
+    
+    for enemy in list(self.enemies):
       enemy.moveEnemy(self.windowWidth, self.windowHeight, self.lines)
 
       if enemy.getHp() <= 0:
-        enemy.removeEnemy(self.getLines())
         self.enemies.remove(enemy)
+        self.enemyIndex.remove(enemy.getID())
+      else:
+        self.enemyIndex.move(enemy.getID(), enemy.getEnemyPosition())
 
-    self.printPlayerInfo(players[0], term)
-    self.printBoard(term)
+    if len(self.enemies) == 0 and not self.portalActive:
+      self.spawnPortal()
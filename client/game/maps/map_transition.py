@@ -13,8 +13,7 @@ class CityToDungeonTransition(MapTransition):
     # Reset dungeon to level 1 when entering from city
     dungeon = self.destination_map
     dungeon.currentLevel = 1
-    dungeon.enemies.clear()
-    dungeon.chests.clear()
+    dungeon.clearEntities()
     dungeon.portalActive = False
     dungeon.portalPosition = None
     dungeon.seed = None  # Force new seed generation
@@ -28,7 +27,7 @@ class CityToDungeonTransition(MapTransition):
     dungeon.createRandomChests(5)
     dungeonInfo = [dungeon.getLines(), dungeon.getWindowWidth(), dungeon.getWindowHeight()]
     player.setBoard(dungeonInfo[0], dungeonInfo[1], dungeonInfo[2])
-    player.setPlayerPosition(self.player_spawn_position)
+    player.setPlayerPosition(dungeon.getSpawnPosition())  # Placed with the board
 
 class DungeonNextLevelTransition(MapTransition):
   """Transition to next dungeon level"""
@@ -48,8 +47,11 @@ class DungeonNextLevelTransition(MapTransition):
     print(term.move_y(term.height // 2 + 4) + term.center(term.yellow('Advancing to Stage ' + str(nextStage) + '...')).rstrip())
     time.sleep(3)
     
-    self.destination_map.nextLevel()
-    player.setPlayerPosition(self.player_spawn_position)
+    # The stage gets a new board, the player arrives on its spawn point
+    dungeon = self.destination_map
+    dungeon.nextLevel()
+    player.setBoard(dungeon.getLines(), dungeon.getWindowWidth(), dungeon.getWindowHeight())
+    player.setPlayerPosition(dungeon.getSpawnPosition())
 
 class DungeonToCityTransition(MapTransition):
   """Transition from Dungeon back to City"""
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from game.skills.fighting_abilities import fighting_abilities
+from game.skills.registry import skills
 
 if TYPE_CHECKING:
   from game.entities.player import Player
@@ -14,12 +14,7 @@ class BuySkillMechanic:
     return baseSkillCost + levelPenalty
 
   def canBuySkill(self, skillId: str) -> bool:
-    skill = None
-    for s in fighting_abilities:
-      if s["id"] == skillId:
-        skill = s
-        break
-    
+    skill = skills.get(skillId)
     if not skill:
       return False
     
@@ -37,15 +32,7 @@ class BuySkillMechanic:
     if not self.canBuySkill(skillId):
       return False
     
-    skill = None
-    for s in fighting_abilities:
-      if s["id"] == skillId:
-        skill = s
-        break
-    
-    if not skill:
-      return False
-    
+    skill = skills[skillId]
     actualCost = self.calculateSkillCost(skill["skillCost"])
     self.player.skillPoints -= actualCost
     self.player.addSkill(skillId)
@@ -53,7 +40,7 @@ class BuySkillMechanic:
     return True
   
   def getSkillCostForDisplay(self, skillId: str) -> int:
-    for skill in fighting_abilities:
-      if skill["id"] == skillId:
-        return self.calculateSkillCost(skill["skillCost"])
+    skill = skills.get(skillId)
+    if skill:
+      return self.calculateSkillCost(skill["skillCost"])
     return 0
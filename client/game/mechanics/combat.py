@@ -1,6 +1,5 @@
 import random
-from game.skills.fighting_abilities import fighting_abilities
-from game.skills.elements import elements
+from game.skills.registry import skills, elementTable
 class CombatSystem:
   """Centralized combat system handling all battle logic"""
   
@@ -13,7 +12,7 @@ class CombatSystem:
     damageMultiplier = 1.0
 
     if skillId:
-      skill = next((s for s in fighting_abilities if s["id"] == skillId), None)
+      skill = skills.get(skillId)
       if skill:
         # Get scaled values if attacker has skill scaling methods
         skillDamage = skill["damage"]
@@ -39,21 +38,7 @@ class CombatSystem:
         if skill["effectPerTurn"] > 0 and skill["duration"] > 0:
           defender.addDotEffect(skill["name"], skill["effectPerTurn"], skill["duration"])
 
-        if skillElement and defenderElement:
-          elementData = next((e for e in elements if e["type"] == skillElement), None)
-          if elementData:
-            if defenderElement in elementData["weaknesses"]:
-              damageMultiplier *= 1.5
-            elif defenderElement in elementData["resistances"]:
-              damageMultiplier *= 0.75
-
-        if attackerElement and defenderElement:
-          attackerElementData = next((e for e in elements if e["type"] == attackerElement), None)
-          if attackerElementData:
-            if defenderElement in attackerElementData["weaknesses"]:
-              damageMultiplier *= 1.2
-            elif defenderElement in attackerElementData["resistances"]:
-              damageMultiplier *= 0.9
+        damageMultiplier *= elementTable.multiplier(skillElement, attackerElement, defenderElement)
 
         if skill["isMagical"]:
           baseDamage = skillDamage
@@ -111,7 +96,7 @@ class CombatSystem:
     
     # Consume MP if using a skill
     if skillId:
-      skill = next((s for s in fighting_abilities if s["id"] == skillId), None)
+      skill = skills.get(skillId)
       if skill and hasattr(attacker, 'setMP'):
         # Get scaled MP cost if available
         mpCost = skill["mpCost"]
@@ -0,0 +1,400 @@
+"""
+Batch combat simulator for balance testing.
+
+Runs many headless fights at once with NumPy (one array row per fight) under the
+same rules as CombatUI + CombatSystem: miss and crit rolls from luck, skill MP
+costs and level scaling, stuns, DoT effects, element multipliers, the enemy's
+counterattack after a basic attack and its 40% skill chance. It reports win rate,
+turns, damage and MP use per class / enemy / level. The same seed always gives
+the same numbers.
+
+Player stats come from Player.CLASSES grown with the level up rules, enemy stats
+from the enemy classes themselves, so tuning those files is reflected directly.
+Needs numpy, a development dependency the game itself doesn't use (requirements-dev.txt).
+
+Usage (from the client folder):
+  python -m game.mechanics.combat_sim
+  python -m game.mechanics.combat_sim --classes rogue knight --enemies snake goblin --levels 1 5 10 --fights 1000000
+  python -m game.mechanics.combat_sim --boss --policy attack --seed 7
+"""
+import argparse
+import time
+import numpy as np
+from game.entities.enemy import Enemy
+from game.entities.enemies.goblin import Goblin
+from game.entities.enemies.snake import Snake
+from game.entities.player import Player
+from game.skills.registry import skills, elementTable
+
+ENEMIES = {'enemy': Enemy, 'snake': Snake, 'goblin': Goblin}
+
+# Stat growth per level after the first (engine Player.levelUp + game Player.levelUp)
+LEVEL_HP = 10
+LEVEL_ATTACK = 2
+LEVEL_DEFENSE = 1
+LEVEL_LUCK = 1
+LEVEL_MP = 5
+
+ENEMY_SKILL_CHANCE = 0.4  # Enemy.attackPlayer
+BASIC_ATTACK = -1         # Action index of a plain attack
+
+class Fighter:
+  """Stats and skills of one side, the same for every fight of a batch"""
+
+  def __init__(self, name, hp, attack, defense, luck, mp, elementType, skillList, skillLevel=1):
+    """
+    Args:
+      skillList: Skill dicts the fighter can use
+      skillLevel: Level the skills scale with (None for unscaled, like enemies)
+    """
+    self.name = name
+    self.hp = hp
+    self.attack = attack
+    self.defense = defense
+    self.luck = luck
+    self.mp = mp
+    self.elementType = elementType
+    self.skills = skillList
+    self.skillLevel = skillLevel
+
+  def skillDamage(self, skill):
+    if self.skillLevel is None:
+      return skill['damage']
+    return int(skill['damage'] * (1 + (self.skillLevel - 1) * 0.1))
+
+  def skillMpCost(self, skill):
+    if self.skillLevel is None:
+      return skill['mpCost']
+    return int(skill['mpCost'] * (1 + (self.skillLevel - 1) * 0.05))
+
+def playerFighter(playerClass, level, skillIds=None, skillLevel=None):
+  """Player of a class at a level, knowing every skill its class can learn by default"""
+  stats = Player.CLASSES[playerClass]
+  if skillIds is None:
+    skillList = list(skills.getClassSkills(playerClass))
+  else:
+    skillList = [skills[skillId] for skillId in skillIds]
+  return Fighter(
+    playerClass,
+    hp=stats['hp'] + (level - 1) * LEVEL_HP,
+    attack=stats['attack'] + (level - 1) * LEVEL_ATTACK,
+    defense=stats['defense'] + (level - 1) * LEVEL_DEFENSE,
+    luck=stats['luck'] + (level - 1) * LEVEL_LUCK,
+    mp=stats['mp'] + (level - 1) * LEVEL_MP,
+    elementType=stats['elementType'],
+    skillList=skillList,
+    # Learned skills gain a level on every level up
+    skillLevel=skillLevel if skillLevel is not None else level
+  )
+
+def enemyFighter(kind, level, isBoss=False):
+  enemy = ENEMIES[kind]([0, 0], None, level)
+  if isBoss:
+    enemy.isBoss = True
+    enemy._calculate_stats()
+  return Fighter(
+    enemy.getName(),
+    hp=enemy.getMaxHp(),
+    attack=enemy.getAttack(),
+    defense=enemy.getDefense(),
+    luck=enemy.getLuck(),
+    mp=enemy.getMaxMP(),
+    elementType=enemy.getElementType(),
+    skillList=[skills[skillId] for skillId in enemy.getSkills()],
+    skillLevel=None
+  )
+
+class Side:
+  """Per fight state of one fighter plus its compiled action tables against an opponent
+
+  Action tables are indexed by action + 1, so index 0 is the basic attack. Per fight
+  arrays only hold the fights still running (see compact()).
+  """
+
+  PER_FIGHT = ('hp', 'mp', 'stunned', 'stunTurns', 'dotRemaining', 'damageDealt', 'mpUsed', 'skillUses')
+
+  def __init__(self, fighter, opponent, fights, canBeStunned):
+    self.fighter = fighter
+    self.missChance = opponent.luck / 100  # Chance that this side's attacks miss
+    self.critChance = fighter.luck / 100
+    self.canBeStunned = canBeStunned
+
+    # Damage of each action against this opponent (CombatSystem.calculateDamage)
+    basic = max(1, fighter.attack - opponent.defense)
+    damage, mpCost, stunChance, stunDuration, dotColumn, dotDamage, dotTurns = [basic], [0], [0.0], [0], [-1], [], []
+    for skill in fighter.skills:
+      skillDamage = fighter.skillDamage(skill)
+      if skill['isMagical']:
+        base = skillDamage
+      else:
+        base = max(1, (skillDamage + fighter.attack * 0.5) - opponent.defense)
+      multiplier = elementTable.multiplier(skill.get('elementType'), fighter.elementType, opponent.elementType)
+      damage.append(max(1, base * multiplier))
+      mpCost.append(fighter.skillMpCost(skill))
+      stunChance.append(skill['stunChance'])
+      stunDuration.append(skill['duration'])
+      # Only skills with a DoT get a column in dotRemaining
+      if skill['effectPerTurn'] > 0 and skill['duration'] > 0:
+        dotColumn.append(len(dotDamage))
+        dotDamage.append(skill['effectPerTurn'])
+        dotTurns.append(skill['duration'])
+      else:
+        dotColumn.append(-1)
+    self.damage = np.array(damage, dtype=float)
+    self.mpCost = np.array(mpCost, dtype=np.int64)
+    self.stunChance = np.array(stunChance)
+    self.stunDuration = np.array(stunDuration, dtype=np.int64)
+    self.dotColumn = np.array(dotColumn, dtype=np.int64)
+    self.dotDamage = np.array(dotDamage, dtype=float)
+    self.dotTurns = np.array(dotTurns, dtype=np.int64)
+
+    self.hp = np.full(fights, float(fighter.hp))
+    self.mp = np.full(fights, fighter.mp, dtype=np.int64)
+    self.stunned = np.zeros(fights, dtype=bool)
+    self.stunTurns = np.zeros(fights, dtype=np.int64)
+    # DoT effects this side's skills left on the opponent
+    self.dotRemaining = np.zeros((fights, len(dotDamage)), dtype=np.int64)
+
+    # Results
+    self.damageDealt = np.zeros(fights)
+    self.mpUsed = np.zeros(fights, dtype=np.int64)
+    self.skillUses = np.zeros(fights, dtype=np.int64)
+
+  def expectedDamage(self):
+    """Per action damage including its whole DoT, used to rank skills"""
+    dot = np.zeros(len(self.damage))
+    hasDot = self.dotColumn >= 0
+    dot[hasDot] = (self.dotDamage * self.dotTurns)[self.dotColumn[hasDot]]
+    return self.damage + dot
+
+  def compact(self, keep):
+    """Drop the rows of fights that ended"""
+    for name in self.PER_FIGHT:
+      setattr(self, name, getattr(self, name)[keep])
+
+class CombatSimulator:
+  """Simulates a batch of fights between the same player and enemy
+
+  Fights that end are written to the results and removed from the state arrays
+  after every half turn, so long tails only cost what is still running.
+  """
+
+  def __init__(self, player, enemy, fights, rng, policy='skills', maxTurns=200):
+    """
+    Args:
+      player, enemy: Fighter stats
+      fights: Number of fights (array rows)
+      rng: numpy Generator
+      policy: 'skills' uses the strongest affordable skill each turn, 'attack' only attacks
+      maxTurns: Player turns before a fight is called a draw
+    """
+    self.fights = fights
+    self.rng = rng
+    self.policy = policy
+    self.maxTurns = maxTurns
+    self.player = Side(player, enemy, fights, canBeStunned=False)  # CombatUI never skips the player's turn
+    self.enemy = Side(enemy, player, fights, canBeStunned=True)
+    self.ids = np.arange(fights)  # Result row of each running fight
+
+    # Skills by expected damage, strongest first
+    order = np.argsort(-self.player.expectedDamage()[1:], kind='stable')
+    self.playerPriority = [int(i) for i in order]
+    self.enemyFreeSkills = bool(enemy.skills) and not self.enemy.mpCost[1:].any()
+
+    self.results = {
+      'won': np.zeros(fights, dtype=bool),
+      'timedOut': np.zeros(fights, dtype=bool),
+      'turns': np.zeros(fights, dtype=np.int64),
+      'damageDealt': np.zeros(fights),
+      'damageTaken': np.zeros(fights),
+      'mpUsed': np.zeros(fights, dtype=np.int64),
+      'skillUses': np.zeros(fights, dtype=np.int64)
+    }
+
+  def choosePlayerActions(self):
+    actions = np.full(len(self.ids), BASIC_ATTACK)
+    if self.policy == 'attack':
+      return actions
+    undecided = np.ones(len(self.ids), dtype=bool)
+    for skillIndex in self.playerPriority:
+      affordable = undecided & (self.player.mp >= self.player.mpCost[skillIndex + 1])
+      actions[affordable] = skillIndex
+      undecided &= ~affordable
+    return actions
+
+  def chooseEnemyActions(self):
+    """40% chance of a random affordable skill, otherwise a basic attack (Enemy.attackPlayer)"""
+    count = len(self.ids)
+    rolls = self.rng.random((2, count))
+    skillCount = len(self.enemy.fighter.skills)
+    if not skillCount:
+      return np.full(count, BASIC_ATTACK)
+    if self.enemyFreeSkills:
+      chosen = (rolls[1] * skillCount).astype(np.int64)
+      useSkill = rolls[0] < ENEMY_SKILL_CHANCE
+    else:
+      affordable = self.enemy.mp[:, None] >= self.enemy.mpCost[None, 1:]
+      affordableCount = affordable.sum(axis=1)
+      pick = (rolls[1] * affordableCount).astype(np.int64)
+      chosen = np.argmax(np.cumsum(affordable, axis=1) > pick[:, None], axis=1)
+      useSkill = (rolls[0] < ENEMY_SKILL_CHANCE) & (affordableCount > 0)
+    return np.where(useSkill, chosen, BASIC_ATTACK)
+
+  def strike(self, attacker, defender, actions, mask=None):
+    """CombatSystem.attack for every running fight (or those in mask)"""
+    rolls = self.rng.random((3, len(self.ids)))
+    column = actions + 1
+    cost = attacker.mpCost[column]
+    hit = (rolls[0] >= attacker.missChance) & (attacker.mp >= cost)
+    if mask is not None:
+      hit &= mask
+
+    damage = attacker.damage[column] * np.where(rolls[1] < attacker.critChance, 2, 1)
+    damage = np.minimum(damage, defender.hp) * hit
+    defender.hp -= damage
+    attacker.damageDealt += damage
+    spent = cost * hit
+    attacker.mp -= spent
+    attacker.mpUsed += spent
+
+    usedSkill = hit & (actions != BASIC_ATTACK)
+    attacker.skillUses += usedSkill
+    if defender.canBeStunned:
+      stun = usedSkill & (rolls[2] < attacker.stunChance[column])
+      defender.stunned |= stun
+      defender.stunTurns = np.where(stun, attacker.stunDuration[column], defender.stunTurns)
+    if len(attacker.dotDamage):
+      dotColumn = attacker.dotColumn[column]
+      rows = np.flatnonzero(usedSkill & (dotColumn >= 0))
+      attacker.dotRemaining[rows, dotColumn[rows]] = attacker.dotTurns[dotColumn[rows]]
+
+  def tickDots(self, source, target):
+    """Apply and age the DoT effects source left on target (CombatEntity.processDotEffects)"""
+    if not len(source.dotDamage):
+      return
+    ticking = source.dotRemaining > 0
+    damage = np.minimum(ticking @ source.dotDamage, target.hp)
+    source.dotRemaining -= ticking
+    target.hp -= damage
+    source.damageDealt += damage
+
+  def endTurn(self):
+    """CombatUI._process_turn_end"""
+    enemy = self.enemy
+    enemy.stunTurns -= enemy.stunned
+    enemy.stunned &= enemy.stunTurns > 0
+    enemy.stunTurns *= enemy.stunned
+    self.tickDots(self.player, enemy)
+    self.tickDots(enemy, self.player)
+
+  def finish(self, turn, done, timedOut=False):
+    """Write the results of the fights in done"""
+    ids = self.ids[done]
+    results = self.results
+    results['won'][ids] = (self.player.hp[done] > 0) & (self.enemy.hp[done] <= 0)
+    results['timedOut'][ids] = timedOut
+    results['turns'][ids] = turn
+    results['damageDealt'][ids] = self.player.damageDealt[done]
+    results['damageTaken'][ids] = self.enemy.damageDealt[done]
+    results['mpUsed'][ids] = self.player.mpUsed[done]
+    results['skillUses'][ids] = self.player.skillUses[done]
+
+  def settle(self, turn):
+    """Finish fights where someone died and drop them, returns False once none are left"""
+    running = (self.player.hp > 0) & (self.enemy.hp > 0)
+    if not running.all():
+      self.finish(turn, ~running)
+      self.ids = self.ids[running]
+      self.player.compact(running)
+      self.enemy.compact(running)
+    return len(self.ids) > 0
+
+  def run(self):
+    """
+    Fight every row to the end
+
+    Returns:
+      Dict of per fight result arrays
+    """
+    player, enemy = self.player, self.enemy
+    for turn in range(1, self.maxTurns + 1):
+      # Player turn, a basic attack gets an immediate counterattack (Player.attackEnemy)
+      actions = self.choosePlayerActions()
+      self.strike(player, enemy, actions)
+      counter = (actions == BASIC_ATTACK) & (enemy.hp > 0)
+      self.strike(enemy, player, self.chooseEnemyActions(), counter)
+      self.endTurn()
+      if not self.settle(turn):
+        return self.results
+
+      # Enemy turn (skipped while stunned)
+      self.strike(enemy, player, self.chooseEnemyActions(), ~enemy.stunned)
+      self.endTurn()
+      if not self.settle(turn):
+        return self.results
+
+    self.finish(self.maxTurns, np.ones(len(self.ids), dtype=bool), timedOut=True)
+    return self.results
+
+def simulate(player, enemy, fights, seed, policy='skills', maxTurns=200):
+  """Run a batch and summarize it"""
+  simulator = CombatSimulator(player, enemy, fights, np.random.default_rng(seed), policy, maxTurns)
+  return summarize(simulator.run())
+
+def summarize(results):
+  turns = results['turns']
+  dealt = results['damageDealt']
+  return {
+    'fights': len(turns),
+    'winRate': results['won'].mean(),
+    'timeoutRate': results['timedOut'].mean(),
+    'turnsMean': turns.mean(),
+    'turnsP50': np.percentile(turns, 50),
+    'turnsP90': np.percentile(turns, 90),
+    'dealtMean': dealt.mean(),
+    'dealtP10': np.percentile(dealt, 10),
+    'dealtP90': np.percentile(dealt, 90),
+    'takenMean': results['damageTaken'].mean(),
+    'mpMean': results['mpUsed'].mean(),
+    'skillUsesMean': results['skillUses'].mean()
+  }
+
+def main():
+  parser = argparse.ArgumentParser(description='Monte-Carlo combat balance report')
+  parser.add_argument('--classes', nargs='+', default=list(Player.CLASSES), choices=list(Player.CLASSES))
+  parser.add_argument('--enemies', nargs='+', default=['snake', 'goblin'], choices=list(ENEMIES))
+  parser.add_argument('--levels', type=int, nargs='+', default=[1, 5, 10])
+  parser.add_argument('--enemy-level-offset', type=int, default=0, help='Enemy level relative to the player')
+  parser.add_argument('--boss', action='store_true', help='Fight boss versions of the enemies')
+  parser.add_argument('--skills', nargs='+', help='Skill ids every class knows (default: all of its class skills)')
+  parser.add_argument('--policy', choices=['skills', 'attack'], default='skills')
+  parser.add_argument('--fights', type=int, default=100000, help='Fights per class/enemy/level')
+  parser.add_argument('--max-turns', type=int, default=200)
+  parser.add_argument('--seed', type=int, default=1)
+  args = parser.parse_args()
+
+  print(f"{'class':<11} {'enemy':<14} {'lvl':>3} {'win%':>6} {'draw%':>6} {'turns':>6} {'p50':>4} {'p90':>4} "
+        f"{'dealt':>7} {'p10':>6} {'p90':>6} {'taken':>7} {'mp':>6} {'skills':>6}")
+  start = time.perf_counter()
+  total = 0
+  classNames = list(Player.CLASSES)
+  enemyNames = list(ENEMIES)
+  for playerClass in args.classes:
+    for kind in args.enemies:
+      for level in args.levels:
+        player = playerFighter(playerClass, level, args.skills)
+        enemy = enemyFighter(kind, max(1, level + args.enemy_level_offset), args.boss)
+        # Each combination has its own stream so a subset of the report reproduces the same rows
+        seed = [args.seed, classNames.index(playerClass), enemyNames.index(kind), level]
+        stats = simulate(player, enemy, args.fights, seed, args.policy, args.max_turns)
+        total += stats['fights']
+        print(f"{playerClass:<11} {enemy.name:<14} {level:>3} {stats['winRate'] * 100:>6.1f} "
+              f"{stats['timeoutRate'] * 100:>6.1f} {stats['turnsMean']:>6.2f} {stats['turnsP50']:>4.0f} "
+              f"{stats['turnsP90']:>4.0f} {stats['dealtMean']:>7.1f} {stats['dealtP10']:>6.1f} "
+              f"{stats['dealtP90']:>6.1f} {stats['takenMean']:>7.1f} {stats['mpMean']:>6.1f} "
+              f"{stats['skillUsesMean']:>6.2f}")
+  elapsed = time.perf_counter() - start
+  print(f"\n{total} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/s)")
+
+if __name__ == '__main__':
+  main()
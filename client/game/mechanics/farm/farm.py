@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, TypedDict
 from game.mechanics.farm.crop import Crop
+from engine.core.item_stacks import ItemStacks
+from game.items.registry import items
 
 if TYPE_CHECKING:
   from game.entities.player import Player
@@ -8,10 +10,12 @@ class FarmCrop(TypedDict):
   name: str
   growth_time: int
 class Farm:
+  updateInterval = 1.0  # Seconds between growth checks when registered as a game system
+
   def __init__(self, player: 'Player'):
     self.player = player
     self.crops = []
-    self.silo = []
+    self.silo = ItemStacks()
 
   def plantCrop(self, crop: FarmCrop):
     cropName = crop['name'].split(' Seed')[0]
@@ -22,11 +26,9 @@ class Farm:
   def getSilo(self):
     return self.silo
 
-  def removeFromSilo(self, seedIndex):
-    for seed in self.silo:
-      if self.silo.index(seed) == seedIndex:
-        self.silo.remove(seed)
-        return seed
+  def removeFromSilo(self, seed, quantity=1):
+    """Take seeds (item dict or stack key) out of the silo, returns how many were removed"""
+    return self.silo.remove(seed, quantity)
 
   def checkCrops(self):
     readyCrops = []
@@ -40,25 +42,31 @@ class Farm:
       if self.crops.index(crop) == cropIndex:
         harvestInfo = crop.harvest()
         if harvestInfo:
-          self.player.inventory.append({
+          material = items.getByName(harvestInfo['name']) or {
             'name': harvestInfo['name'],
-            'category': 'material',
-            'quantity': harvestInfo['quantity']
-          })
+            'category': 'material'
+          }
+          self.player.addToInventory(material, harvestInfo['quantity'])
           self.crops.remove(crop)
           return harvestInfo
     return None
 
   def storePlayerSeeds(self):
-    playerInventory = self.player.getInventory()
-    for item in playerInventory:
-      if item['category'] == 'seed':
-        self.silo.append(item)
-        self.player.inventory.remove(item)
+    inventory = self.player.inventory
+    for item, count in inventory.getStacks():
+      if item.get('category') == 'seed':
+        self.silo.add(item, count)
+        inventory.remove(item, count)
   
   def update_crops(self):
     for crop in self.crops:
       crop.check_ready()
+
+  def update(self):
+    """Growth check (run by the game's system scheduler), tells the player when a crop is ready"""
+    for crop in self.crops:
+      if not crop.is_ready and crop.check_ready():
+        self.player.showNotification(f"Your {crop.name} is ready to harvest!")
   
   def harvest_crop(self, crop_id):
     for crop in self.crops:
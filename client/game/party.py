@@ -1,10 +1,12 @@
 import json
+from engine.core.event_inbox import listen
 
 class Party:
   """Manages party state on the client side"""
   
-  def __init__(self, sio, player_id, on_party_joined_callback=None):
+  def __init__(self, sio, player_id, on_party_joined_callback=None, inbox=None):
     self.sio = sio
+    self.inbox = inbox  # Handlers run on the game loop when set (EventInbox)
     self.player_id = player_id
     self.party_id = None
     self.leader = None
@@ -18,23 +20,21 @@ class Party:
   
   def _setup_listeners(self):
     """Setup WebSocket event listeners"""
-    self.sio.on('party_invite_received', self._on_invite_received)
-    self.sio.on('party_updated', self._on_party_updated)
-    self.sio.on('party_left', self._on_party_left)
-    self.sio.on('online_players_list', self._on_online_players)
-    self.sio.on('pending_invites_list', self._on_pending_invites)
-    self.sio.on('current_party_info', self._on_current_party_info)
-  
-  def _on_invite_received(self, data):
+    listen(self.sio, 'party_invite_received', self._on_invite_received, self.inbox, json.loads)
+    listen(self.sio, 'party_updated', self._on_party_updated, self.inbox, json.loads)
+    listen(self.sio, 'party_left', self._on_party_left, self.inbox)
+    listen(self.sio, 'online_players_list', self._on_online_players, self.inbox, json.loads)
+    listen(self.sio, 'pending_invites_list', self._on_pending_invites, self.inbox, json.loads)
+    listen(self.sio, 'current_party_info', self._on_current_party_info, self.inbox, json.loads)
+  
+  def _on_invite_received(self, invite):
     """Called when player receives a party invite"""
-    invite = json.loads(data)
     # Add to pending invites if not already there
     if not any(i['partyId'] == invite['partyId'] for i in self.pending_invites):
       self.pending_invites.append(invite)
   
-  def _on_party_updated(self, data):
+  def _on_party_updated(self, party):
     """Called when party state changes"""
-    party = json.loads(data)
     was_in_party = self.party_id is not None
     self.party_id = party['id']
     self.leader = party['leader']
@@ -50,17 +50,16 @@ class Party:
     self.leader = None
     self.members = []
   
-  def _on_online_players(self, data):
+  def _on_online_players(self, players):
     """Called when online players list is received"""
-    self.online_players = json.loads(data)
+    self.online_players = players
   
-  def _on_pending_invites(self, data):
+  def _on_pending_invites(self, invites):
     """Called when pending invites list is received"""
-    self.pending_invites = json.loads(data)
+    self.pending_invites = invites
   
-  def _on_current_party_info(self, data):
+  def _on_current_party_info(self, party):
     """Called when current party info is received"""
-    party = json.loads(data)
     if party:
       self.party_id = party['id']
       self.leader = party['leader']
@@ -1,15 +1,36 @@
 import socketio
 import json
 from engine.core.player import Player as BasePlayer
+from engine.core.event_inbox import listen
+from engine.core.move_prediction import MovePrediction
+from engine.core.interpolation import ServerClock, SnapshotBuffer
+from game.helper import blockers
+
+INTERPOLATION_DELAY = 0.2  # Seconds remote players are drawn in the past (two server move ticks)
+MOVE_BROADCAST_INTERVAL = 0.1  # Seconds between the server's 'moved' deltas (its MOVE_TICK_RATE)
 
 class RemotePlayer:
-  """Lightweight player representation for remote players (just for rendering)"""
-  def __init__(self, lines, windowWidth, windowHeight, playerPosition, name):
+  """Lightweight player representation for remote players (just for rendering)
+
+  With a server clock, positions are kept with the server time they were sent at
+  and the player is drawn where it was INTERPOLATION_DELAY ago, walking from one
+  update to the next instead of jumping when each arrives.
+  """
+  def __init__(self, lines, windowWidth, windowHeight, playerPosition, name, clock=None,
+               interpolationDelay=INTERPOLATION_DELAY):
+    """
+    Args:
+      clock: Optional ServerClock, positions are snapped to without one
+      interpolationDelay: Seconds behind the server clock the player is drawn at
+    """
     self.lines = lines
     self.windowWidth = windowWidth
     self.windowHeight = windowHeight
     self.playerPosition = playerPosition
     self.name = name
+    self.clock = clock
+    self.interpolationDelay = interpolationDelay
+    self.snapshots = SnapshotBuffer()
   
   def getName(self):
     return self.name
@@ -17,49 +38,142 @@ class RemotePlayer:
   def getPlayerPosition(self):
     return self.playerPosition
   
-  def setPlayerPosition(self, position):
+  def setPlayerPosition(self, position, serverTime=None):
+    """Latest position, walked to when it comes with the server time (seconds) it was sent at"""
+    if serverTime is None or self.clock is None:
+      self.snapshots.reset()
+    else:
+      lastTime = self.snapshots.latestTime()
+      if lastTime is None or serverTime - lastTime > MOVE_BROADCAST_INTERVAL * 1.5:
+        # It stood still until the last broadcast, the walk starts there
+        self.snapshots.push(serverTime - MOVE_BROADCAST_INTERVAL, self.playerPosition)
+      self.snapshots.push(serverTime, position)
     self.playerPosition = position
   
+  def getRenderPosition(self):
+    """Where to draw the player this frame"""
+    now = self.clock.now() if self.clock else None
+    if now is None or not self.snapshots:
+      return self.playerPosition
+    return self.snapshots.sample(now - self.interpolationDelay, self.isBlocked) or self.playerPosition
+  
+  def isBlocked(self, position):
+    if not (0 <= position[0] < len(self.lines) and 0 <= position[1] < len(self.lines[0])):
+      return True
+    return self.lines[position[0]][position[1]] in blockers
+  
   def setBoard(self, lines, windowWidth, windowHeight):
     """Update board reference when changing maps"""
     self.lines = lines
     self.windowWidth = windowWidth
     self.windowHeight = windowHeight
+    self.snapshots.reset()
   
-  def drawPlayer(self):
-    """Draw remote player on the map"""
+  def drawPlayer(self, layer):
+    """Draw remote player on the map's entity layer"""
+    position = self.getRenderPosition()
     if (self.lines and 
-        0 <= self.playerPosition[0] < len(self.lines) and 
-        0 <= self.playerPosition[1] < len(self.lines[0])):
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = 'P'
-  
-  def removePlayer(self):
-    """Remove remote player from the map"""
-    if (self.lines and
-        0 <= self.playerPosition[0] < len(self.lines) and 
-        0 <= self.playerPosition[1] < len(self.lines[0])):
-      self.lines[self.playerPosition[0]][self.playerPosition[1]] = '.'
+        0 <= position[0] < len(self.lines) and 
+        0 <= position[1] < len(self.lines[0])):
+      layer.draw(position, 'P')
+
+def stampMoves(delta):
+  """Positions of a 'moved' delta, each with the delta's server time when it has one"""
+  time = delta.get('time')
+  players = delta.get('players', [])
+  if time is None:
+    return list(players)
+  return [player if 'time' in player else dict(player, time=time) for player in players]
+
+def mergeMoveDeltas(queued, new):
+  """Fold two back-to-back 'moved' deltas into one that applies to the same result
+
+  Positions keep the server time of the delta they came in, and a player that moved
+  in both keeps both, so remote players still walk through every update.
+  """
+  newLeft = set(new.get('left', []))
+  players = [player for player in stampMoves(queued) if player['playerId'] not in newLeft]
+  players.extend(stampMoves(new))
+  left = list(queued.get('left', [])) + list(new.get('left', []))
+  return {'tick': new.get('tick', queued.get('tick')), 'players': players, 'left': left}
 
 class Server:
-  def __init__(self, sio, host, port, players, boardInfo):
+  def __init__(self, sio, host, port, players, boardInfo, inbox=None):
+    """
+    Args:
+      inbox: Optional EventInbox, roster and move updates are then applied by the game loop
+    """
+    self.inbox = inbox
     self.host = host
     self.port = port
     self.players = players
     self.boardInfo = boardInfo
     self.sio = sio
+    self.playersByName = {}  # Name -> player, so move updates don't scan every player
+    self.localPlayerId = None
+    self.localPlayer = None
+    self.lastMoveTick = 0
+    self.prediction = MovePrediction()
+    self.clock = ServerClock()
+    self.interpolationDelay = INTERPOLATION_DELAY
 
   def start(self):
     self.sio.connect('http://' + self.host + ':' + str(self.port))
-    self.sio.on('joined', self.on_player_join)
-    self.sio.on('moved', self.on_player_move)
+    # A roster replaces the one before it, back-to-back move deltas are merged
+    listen(self.sio, 'joined', self.on_player_join, self.inbox, coalesce=lambda queued, new: new)
+    # Arrival times are read on the socket thread, waiting for the loop would skew the clock
+    listen(self.sio, 'moved', self.on_player_move, self.inbox, decode=self.observeServerTime,
+           coalesce=mergeMoveDeltas)
+    # Only the last ack matters, it covers every move before it
+    listen(self.sio, 'move_ack', self.on_move_ack, self.inbox, coalesce=lambda queued, new: new)
+
+  def join(self, playerId, playerPosition, mapId='city', player=None):
+    """
+    Args:
+      player: Optional local Player, its moves are then numbered and reconciled with the server's acks
+    """
+    self.localPlayerId = playerId
+    self.prediction.reset()
+    if player is not None:
+      self.localPlayer = player
+      self.prediction.canEnter = lambda position: not player.pathIsBlocked(position)
+      player.moveSender = self.sendMove
+    self.sio.emit('join', json.dumps({"playerId": playerId, "playerPosition": playerPosition, "mapId": mapId,
+                                      "seq": self.prediction.seq}))
+
+  def sendMove(self, newPosition):
+    """Network callback for the local player's moves (called before it moves)"""
+    seq = self.prediction.record(self.localPlayer.getPlayerPosition(), newPosition)
+    self.sio.emit('move', json.dumps({"playerId": self.localPlayerId, "playerPosition": newPosition, "seq": seq}))
 
-  def join(self, playerId, playerPosition):
-    self.sio.emit('join', json.dumps({"playerId": playerId, "playerPosition": playerPosition}))
+  def changeMap(self, mapId, playerPosition):
+    """Move to another map's room, the server answers with that map's roster"""
+    # Players tracked so far were on the old map
+    for playerId in list(self.playersByName):
+      self.removePlayer(playerId)
+    seq = self.prediction.teleport(playerPosition)
+    self.sio.emit('change_map', json.dumps({"playerId": self.localPlayerId, "mapId": mapId,
+                                            "playerPosition": playerPosition, "seq": seq}))
+
+  def getPlayer(self, name):
+    """Look up a tracked player by name (players added to the list elsewhere are indexed on first lookup)"""
+    player = self.playersByName.get(name)
+    if player is None:
+      for p in self.players:
+        if p.getName() == name:
+          self.playersByName[name] = p
+          return p
+    return player
 
   def on_player_join(self, data):
+    """Roster of every player on this client's map"""
+    present = {player['playerId'] for player in data}
+    for playerId in [name for name in self.playersByName if name not in present]:
+      self.removePlayer(playerId)
+
     for player in data:
       # Check if player already exists
-      player_exists = any(p.getName() == player['playerId'] for p in self.players)
+      player_exists = self.getPlayer(player['playerId']) is not None
       if not player_exists:
         # Create lightweight remote player
         remote_player = RemotePlayer(
@@ -67,14 +181,56 @@ class Server:
           self.boardInfo[1], 
           self.boardInfo[2], 
           player['playerPosition'], 
-          player['playerId']
+          player['playerId'],
+          clock=self.clock,
+          interpolationDelay=self.interpolationDelay
         )
         self.players.append(remote_player)
+        self.playersByName[remote_player.getName()] = remote_player
+
+  def observeServerTime(self, data):
+    """Feed the server clock estimate with a delta's timestamp (as it arrives)"""
+    if data and data.get('time') is not None:
+      self.clock.observe(data['time'] / 1000)
+    return data
 
   def on_player_move(self, data):
-    for player in data:
-      for i in range(len(self.players)):
-        if self.players[i].getName() == player['playerId']:
-          self.players[i].removePlayer()
-          self.players[i].setPlayerPosition(player['playerPosition'])
-          
+    """Apply a movement delta: only players that moved or left since the server's last tick"""
+    self.lastMoveTick = data.get('tick', self.lastMoveTick)
+
+    for player in stampMoves(data):
+      # The local player already moved itself, the echo would only be older
+      if player['playerId'] == self.localPlayerId:
+        continue
+      tracked = self.getPlayer(player['playerId'])
+      if tracked:
+        time = player.get('time')
+        if time is not None and isinstance(tracked, RemotePlayer):
+          tracked.setPlayerPosition(player['playerPosition'], time / 1000)
+        else:
+          tracked.setPlayerPosition(player['playerPosition'])
+
+    for playerId in data.get('left', []):
+      self.removePlayer(playerId)
+
+  def on_move_ack(self, data):
+    """Last move the server processed: replay the ones after it, correct the player if that differs"""
+    if self.localPlayer is None:
+      return
+    position = self.prediction.reconcile(data['seq'], data['playerPosition'],
+                                         self.localPlayer.getPlayerPosition(), data.get('rejected'))
+    if position is not None:
+      self.localPlayer.setPlayerPosition(position)
+
+  def getMoveStats(self):
+    """Prediction counters (moves sent, corrections, ...)"""
+    return self.prediction.getStats()
+
+  def removePlayer(self, playerId):
+    """Stop tracking a remote player that disconnected"""
+    if playerId == self.localPlayerId:
+      return
+    tracked = self.playersByName.pop(playerId, None)
+    if tracked and tracked in self.players:
+      self.players.remove(tracked)
+
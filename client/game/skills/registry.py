@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple
+from game.skills.fighting_abilities import fighting_abilities
+from game.skills.elements import elements
+
+# Multipliers of the elemental table (skill element vs defender, attacker class element vs defender)
+SKILL_WEAKNESS = 1.5
+SKILL_RESISTANCE = 0.75
+ATTACKER_WEAKNESS = 1.2
+ATTACKER_RESISTANCE = 0.9
+
+class SkillRegistry:
+  """Fighting abilities indexed by id, with the learnable skills of each class precomputed"""
+
+  def __init__(self, abilities: List[dict]):
+    self.byId: Dict[str, dict] = {skill['id']: skill for skill in abilities}
+    self.byClass: Dict[str, Tuple[dict, ...]] = {}
+    for skill in abilities:
+      if 'enemy' in skill['classes']:
+        continue  # Enemy skills can't be learned
+      for skillClass in skill['classes']:
+        self.byClass[skillClass] = self.byClass.get(skillClass, ()) + (skill,)
+
+  def get(self, skillId: str) -> Optional[dict]:
+    return self.byId.get(skillId)
+
+  def getClassSkills(self, playerClass: str) -> Tuple[dict, ...]:
+    """Skills a class can learn, in definition order"""
+    return self.byClass.get(playerClass, ())
+
+  def __getitem__(self, skillId: str) -> dict:
+    return self.byId[skillId]
+
+  def __contains__(self, skillId):
+    return skillId in self.byId
+
+class ElementTable:
+  """Weakness/resistance table compiled into dense multiplier matrices
+
+  Element types map to indexes with 0 reserved for "no element" (None or a type the
+  table doesn't know, like 'arcane'), whose row and column are all 1.0.
+  skillMatrix[skill][defender] and attackerMatrix[attacker][defender] hold the factors.
+  """
+
+  def __init__(self, elementData: List[dict]):
+    self.types = [None] + [element['type'] for element in elementData]
+    self.index = {elementType: i for i, elementType in enumerate(self.types)}
+    size = len(self.types)
+    self.skillMatrix = [[1.0] * size for _ in range(size)]
+    self.attackerMatrix = [[1.0] * size for _ in range(size)]
+
+    for element in elementData:
+      row = self.index[element['type']]
+      # Weaknesses win if a type is listed as both, like the old if/elif did
+      for matrix, weak, resist in ((self.skillMatrix, SKILL_WEAKNESS, SKILL_RESISTANCE),
+                                   (self.attackerMatrix, ATTACKER_WEAKNESS, ATTACKER_RESISTANCE)):
+        for defenderType in element['resistances']:
+          if defenderType in self.index:
+            matrix[row][self.index[defenderType]] = resist
+        for defenderType in element['weaknesses']:
+          if defenderType in self.index:
+            matrix[row][self.index[defenderType]] = weak
+
+  def indexOf(self, elementType: Optional[str]) -> int:
+    return self.index.get(elementType, 0)
+
+  def multiplier(self, skillElement: Optional[str], attackerElement: Optional[str],
+                 defenderElement: Optional[str]) -> float:
+    """Combined damage factor of a skill hit"""
+    defender = self.index.get(defenderElement, 0)
+    return (self.skillMatrix[self.index.get(skillElement, 0)][defender]
+            * self.attackerMatrix[self.index.get(attackerElement, 0)][defender])
+
+skills = SkillRegistry(fighting_abilities)
+elementTable = ElementTable(elements)
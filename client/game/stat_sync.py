@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cmdmmo', 'pending_stats')
+
+class StatSync:
+  """Write-behind sync of the player's ranking stats
+
+  Changes are merged per field (the latest value wins) and sent as one PATCH at most
+  once per interval, or right away on flush() (map transitions, exit). Unsent fields
+  are kept in a journal file until the server confirms them, so a crash doesn't lose
+  them: recoverPending() sends leftovers from an earlier run. The journal is written
+  by the API worker too, a burst of changes is saved once and never on the game loop.
+  """
+
+  def __init__(self, api_client, interval=15.0, directory=DEFAULT_DIRECTORY):
+    """
+    Args:
+      api_client: APIClient used to send (on its background worker)
+      interval: Minimum seconds between two PATCHes
+      directory: Where journals of unsent stats are kept, one file per player id
+    """
+    self.api_client = api_client
+    self.interval = interval
+    self.directory = directory
+    self.clock = time.monotonic
+    self.lock = threading.Lock()
+
+    self.dirty = {}     # Fields changed since the last flush
+    self.inFlight = {}  # Fields handed to the worker, not confirmed yet
+    self.journalQueued = False  # A journal save is waiting on the worker
+    self.lastFlush = self.clock()
+
+    # Stats
+    self.records = 0
+    self.flushes = 0
+    self.failures = 0
+
+  def setInterval(self, interval):
+    self.interval = interval
+
+  def getJournalPath(self, player_id=None):
+    pid = player_id if player_id is not None else self.api_client.player_id
+    return os.path.join(self.directory, f'{pid}.json')
+
+  def record(self, **fields):
+    """Mark fields as changed (nothing is sent until the next flush)"""
+    if not fields:
+      return
+    with self.lock:
+      self.dirty.update(fields)
+      self.records += 1
+      queueJournal = not self.journalQueued
+      self.journalQueued = True
+    if queueJournal:
+      self.api_client.submit(self._saveJournal)
+
+  def update(self):
+    """Flush if the interval has passed (called by the game's system scheduler)"""
+    if self.dirty and self.clock() - self.lastFlush >= self.interval:
+      self.flush()
+
+  def flush(self):
+    """Send everything dirty now as one PATCH (queued, returns immediately)"""
+    with self.lock:
+      self.lastFlush = self.clock()
+      if not self.dirty or not self.api_client.player_id:
+        return
+      payload = self.dirty
+      self.dirty = {}
+      self.inFlight.update(payload)
+      self.flushes += 1
+    self.api_client.submit(self._send, payload)
+
+  def _send(self, payload):
+    """Runs on the API worker thread"""
+    result = self.api_client.updatePlayer(**payload)
+    with self.lock:
+      for field, value in payload.items():
+        if self.inFlight.get(field) == value:
+          del self.inFlight[field]
+      if result is None:
+        # Keep the fields for the next flush unless they changed again meanwhile
+        self.failures += 1
+        for field, value in payload.items():
+          self.dirty.setdefault(field, value)
+    self._writeJournal()
+
+  def close(self, timeout=5):
+    """Flush and wait for the worker to send it (call before the APIClient is closed)"""
+    self.flush()
+    self.api_client.flush(timeout)
+
+  def getPendingFields(self):
+    with self.lock:
+      return {**self.inFlight, **self.dirty}
+
+  def getStats(self):
+    return {
+      'records': self.records,
+      'flushes': self.flushes,
+      'failures': self.failures,
+      'pending': len(self.getPendingFields())
+    }
+
+  # ==================== Journal ====================
+
+  def _saveJournal(self):
+    """Queued by record(), runs on the API worker"""
+    with self.lock:
+      self.journalQueued = False
+    self._writeJournal()
+
+  def _writeJournal(self):
+    """Persist unconfirmed fields, removing the file once all are sent (API worker only, so
+    writes never overlap)"""
+    if not self.api_client.player_id:
+      return
+    path = self.getJournalPath()
+    with self.lock:
+      pending = {**self.inFlight, **self.dirty}
+    try:
+      if not pending:
+        if os.path.exists(path):
+          os.remove(path)
+        return
+      os.makedirs(self.directory, exist_ok=True)
+      # Write then rename so a crash never leaves a half written journal
+      temp = path + '.tmp'
+      with open(temp, 'w') as f:
+        json.dump({'playerId': self.api_client.player_id, 'fields': pending}, f)
+      os.replace(temp, path)
+    except OSError:
+      pass
+
+  @staticmethod
+  def recoverPending(api_client, directory=DEFAULT_DIRECTORY):
+    """
+    Send stats left unsent by an earlier run (synchronously, call at startup)
+
+    Returns:
+      Number of journals that were sent and removed
+    """
+    if not os.path.isdir(directory):
+      return 0
+
+    recovered = 0
+    for name in os.listdir(directory):
+      if not name.endswith('.json'):
+        continue
+      path = os.path.join(directory, name)
+      try:
+        with open(path) as f:
+          journal = json.load(f)
+      except (OSError, ValueError):
+        continue
+      if api_client.updatePlayer(player_id=journal['playerId'], **journal['fields']) is not None:
+        os.remove(path)
+        recovered += 1
+    return recovered
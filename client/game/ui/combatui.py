@@ -1,5 +1,5 @@
-import time
-from game.skills.fighting_abilities import fighting_abilities
+from game.skills.registry import skills
+from engine.ui.scene import ScriptScene, waitKey, sleep
 
 class CombatUI:
     def __init__(self, player, enemy, drawFunc, term, party=None, sio=None):
@@ -11,7 +11,12 @@ class CombatUI:
         self.party = party
         self.sio = sio
 
-    def start(self):
+    def open(self):
+        """Scene running the fight, for the game's scene stack"""
+        return ScriptScene(self.run())
+
+    def run(self):
+        """The fight, turn by turn, until the player or the enemy is dead"""
         print(self.term.home + self.term.clear)
         print(self.term.bold_red("You are fighting a " + self.enemy.getName() + " [Lvl " + str(self.enemy.getLevel()) + "]!"))
         self._display_enemy_status()
@@ -21,16 +26,16 @@ class CombatUI:
 
             if self.isPlayerTurn:
                 self.isPlayerTurn = False
-                self.player_turn()
+                yield from self.player_turn()
                 self._process_turn_end()
-                self._wait_for_continue()
+                yield from self._wait_for_continue()
                 self.redraw()
                 self._display_player_status()
             else:
                 self.isPlayerTurn = True
                 self.enemy_turn()
                 self._process_turn_end()
-                self._wait_for_continue()
+                yield from self._wait_for_continue()
                 self.redraw()
                 self._display_player_status()
         
@@ -56,7 +61,7 @@ class CombatUI:
                     'enemyId': self.enemy.getID()
                 }))
             
-            time.sleep(2)
+            yield sleep(2)
 
     def player_turn(self):
         print(self.term.bold_cyan("\nIt's your turn!"))
@@ -69,20 +74,20 @@ class CombatUI:
         
         choice = ''
         while True:
-            key = self.term.inkey(timeout=0.1)
-            if key and key.isprintable():
+            key = yield waitKey()
+            if key.isprintable():
                 choice = key
                 break
         
         if choice == "1":
             self.player.attackEnemy(self.enemy)
         elif choice == "2":
-            self.use_skill()
+            yield from self.use_skill()
         elif choice == "3":
             print(self.term.blue("You defended!"))
             # Could add defense buff here
         elif choice == "4":
-            self.open_inventory()
+            yield from self.open_inventory()
         elif choice == "5":
             print(self.term.red("You ran away!"))
         else:
@@ -171,14 +176,14 @@ class CombatUI:
         # Get player's learned skills
         learnedSkills = []
         for skillId in self.player.skills:
-            skill = next((s for s in fighting_abilities if s["id"] == skillId), None)
+            skill = skills.get(skillId)
             if skill:
                 learnedSkills.append(skill)
         
         if not learnedSkills:
             print(self.term.yellow("\nYou haven't learned any skills yet!"))
             print(self.term.cyan("Press K outside of combat to learn skills."))
-            time.sleep(2)
+            yield sleep(2)
             return
         
         # Display learned skills
@@ -226,14 +231,14 @@ class CombatUI:
         # Get player choice
         choice = ''
         while True:
-            key = self.term.inkey(timeout=0.1)
-            if key and key.isprintable():
+            key = yield waitKey()
+            if key.isprintable():
                 choice = key
                 break
         
         if choice.lower() == 'q':
             print(self.term.yellow("Cancelled."))
-            time.sleep(1)
+            yield sleep(1)
             return
         
         # Validate choice
@@ -251,27 +256,26 @@ class CombatUI:
                     
                     if enemyDied:
                         print(self.term.bold_green("\nYou killed the enemy!"))
-                        self.enemy.removeEnemy(self.player.lines)
                     else:
                         # Enemy counterattacks if still alive
                         print()
-                        time.sleep(1)
+                        yield sleep(1)
                 else:
                     print(self.term.red("\nNot enough MP!"))
-                    time.sleep(1.5)
+                    yield sleep(1.5)
             else:
                 print(self.term.red("\nInvalid skill selection!"))
-                time.sleep(1)
+                yield sleep(1)
         else:
             print(self.term.red("\nInvalid choice!"))
-            time.sleep(1)
+            yield sleep(1)
     
     def open_inventory(self):
         """Open inventory during combat"""
         from game.ui.inventoryui import InventoryUi
         
         inventory_ui = InventoryUi(self.player, self.term)
-        inventory_ui.draw()
+        yield from inventory_ui.run()
         
         # Redraw combat screen after inventory closes
         print(self.term.home + self.term.clear)
@@ -292,7 +296,7 @@ class CombatUI:
     def _wait_for_continue(self):
         """Wait for user to press a key to continue"""
         print("\n[Press any key to continue...]")
-        self.term.inkey()
+        yield waitKey()
     
     def redraw(self):
         self.drawFunc()
@@ -1,5 +1,7 @@
 from game.arts.farm_elements import farm_house
 from engine.ui.interaction_ui import InteractionUI
+from engine.ui.scene import waitKey
+from game.items.registry import items
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -51,24 +53,24 @@ class FarmUI:
     silo = self.farm.getSilo()
     if not silo:
       print("The silo is empty.")
-      self.ui.term.inkey(timeout=2)
+      yield waitKey(2)
       return
     
     print("Seeds in silo:")
-    for seed in silo:
-      print(f"- {seed['name']}")
-    self.ui.term.inkey(timeout=2)
+    for seed, count in silo.getStacks():
+      print(f"- {seed['name']} (x{count})")
+    yield waitKey(2)
   
   def storeSeeds(self):
     self.farm.storePlayerSeeds()
     print("Seeds have been stored in the silo.")
-    self.ui.term.inkey(timeout=2)
+    yield waitKey(2)
 
   def checkCrops(self):
     allCrops = self.farm.crops
     if not allCrops:
       print("You have no crops planted.")
-      self.ui.term.inkey(timeout=2)
+      yield waitKey(2)
       return
 
     readyCrops = []
@@ -105,7 +107,7 @@ class FarmUI:
         print(f"#{readyCrops.index(crop)+1} - {crop.name} (READY)")
       print("\nPress number to harvest (or Q to cancel)")
 
-      key = self.ui.term.inkey(timeout=None)
+      key = yield waitKey()
       
       if key.lower() == 'q':
         return
@@ -116,45 +118,40 @@ class FarmUI:
           selectedCrop = readyCrops[cropIndex]
           harvestInfo = selectedCrop.harvest()
           if harvestInfo:
-            from game.items.materials import materials
-            material = next((m for m in materials if m['name'] == harvestInfo['name']), None)
+            material = items.getByName(harvestInfo['name'])
             
-            if material:
-              for _ in range(harvestInfo['quantity']):
-                self.player.addToInventory(material)
-            else:
-              for _ in range(harvestInfo['quantity']):
-                self.player.inventory.append({
-                  'name': harvestInfo['name'],
-                  'category': 'material'
-                })
+            if not material:
+              material = {
+                'name': harvestInfo['name'],
+                'category': 'material'
+              }
+            self.player.addToInventory(material, harvestInfo['quantity'])
             
             print(f"You have harvested {harvestInfo['quantity']} of {harvestInfo['name']}.")
             self.farm.crops.remove(selectedCrop)
-            self.ui.term.inkey(timeout=2)
+            yield waitKey(2)
           else:
             print("This crop is not ready for harvest.")
-            self.ui.term.inkey(timeout=2)
+            yield waitKey(2)
         else:
           print("Invalid selection.")
-          self.ui.term.inkey(timeout=2)
+          yield waitKey(2)
     else:
       print("No crops are ready for harvest yet.")
-      self.ui.term.inkey(timeout=2)
+      yield waitKey(2)
 
   def plantCrop(self):
-    playerInventory = self.player.getInventory()
     availableSeeds = []
 
     for seed in self.farm.getSilo():
       availableSeeds.append({ 'origin': 'silo', 'seed': seed })
 
-    for item in playerInventory:
-      if item['category'] == 'seed' and item not in availableSeeds:
+    for item in self.player.inventory:
+      if item.get('category') == 'seed':
         availableSeeds.append({ 'origin': 'inventory', 'seed': item })
     if not availableSeeds:
       print("You have no seeds to plant.")
-      self.ui.term.inkey(timeout=2)
+      yield waitKey(2)
       return
     
     print("Available seeds to plant:")
@@ -162,7 +159,7 @@ class FarmUI:
       print(f"#{availableSeeds.index(seed)+1} - {seed['seed']['name']}")
     print("\nPress number to plant (or Q to cancel)")
 
-    key = self.ui.term.inkey(timeout=None)
+    key = yield waitKey()
     
     if key.lower() == 'q':
       return
@@ -173,17 +170,14 @@ class FarmUI:
         selectedSeed = availableSeeds[seedIndex]
         self.farm.plantCrop(selectedSeed['seed'])
         if selectedSeed['origin'] == 'inventory':
-          for i, item in enumerate(self.player.inventory):
-            if item['name'] == selectedSeed['seed']['name']:
-              self.player.inventory.pop(i)
-              break
+          self.player.removeFromInventory(selectedSeed['seed'])
         elif selectedSeed['origin'] == 'silo':
-          self.farm.removeFromSilo(self.farm.silo.index(selectedSeed['seed']))
+          self.farm.removeFromSilo(selectedSeed['seed'])
         print(f"You have planted: {selectedSeed['seed']['name']}")
-        self.ui.term.inkey(timeout=2)
+        yield waitKey(2)
       else:
         print("Invalid selection.")
-        self.ui.term.inkey(timeout=2)
+        yield waitKey(2)
   
   def checkIfPlayerOwnsFarm(self):
     """Check if player owns this farm"""
@@ -193,5 +187,5 @@ class FarmUI:
     return False
   
   def open(self):
-    """Open the farm UI"""
-    self.ui.open()
+    """Open the farm UI (returns the scene to push)"""
+    return self.ui.open()
@@ -31,5 +31,5 @@ class LandlordUI:
     })
   
   def open(self):
-    """Open the landlord UI"""
-    self.ui.open()
+    """Open the landlord UI (returns the scene to push)"""
+    return self.ui.open()
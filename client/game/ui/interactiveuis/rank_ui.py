@@ -1,4 +1,7 @@
 from game.arts.rank import draw_rank_board
+from engine.ui.scene import Scene
+import json
+import threading
 from typing import TYPE_CHECKING
 import requests
 
@@ -6,44 +9,220 @@ if TYPE_CHECKING:
   from game.entities.player import Player
   from blessed import Terminal
 
-class RankUI:
-  """UI for viewing player rankings"""
+class RankPages:
+  """Virtualized view of one ranking
   
-  def __init__(self, player: 'Player', term: 'Terminal', server_url: str = 'http://172.23.209.86:3001'):
+  Fixed-size pages are fetched by rank offset on demand (the server answers them from
+  its in-memory ranking) and only pages near the visible window are kept. A window
+  pushed by the server replaces the cached pages, which are stale from then on.
+  Requests only run on background threads: the UI is a scene of the game loop, so a
+  page that isn't there yet is drawn as loading and on_loaded is called when it is.
+  """
+  
+  def __init__(self, session, server_url: str, rank_type: str, page_size: int = 50, keep_pages: int = 2, timeout: float = 5,
+               on_loaded=None):
+    """
+    Args:
+      session: requests.Session shared by the UI (keep-alive)
+      server_url: API server address
+      rank_type: 'gold', 'level' or 'dungeon'
+      page_size: Entries per request
+      keep_pages: Pages kept loaded on each side of the visible window
+      timeout: Request timeout in seconds
+      on_loaded: Optional callback when a page arrived (runs on the fetch thread)
+    """
+    self.session = session
+    self.url = f'{server_url}/api/leaderboard/{rank_type}/range'
+    self.page_size = page_size
+    self.keep_pages = keep_pages
+    self.timeout = timeout
+    
+    self.pages = {}       # Page index -> entries
+    self.total = None     # Unknown until the first response
+    self.pushed = None    # (start, entries) of the last window pushed by the server
+    self.lock = threading.Lock()
+    self.fetches = {}  # Page index -> thread fetching it
+    self.on_loaded = on_loaded
+  
+  def fetch_page(self, index: int):
+    """Runs on a fetch thread"""
+    self._fetch_page(index)
+    if self.on_loaded:
+      self.on_loaded()
+  
+  def _fetch_page(self, index: int):
+    params = {'start': index * self.page_size, 'count': self.page_size}
+    try:
+      response = self.session.get(self.url, params=params, timeout=self.timeout)
+      data = response.json() if response.status_code == 200 else None
+    except Exception:
+      data = None
+    
+    with self.lock:
+      if data is None:
+        # Treat as empty so the UI doesn't retry on every key press
+        self.pages[index] = []
+        if self.total is None:
+          self.total = 0
+        return
+      self.pages[index] = data['entries']
+      self.total = data['total']
+  
+  def is_past_end(self, index: int) -> bool:
+    return self.total is not None and index * self.page_size >= self.total
+  
+  def ensure_page(self, index: int):
+    """The page's entries if loaded, else None and its fetch is started (never waits for it)"""
+    with self.lock:
+      entries = self.pages.get(index)
+    if entries is None:
+      self.prefetch(index)
+    return entries
+  
+  def prefetch(self, index: int):
+    """Fetch a page in the background"""
+    with self.lock:
+      if index in self.pages:
+        return
+    if index in self.fetches or self.is_past_end(index):
+      return
+    thread = threading.Thread(target=self.fetch_page, args=(index,), daemon=True)
+    self.fetches[index] = thread
+    thread.start()
+  
+  def apply_update(self, start: int, entries: list, total: int):
+    """Take a window pushed by the server"""
+    with self.lock:
+      self.pages.clear()
+      self.total = total
+      self.pushed = (start, entries)
+  
+  def get_window(self, start: int, count: int):
+    """
+    Entries from rank `start` (0-based) to start + count
+    
+    Returns:
+      The entries, or None while a page they need is still being fetched
+    """
+    pushed = self.pushed
+    if pushed and pushed[0] == start and len(pushed[1]) >= min(count, self.total - start):
+      return pushed[1][:count]
+    
+    first_page = start // self.page_size
+    last_page = (start + count - 1) // self.page_size
+    
+    # Drop finished fetch threads
+    self.fetches = {i: t for i, t in self.fetches.items() if t.is_alive()}
+    
+    entries = []
+    loading = False
+    for page in range(first_page, last_page + 1):
+      if self.is_past_end(page):
+        break
+      page_entries = self.ensure_page(page)
+      if page_entries is None:
+        loading = True
+        break
+      entries.extend(page_entries)
+    
+    # Fetch the next page before it's needed
+    self.prefetch(last_page + 1)
+    
+    # Only keep pages near the window
+    with self.lock:
+      for page in [i for i in self.pages if i < first_page - self.keep_pages or i > last_page + self.keep_pages]:
+        del self.pages[page]
+    
+    if loading:
+      return None
+    offset = start - first_page * self.page_size
+    return entries[offset:offset + count]
+  
+  def get_total(self) -> int:
+    return self.total or 0
+
+class RankUI(Scene):
+  """UI for viewing player rankings (live when a socket connection is given)"""
+  
+  VISIBLE_ROWS = 10
+  
+  def __init__(self, player: 'Player', term: 'Terminal', server_url: str = 'http://172.23.209.86:3001', sio=None):
+    super().__init__()
     self.player = player
     self.term = term
     self.server_url = server_url
-    self.isOpen = False
+    self.sio = sio
+    self.session = requests.Session()
+    
+    # Server-side player id, used for "my rank"
+    api_client = getattr(player, 'api_client', None)
+    self.player_id = api_client.player_id if api_client else None
     
     self.current_rank_type = 'gold'
     self.scroll_position = 0
-    self.rank_data = []
+    self.rank_pages = None
+    self.my_rank = -1
+    self.my_value = None
+    self.needs_redraw = True
     
-  def fetch_rank_data(self, rank_type: str):
-    """Fetch ranking data from server API"""
-    try:
-      response = requests.get(f'{self.server_url}/api/rankings/{rank_type}', timeout=5)
-      if response.status_code == 200:
-        return response.json()
-      else:
-        return []
-    except Exception as e:
-      print(f"Error fetching rank data: {e}")
-      return []
+    if self.sio:
+      self.sio.on('rank_update', self.on_rank_update)
   
   def load_rank_type(self, rank_type: str):
-    """Load a specific rank type"""
+    """Load a specific rank type (only the visible window is fetched)"""
     self.current_rank_type = rank_type
     self.scroll_position = 0
-    self.rank_data = self.fetch_rank_data(rank_type)
+    self.my_rank = -1
+    self.my_value = None
+    self.rank_pages = RankPages(self.session, self.server_url, rank_type, on_loaded=self.on_page_loaded)
+    self.watch()
+  
+  def watch(self):
+    """Tell the server which window is visible so changes to it get pushed"""
+    if self.sio:
+      self.sio.emit('rank_watch', json.dumps({
+        'playerId': self.player_id,
+        'type': self.current_rank_type,
+        'start': self.scroll_position,
+        'count': self.VISIBLE_ROWS
+      }))
+  
+  def on_rank_update(self, data):
+    """Ranks in the visible window changed (runs on the socket thread)"""
+    if not self.isOpen or data['type'] != self.current_rank_type:
+      return
+    self.my_rank = data.get('myRank', -1)
+    self.my_value = data.get('myValue')
+    if data['start'] == self.scroll_position:
+      self.rank_pages.apply_update(data['start'], data['entries'], data['total'])
+    self.needs_redraw = True
+  
+  def on_page_loaded(self):
+    """A page arrived (runs on its fetch thread)"""
+    self.needs_redraw = True
+  
+  def scroll(self, amount: int):
+    """Scroll the visible window, clamped to the ranking size"""
+    max_scroll = max(0, self.rank_pages.get_total() - self.VISIBLE_ROWS)
+    self.scroll_to(min(max(0, self.scroll_position + amount), max_scroll))
+  
+  def scroll_to(self, position: int):
+    if position != self.scroll_position:
+      self.scroll_position = position
+      self.watch()
   
   def draw(self):
     """Draw the rank board UI"""
     print(self.term.home + self.term.clear)
     
-    # Draw rank board
-    board_art = draw_rank_board(self.scroll_position, self.current_rank_type, self.rank_data)
+    # Draw rank board from the visible window only
+    visible = self.rank_pages.get_window(self.scroll_position, self.VISIBLE_ROWS)
+    board_art = draw_rank_board(self.scroll_position, self.current_rank_type, visible or [], self.rank_pages.get_total())
     print(self.term.yellow(board_art))
+    if visible is None:
+      print(self.term.cyan('  Loading rankings...'))
+    if self.my_rank >= 0:
+      print(self.term.bold_green(f'  Your rank: #{self.my_rank + 1} ({self.my_value})'))
     print()
     
     # Draw options
@@ -51,7 +230,9 @@ class RankUI:
     print(self.term.white('  [1] View Gold Rankings'))
     print(self.term.white('  [2] View Level Rankings'))
     print(self.term.white('  [3] View Dungeon Level Rankings'))
-    print(self.term.white('  [↑/↓] Scroll (if more than 10 entries)'))
+    print(self.term.white('  [↑/↓] Scroll  [PgUp/PgDn] Page (if more than 10 entries)'))
+    if self.my_rank >= 0:
+      print(self.term.white('  [M] Jump to my rank'))
     print(self.term.white('  [Q] Exit'))
     print(self.term.bold_cyan('=' * 60))
   
@@ -60,7 +241,7 @@ class RankUI:
     if key.lower() == 'q':
       # Exit and move player forward
       currentPosition = self.player.getPlayerPosition()
-      self.player.setPlayerPosition([currentPosition[0] + 1, currentPosition[1]])
+      self.player.moveTo([currentPosition[0] + 1, currentPosition[1]])
       self.isOpen = False
       return
     
@@ -71,22 +252,40 @@ class RankUI:
       self.load_rank_type('level')
     elif key == '3':
       self.load_rank_type('dungeon')
+    elif key.lower() == 'm' and self.my_rank >= 0:
+      # Center the window on the player's rank
+      self.scroll(self.my_rank - self.VISIBLE_ROWS // 2 - self.scroll_position)
     
     # Scroll controls
     elif key.name == 'KEY_UP':
-      if self.scroll_position > 0:
-        self.scroll_position -= 1
+      self.scroll(-1)
     elif key.name == 'KEY_DOWN':
-      max_scroll = max(0, len(self.rank_data) - 10)
-      if self.scroll_position < max_scroll:
-        self.scroll_position += 1
+      self.scroll(1)
+    elif key.name == 'KEY_PGUP':
+      self.scroll(-self.VISIBLE_ROWS)
+    elif key.name == 'KEY_PGDOWN':
+      self.scroll(self.VISIBLE_ROWS)
+  
+  def open(self) -> 'RankUI':
+    """The rank UI is a scene of its own, push it on the game's scene stack"""
+    return self
   
-  def open(self):
-    """Open the rank UI"""
-    self.isOpen = True
+  def onEnter(self):
     self.load_rank_type('gold')  # Start with gold rankings
-    
-    while self.isOpen:
+    self.needs_redraw = True
+  
+  def handleInput(self, key):
+    self.handle_input(key)
+    self.needs_redraw = True
+  
+  def render(self):
+    # Updates pushed by the server (socket thread) and fetched pages only flag a redraw,
+    # requests never run on the game loop
+    if self.needs_redraw:
+      self.needs_redraw = False
       self.draw()
-      key = self.term.inkey(timeout=None)
-      self.handle_input(key)
+  
+  def onExit(self):
+    if self.sio:
+      self.sio.emit('rank_unwatch', json.dumps({'playerId': self.player_id}))
+    self.session.close()
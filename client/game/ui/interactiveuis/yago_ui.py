@@ -1,5 +1,6 @@
 from game.arts.shitpost import yago_ui_frame_0, yago_ui_frame_1, yago_ui_frame_2
 from engine.ui.interaction_ui import InteractionUI
+from engine.ui.scene import ScriptScene, waitKey
 from typing import TYPE_CHECKING
 import time
 
@@ -41,15 +42,19 @@ class YagoUI:
       self.ui.art = self.frames[self.current_frame]
       self.last_frame_time = current_time
   
-  def open(self):
+  def open(self) -> ScriptScene:
+    """Scene da UI do Yago (push it on the game's scene stack)"""
+    return ScriptScene(self.run())
+  
+  def run(self):
     """Abrir a UI do Yago with animation"""
     self.ui.isOpen = True
     
     # Show first frame and wait 1 second
     self.ui.draw()
-    key = self.ui.term.inkey(timeout=1)
+    key = yield waitKey(1)
     if key:
-      self.ui.handleInput(key)
+      yield from self.ui.handleInput(key)
       if not self.ui.isOpen:
         return
     
@@ -61,7 +66,7 @@ class YagoUI:
       
       # Use timeout to allow animation to continue
       timeout = self.frame_duration if not self.animation_complete else None
-      key = self.ui.term.inkey(timeout=timeout)
+      key = yield waitKey(timeout)
       
       if key:
-        self.ui.handleInput(key)
+        yield from self.ui.handleInput(key)
@@ -1,5 +1,5 @@
-import time
 from engine.ui.selectable_menu import SelectableMenu
+from engine.ui.scene import ScriptScene, waitKey, sleep
 
 class InventoryUi:
   def __init__(self, player, term):
@@ -8,7 +8,12 @@ class InventoryUi:
     self.main_menu = None
     self.inventory_menu = None
   
-  def draw(self):
+  def open(self) -> ScriptScene:
+    """Scene showing the inventory, for the game's scene stack"""
+    return ScriptScene(self.run())
+  
+  def run(self):
+    """Inventory screen until it's closed (yield from it to show it inside another UI)"""
     should_close = [False]
     should_equip = [False]
     should_drop = [False]
@@ -46,7 +51,7 @@ class InventoryUi:
       
       self.main_menu.render(0, self.term.get_location()[0], 40)
       
-      key = self.term.inkey()
+      key = yield waitKey()
       
       if key.lower() == 'q':
         self.player.setIsInventoryOpen(False)
@@ -60,17 +65,17 @@ class InventoryUi:
           break
         elif should_equip[0]:
           should_equip[0] = False
-          self.equipItem()
+          yield from self.equipItem()
         elif should_drop[0]:
           should_drop[0] = False
-          self.dropItem()
+          yield from self.dropItem()
   
   def dropItem(self):
     playerInventory = self.player.getInventory()
     
     if len(playerInventory) == 0:
       print(self.term.red("No items to drop!"))
-      time.sleep(1)
+      yield sleep(1)
       return
     
     print(self.term.home + self.term.clear)
@@ -84,21 +89,21 @@ class InventoryUi:
         itemDropped = self.player.getInventory()[idx]
         self.player.dropItem(idx)
         print(self.term.green(f"You dropped {itemDropped['name']}"))
-        time.sleep(1)
       
       self.inventory_menu.add_item(f"{item['name']} (x{item['quantity']})", callback=drop_action)
     
     self.inventory_menu.render(0, 4, 40)
     
-    key = self.term.inkey()
-    self.inventory_menu.handle_input(key)
+    key = yield waitKey()
+    if self.inventory_menu.handle_input(key) == 'execute':
+      yield sleep(1)  # Time to read what happened
 
   def equipItem(self):
     playerInventory = self.player.getInventory()
     
     if len(playerInventory) == 0:
       print(self.term.red("No items to equip!"))
-      time.sleep(1)
+      yield sleep(1)
       return
     
     print(self.term.home + self.term.clear)
@@ -113,11 +118,11 @@ class InventoryUi:
         self.player.equipItem(idx)
         print(self.term.green(f"You equipped {itemName}"))
         self.player.dropItem(idx)
-        time.sleep(1)
       
       self.inventory_menu.add_item(f"{item['name']} (x{item['quantity']})", callback=equip_action)
     
     self.inventory_menu.render(0, 4, 40)
     
-    key = self.term.inkey()
-    self.inventory_menu.handle_input(key)
+    key = yield waitKey()
+    if self.inventory_menu.handle_input(key) == 'execute':
+      yield sleep(1)  # Time to read what happened
@@ -1,4 +1,4 @@
-import time
+from engine.ui.scene import ScriptScene, waitKey, sleep
 
 class LevelUpUI:
   """UI for level up celebration and stat upgrade selection"""
@@ -28,7 +28,7 @@ class LevelUpUI:
       print(self.term.move_y(center_y) + self.term.center(self.term.white(f'You are now level {self.player.getLevel()}!')).rstrip())
       print(self.term.move_y(center_y + 2) + self.term.center(self.term.cyan('You feel more powerful...')).rstrip())
       
-      time.sleep(0.4)
+      yield sleep(0.4)
     
     # Final screen with stats
     print(self.term.home + self.term.clear)
@@ -45,7 +45,7 @@ class LevelUpUI:
     print(self.term.move_y(center_y + 6) + self.term.center(self.term.white('+ 1 Luck')).rstrip())
     
     print(self.term.move_y(center_y + 9) + self.term.center(self.term.white('Press any key to continue...')).rstrip())
-    self.term.inkey(timeout=None)
+    yield waitKey()
   
   def chooseStatUpgrade(self):
     """Allow player to choose a stat to upgrade"""
@@ -75,7 +75,7 @@ class LevelUpUI:
     
     # Wait for input
     while True:
-      key = self.term.inkey(timeout=None)
+      key = yield waitKey()
       
       if key == '1':
         self.player.maxHp += 15
@@ -102,9 +102,13 @@ class LevelUpUI:
     
     print()
     print(self.term.white('Press any key to continue...'))
-    self.term.inkey(timeout=None)
+    yield waitKey()
   
-  def show(self):
-    """Show the complete level up flow"""
-    self.celebrate()
-    self.chooseStatUpgrade()
+  def open(self) -> ScriptScene:
+    """Scene with the complete level up flow, for the game's scene stack"""
+    return ScriptScene(self.run())
+  
+  def run(self):
+    """The complete level up flow"""
+    yield from self.celebrate()
+    yield from self.chooseStatUpgrade()
@@ -1,4 +1,6 @@
-class PartyUI:
+from engine.ui.scene import Scene
+
+class PartyUI(Scene):
   """Party management UI with tabs"""
   
   TAB_INVITE = 0
@@ -6,19 +8,21 @@ class PartyUI:
   TAB_LEAVE = 2
   
   def __init__(self, player, party, term):
+    super().__init__()
     self.player = player
     self.party = party
     self.term = term
     self.current_tab = self.TAB_INVITE
     self.search_query = ""
     self.selected_index = 0
-    self.is_open = False
+    self.needs_redraw = True
+    self.shown_state = None
   
   def open(self):
-    """Open party UI modal"""
-    self.is_open = True
+    """Reset the party UI modal, returns the scene to push on the game's scene stack"""
     self.search_query = ""
     self.selected_index = 0
+    self.needs_redraw = True
     
     # Determine initial tab based on party state
     if self.party.is_in_party():
@@ -30,30 +34,49 @@ class PartyUI:
     self.party.request_online_players()
     self.party.request_pending_invites()
     
-    self._show()
+    return self
   
-  def _show(self):
-    """Main UI render loop"""
-    while self.is_open:
-      print(self.term.home + self.term.clear)
-      
-      # Draw modal box
-      self._draw_modal_header()
-      self._draw_tabs()
-      
-      # Draw content based on current tab
-      if self.current_tab == self.TAB_INVITE:
-        self._draw_invite_tab()
-      elif self.current_tab == self.TAB_PENDING:
-        self._draw_pending_tab()
-      elif self.current_tab == self.TAB_LEAVE:
-        self._draw_leave_tab()
-      
-      self._draw_modal_footer()
-      
-      # Handle input
-      key = self.term.inkey()
-      self._handle_input(key)
+  def handleInput(self, key):
+    self._handle_input(key)
+    self.needs_redraw = True
+  
+  def update(self):
+    # The server's answers are applied by the game loop, redraw when they change what's shown
+    state = self._get_shown_state()
+    if state != self.shown_state:
+      self.shown_state = state
+      self.needs_redraw = True
+  
+  def render(self):
+    """Draw the modal when something changed"""
+    if not self.needs_redraw:
+      return
+    self.needs_redraw = False
+    print(self.term.home + self.term.clear)
+    
+    # Draw modal box
+    self._draw_modal_header()
+    self._draw_tabs()
+    
+    # Draw content based on current tab
+    if self.current_tab == self.TAB_INVITE:
+      self._draw_invite_tab()
+    elif self.current_tab == self.TAB_PENDING:
+      self._draw_pending_tab()
+    elif self.current_tab == self.TAB_LEAVE:
+      self._draw_leave_tab()
+    
+    self._draw_modal_footer()
+  
+  def _get_shown_state(self):
+    """What the tabs show from the party state"""
+    return (
+      self.party.is_in_party(),
+      self.party.leader,
+      tuple(self.party.get_members()),
+      tuple(p['playerId'] for p in self.party.get_online_players()),
+      tuple((i.get('partyId'), i.get('memberCount')) for i in self.party.get_pending_invites())
+    )
   
   def _draw_modal_header(self):
     """Draw modal header"""
@@ -265,7 +288,7 @@ class PartyUI:
   def _handle_input(self, key):
     """Handle keyboard input"""
     if key.name == 'KEY_ESCAPE':
-      self.is_open = False
+      self.close()
     
     elif key.name == 'KEY_TAB' or key == '\t':
       # Switch tabs
@@ -342,7 +365,7 @@ class PartyUI:
         invite = pending[self.selected_index]
         self.party.accept_invite(invite['partyId'])
         self.player.showNotification(f'Joined party led by {invite["leader"]}')
-        self.is_open = False
+        self.close()
     
     elif key.lower() == 'd':
       # Decline invite
@@ -358,4 +381,4 @@ class PartyUI:
       # Leave party
       self.party.leave_party()
       self.player.showNotification('Left the party')
-      self.is_open = False
+      self.close()
@@ -1,6 +1,6 @@
-import time
-from game.skills.fighting_abilities import fighting_abilities
+from game.skills.registry import skills
 from game.mechanics.buy_skill import BuySkillMechanic
+from engine.ui.scene import ScriptScene, waitKey, sleep
 
 class SkillsUI:
   def __init__(self, player, term):
@@ -14,14 +14,7 @@ class SkillsUI:
   
   def getPlayerClassSkills(self):
     """Get all skills available for the player's class"""
-    playerClass = self.player.playerClass
-    availableSkills = []
-    
-    for skill in fighting_abilities:
-      if playerClass in skill["classes"] and "enemy" not in skill["classes"]:
-        availableSkills.append(skill)
-    
-    return availableSkills
+    return list(skills.getClassSkills(self.player.playerClass))
   
   def getSkillDescription(self, skill, isLearned=False):
     """Generate a brief description of the skill"""
@@ -137,8 +130,12 @@ class SkillsUI:
     print(self.term.green("Q: ") + "Close Skills Menu")
     print()
   
-  def open(self):
-    """Open the skills menu and handle input"""
+  def open(self) -> ScriptScene:
+    """Scene showing the skills menu, for the game's scene stack"""
+    return ScriptScene(self.run())
+  
+  def run(self):
+    """Skills menu until it's closed"""
     self.isOpen = True
     self.selectedSkillIndex = 0
     self.scrollOffset = 0
@@ -150,12 +147,12 @@ class SkillsUI:
       if totalSkills == 0:
         self.draw()
         print(self.term.yellow("No skills available!"))
-        time.sleep(2)
+        yield sleep(2)
         break
       
       self.draw()
       
-      key = self.term.inkey(timeout=None)
+      key = yield waitKey()
       
       if key.lower() == 'q':
         self.isOpen = False
@@ -179,7 +176,7 @@ class SkillsUI:
       # Enter to select
       elif key.name == 'KEY_ENTER' or key == '\n' or key == '\r':
         selectedSkill = availableSkills[self.selectedSkillIndex]
-        self.handleSkillSelection(selectedSkill)
+        yield from self.handleSkillSelection(selectedSkill)
   
   def handleSkillSelection(self, skill):
     """Handle when player selects a skill"""
@@ -189,7 +186,7 @@ class SkillsUI:
     # Check if already learned
     if skillId in self.player.skills:
       print(self.term.yellow(f"You already know {skillName}!"))
-      time.sleep(1.5)
+      yield sleep(1.5)
       return
     
     # Show confirmation screen
@@ -211,7 +208,7 @@ class SkillsUI:
       print(self.term.red("Not enough skill points!"))
       print()
       print(self.term.white("Press any key to continue..."))
-      self.term.inkey(timeout=None)
+      yield waitKey()
       return
     
     print(self.term.bold_white("Do you want to learn this skill?"))
@@ -219,7 +216,7 @@ class SkillsUI:
     print(self.term.red("N. ") + "No, go back")
     print()
     
-    confirmKey = self.term.inkey(timeout=None)
+    confirmKey = yield waitKey()
     
     if confirmKey.lower() == 'y':
       # Try to buy the skill
@@ -231,7 +228,7 @@ class SkillsUI:
       else:
         print(self.term.red("Failed to learn skill!"))
       
-      time.sleep(2)
+      yield sleep(2)
     else:
       print(self.term.yellow("Cancelled."))
-      time.sleep(1)
+      yield sleep(1)
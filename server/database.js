@@ -72,24 +72,49 @@ const getTop3ByDungeonLevel = db.prepare(`
   LIMIT 3
 `);
 
-// Full ranking queries (for rank board UI)
-const getAllByGold = db.prepare(`
-  SELECT id, name, class, maxGold as value
-  FROM Player 
-  ORDER BY maxGold DESC
-`);
+// Ranking columns, indexed on (column, id) so leaderboards and ranking pages
+// are read straight off the index instead of sorting the whole table
+const RANKING_COLUMNS = {
+  gold: 'maxGold',
+  level: 'maxLevelReached',
+  dungeon: 'maxDungeonLevel'
+};
 
-const getAllByLevel = db.prepare(`
-  SELECT id, name, class, maxLevelReached as value
-  FROM Player 
-  ORDER BY maxLevelReached DESC
-`);
+for (const column of Object.values(RANKING_COLUMNS)) {
+  db.exec(`CREATE INDEX IF NOT EXISTS idx_player_${column} ON Player (${column}, id)`);
+}
 
-const getAllByDungeonLevel = db.prepare(`
-  SELECT id, name, class, maxDungeonLevel as value
-  FROM Player 
-  ORDER BY maxDungeonLevel DESC
-`);
+// Keyset pagination (for rank board UI): a page starts right after the
+// (value, id) of the previous page's last row, so every page costs the same
+function prepareRankingPages(column) {
+  return {
+    first: db.prepare(`
+      SELECT id, name, class, ${column} as value
+      FROM Player
+      ORDER BY ${column} DESC, id DESC
+      LIMIT @limit
+    `),
+    after: db.prepare(`
+      SELECT id, name, class, ${column} as value
+      FROM Player
+      WHERE (${column}, id) < (@value, @id)
+      ORDER BY ${column} DESC, id DESC
+      LIMIT @limit
+    `),
+    all: db.prepare(`
+      SELECT id, name, class, ${column} as value
+      FROM Player
+      ORDER BY ${column} DESC, id DESC
+    `)
+  };
+}
+
+const rankingPages = {};
+for (const [type, column] of Object.entries(RANKING_COLUMNS)) {
+  rankingPages[type] = prepareRankingPages(column);
+}
+
+const countPlayers = db.prepare('SELECT COUNT(*) as total FROM Player');
 
 // Bank Account queries
 const createBankAccount = db.prepare(`
@@ -132,9 +157,9 @@ module.exports = {
   getTop3ByGold,
   getTop3ByLevel,
   getTop3ByDungeonLevel,
-  getAllByGold,
-  getAllByLevel,
-  getAllByDungeonLevel,
+  RANKING_COLUMNS,
+  rankingPages,
+  countPlayers,
   createBankAccount,
   getBankAccountById,
   updateBankAccountGold,
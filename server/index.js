@@ -3,7 +3,8 @@ var express = require('express'),
     server = require('http').createServer(app),
     cors = require('cors')
 
-const { createPlayer, updatePlayer, getPlayerById, getPlayerByName, getAllPlayers, getTop3ByGold, getTop3ByLevel, getTop3ByDungeonLevel, getAllByGold, getAllByLevel, getAllByDungeonLevel, createBankAccount, getBankAccountById, updateBankAccountGold, updateBankAccountItems, hashPassword, verifyPassword } = require('./database');
+const { Leaderboard } = require('./leaderboard');
+const { createPlayer, updatePlayer, getPlayerById, getPlayerByName, getAllPlayers, getTop3ByGold, getTop3ByLevel, getTop3ByDungeonLevel, RANKING_COLUMNS, rankingPages, countPlayers, createBankAccount, getBankAccountById, updateBankAccountGold, updateBankAccountItems, hashPassword, verifyPassword } = require('./database');
 
 app.use(cors());
 app.use(express.json());
@@ -17,12 +18,237 @@ const io = require('socket.io')(server, {
 });
 
 const players = [];
+const playersById = new Map(); // playerId -> entry in players
 const parties = new Map(); // partyId -> { leader, members: [], invites: [] }
 const playerToParty = new Map(); // playerId -> partyId
 const playerToSocket = new Map(); // playerId -> socketId
 const partyDungeons = new Map(); // partyId -> { seed, level, enemies: [], chests: [], portalActive: bool }
 let partyIdCounter = 0;
 
+// In-memory rankings, loaded once from the database and kept up to date by the
+// player endpoints, so rank queries never sort the Player table
+const leaderboards = {};
+for (const type of Object.keys(RANKING_COLUMNS)) {
+  leaderboards[type] = new Leaderboard();
+  leaderboards[type].load(Array.from(rankingPages[type].all.iterate(), row => ({
+    id: row.id,
+    score: row.value,
+    data: { id: row.id, name: row.name, class: row.class }
+  })));
+}
+
+function rankingRoom(type) {
+  return `rankings:${type}`;
+}
+
+// What a client watching a ranking sees: its window, the total and its own rank
+function rankingSnapshot(type, watch) {
+  const leaderboard = leaderboards[type];
+  return {
+    type,
+    start: watch.start,
+    entries: leaderboard.range(watch.start, watch.count),
+    total: leaderboard.size(),
+    myRank: watch.playerId ? leaderboard.rankOf(watch.playerId) : -1,
+    myValue: watch.playerId ? leaderboard.getScore(watch.playerId) : undefined
+  };
+}
+
+// Push a ranking to boards whose window overlaps the changed ranks [from, to]
+// (and to the player who moved)
+function pushRankingUpdate(type, from, to, playerId) {
+  const room = io.sockets.adapter.rooms.get(rankingRoom(type));
+  if (!room) {
+    return;
+  }
+
+  for (const socketId of room) {
+    const socket = io.sockets.sockets.get(socketId);
+    const watch = socket && socket.data.rankWatch;
+    if (!watch) {
+      continue;
+    }
+    const visible = watch.start <= to && watch.start + watch.count > from;
+    if (visible || watch.playerId === playerId) {
+      socket.emit('rank_update', rankingSnapshot(type, watch));
+    }
+  }
+}
+
+// Apply a player's current stats to every ranking (called after create/update)
+function updateRankings(player) {
+  for (const [type, column] of Object.entries(RANKING_COLUMNS)) {
+    const leaderboard = leaderboards[type];
+    const oldScore = leaderboard.getScore(player.id);
+    if (oldScore === player[column]) {
+      continue;
+    }
+
+    const oldRank = leaderboard.rankOf(player.id);
+    const newRank = leaderboard.set(player.id, player[column], { id: player.id, name: player.name, class: player.class });
+
+    // A new entry shifts every rank below it
+    const from = oldRank === -1 ? newRank : Math.min(oldRank, newRank);
+    const to = oldRank === -1 ? leaderboard.size() - 1 : Math.max(oldRank, newRank);
+    pushRankingUpdate(type, from, to, player.id);
+  }
+}
+
+// Interest management: every player is on one map (the city or a dungeon
+// instance) and only hears about players on the same map through its room
+const DEFAULT_MAP = 'city';
+const mapRosters = new Map(); // mapId -> Map(playerId -> player)
+
+// Movement is broadcast as batched deltas: moves are coalesced per player (last
+// position wins) and flushed at a fixed tick rate, only for players that changed.
+// Deltas carry the server time: clients draw other players slightly in the past,
+// walking between deltas, so the rate can stay low without players jumping
+const MOVE_TICK_RATE = 10; // Broadcasts per second
+const pendingMoves = new Map(); // mapId -> Map(playerId -> latest position since the last flush)
+const pendingLeaves = new Map(); // mapId -> Set(playerIds that left the map since the last flush)
+let moveTick = 0;
+
+// Moves are validated (one orthogonal step from the last accepted position, at a
+// bounded rate) and numbered by the client: each tick the sockets that sent moves
+// get back the last one processed and the position it left them on, so the client
+// can replay the moves still in flight on top of it
+const MAX_MOVES_PER_SECOND = 40;
+const MOVE_BURST = 20; // Moves that can be made back to back before the rate applies
+const pendingAcks = new Set(); // Sockets that sent moves since the last flush
+
+// Map changes don't trust the client's position: the player is put on the map's
+// arrival point, which the client uses too (City.getArrivalPosition, DUNGEON_SPAWN)
+const CITY_ARRIVAL = [15, 57]; // 2 tiles left of the city portal
+const DUNGEON_SPAWN = [0, 0];
+
+function mapArrival(playerId, mapId) {
+  if (mapId === DEFAULT_MAP) {
+    return CITY_ARRIVAL;
+  }
+  // dungeon:<instance>:<stage>, the instance is the player's own or its party's
+  const match = /^dungeon:(.+):(\d+)$/.exec(typeof mapId === 'string' ? mapId : '');
+  if (!match || parseInt(match[2], 10) < 1) {
+    return null;
+  }
+  const partyId = playerToParty.get(playerId);
+  if (match[1] === playerId || (partyId && match[1] === `party-${partyId}`)) {
+    return DUNGEON_SPAWN;
+  }
+  return null;
+}
+
+function isPosition(position) {
+  return Array.isArray(position) && position.length === 2 && position.every(Number.isInteger);
+}
+
+function isValidMove(state, player, position, now) {
+  if (!isPosition(position)) {
+    return false;
+  }
+  const [y, x] = player.playerPosition;
+  if (Math.abs(position[0] - y) + Math.abs(position[1] - x) !== 1) {
+    return false;
+  }
+
+  // Token bucket
+  state.budget = Math.min(MOVE_BURST, state.budget + (now - state.refilledAt) / 1000 * MAX_MOVES_PER_SECOND);
+  state.refilledAt = now;
+  if (state.budget < 1) {
+    return false;
+  }
+  state.budget -= 1;
+  return true;
+}
+
+function mapRoom(mapId) {
+  return `map:${mapId}`;
+}
+
+function getPending(pending, mapId, create) {
+  let entries = pending.get(mapId);
+  if (!entries) {
+    entries = new create();
+    pending.set(mapId, entries);
+  }
+  return entries;
+}
+
+function enterMap(socket, player, mapId) {
+  player.mapId = mapId;
+
+  let roster = mapRosters.get(mapId);
+  if (!roster) {
+    roster = new Map();
+    mapRosters.set(mapId, roster);
+  }
+  roster.set(player.playerId, player);
+  socket.join(mapRoom(mapId));
+
+  const leaves = pendingLeaves.get(mapId);
+  if (leaves) {
+    leaves.delete(player.playerId);
+  }
+
+  // Full roster of the map, only to the players on it
+  io.to(mapRoom(mapId)).emit('joined', Array.from(roster.values()));
+}
+
+function leaveMap(socket, player) {
+  const mapId = player.mapId;
+  const roster = mapRosters.get(mapId);
+  if (roster) {
+    roster.delete(player.playerId);
+    if (roster.size === 0) {
+      mapRosters.delete(mapId);
+    }
+  }
+  if (socket) {
+    socket.leave(mapRoom(mapId));
+  }
+
+  const moves = pendingMoves.get(mapId);
+  if (moves) {
+    moves.delete(player.playerId);
+  }
+  if (mapRosters.has(mapId)) {
+    getPending(pendingLeaves, mapId, Set).add(player.playerId);
+  }
+}
+
+function flushMoves() {
+  if (pendingMoves.size === 0 && pendingLeaves.size === 0 && pendingAcks.size === 0) {
+    return;
+  }
+
+  moveTick++;
+  const now = Date.now();
+  const mapIds = new Set([...pendingMoves.keys(), ...pendingLeaves.keys()]);
+  for (const mapId of mapIds) {
+    const moves = pendingMoves.get(mapId) || new Map();
+    const leaves = pendingLeaves.get(mapId) || new Set();
+    io.to(mapRoom(mapId)).emit('moved', {
+      tick: moveTick,
+      time: now,
+      players: Array.from(moves, ([playerId, playerPosition]) => ({ playerId, playerPosition })),
+      left: Array.from(leaves)
+    });
+  }
+
+  pendingMoves.clear();
+  pendingLeaves.clear();
+
+  for (const socket of pendingAcks) {
+    const state = socket.data.moves;
+    const player = playersById.get(state.playerId);
+    if (player) {
+      socket.emit('move_ack', { tick: moveTick, seq: state.seq, playerPosition: player.playerPosition, rejected: state.rejected || 0 });
+    }
+  }
+  pendingAcks.clear();
+}
+
+setInterval(flushMoves, 1000 / MOVE_TICK_RATE);
+
 // POST - Criar novo player
 app.post('/api/player', (req, res) => {
   try {
@@ -41,6 +267,7 @@ app.post('/api/player', (req, res) => {
     });
     
     const newPlayer = getPlayerById.get(result.lastInsertRowid);
+    updateRankings(newPlayer);
     res.status(201).json(newPlayer);
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -67,6 +294,7 @@ app.patch('/api/player/:id', (req, res) => {
     });
     
     const updatedPlayer = getPlayerById.get(playerId);
+    updateRankings(updatedPlayer);
     res.json(updatedPlayer);
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -126,29 +354,62 @@ app.get('/api/leaderboard/dungeon', (req, res) => {
   }
 });
 
-// GET - Full rankings for rank board
-app.get('/api/rankings/gold', (req, res) => {
-  try {
-    const rankings = getAllByGold.all();
-    res.json(rankings);
-  } catch (error) {
-    res.status(500).json({ error: error.message });
+// GET - Top N of a ranking from memory
+app.get('/api/leaderboard/:type/top', (req, res) => {
+  const leaderboard = leaderboards[req.params.type];
+  if (!leaderboard) {
+    return res.status(404).json({ error: 'Unknown ranking type' });
   }
+  const limit = Math.min(Math.max(parseInt(req.query.limit) || 10, 1), 200);
+  res.json({ entries: leaderboard.top(limit), total: leaderboard.size() });
 });
 
-app.get('/api/rankings/level', (req, res) => {
-  try {
-    const rankings = getAllByLevel.all();
-    res.json(rankings);
-  } catch (error) {
-    res.status(500).json({ error: error.message });
+// GET - Ranks [start, start + count) of a ranking from memory (rank board pages)
+app.get('/api/leaderboard/:type/range', (req, res) => {
+  const leaderboard = leaderboards[req.params.type];
+  if (!leaderboard) {
+    return res.status(404).json({ error: 'Unknown ranking type' });
   }
+  const start = Math.max(parseInt(req.query.start) || 0, 0);
+  const count = Math.min(Math.max(parseInt(req.query.count) || 50, 1), 200);
+  res.json({ entries: leaderboard.range(start, count), total: leaderboard.size() });
 });
 
-app.get('/api/rankings/dungeon', (req, res) => {
+// GET - A player's rank plus neighbours on each side
+app.get('/api/leaderboard/:type/around/:id', (req, res) => {
+  const leaderboard = leaderboards[req.params.type];
+  if (!leaderboard) {
+    return res.status(404).json({ error: 'Unknown ranking type' });
+  }
+  const radius = Math.min(Math.max(parseInt(req.query.radius) || 5, 0), 100);
+  const around = leaderboard.around(parseInt(req.params.id), radius);
+  if (!around) {
+    return res.status(404).json({ error: 'Player not found' });
+  }
+  res.json({ ...around, total: leaderboard.size() });
+});
+
+// GET - Ranking page for the rank board (keyset pagination)
+// Query: limit (default 50, max 200), afterValue + afterId = nextCursor of the previous page
+app.get('/api/rankings/:type', (req, res) => {
   try {
-    const rankings = getAllByDungeonLevel.all();
-    res.json(rankings);
+    const pages = rankingPages[req.params.type];
+    if (!pages) {
+      return res.status(404).json({ error: 'Unknown ranking type' });
+    }
+
+    const limit = Math.min(Math.max(parseInt(req.query.limit) || 50, 1), 200);
+    const hasCursor = req.query.afterValue !== undefined && req.query.afterId !== undefined;
+    const entries = hasCursor
+      ? pages.after.all({ limit, value: parseInt(req.query.afterValue), id: parseInt(req.query.afterId) })
+      : pages.first.all({ limit });
+
+    const last = entries[entries.length - 1];
+    res.json({
+      entries,
+      nextCursor: entries.length === limit ? { value: last.value, id: last.id } : null,
+      total: countPlayers.get().total
+    });
   } catch (error) {
     res.status(500).json({ error: error.message });
   }
@@ -392,27 +653,100 @@ io.on("connection", (socket) => {
   socket.on('join', (args) => {
     args = JSON.parse(args);
     
-    if(!players.find(player => player.playerId === args.playerId)) {
-      players.push({
+    if(!playersById.has(args.playerId)) {
+      const player = {
         playerId: args.playerId,
         playerPosition: args.playerPosition,
-      });
+      };
+      players.push(player);
+      playersById.set(args.playerId, player);
 
       playerToSocket.set(args.playerId, socket.id);
-      io.emit('joined', players);  
+      socket.data.moves = { playerId: args.playerId, seq: args.seq || 0, budget: MOVE_BURST, refilledAt: Date.now() };
+      enterMap(socket, player, args.mapId || DEFAULT_MAP);
+    }
+  });
+
+  socket.on('change_map', (args) => {
+    args = JSON.parse(args);
+
+    const player = playersById.get(args.playerId);
+    const state = socket.data.moves;
+    // Only the socket that joined as this player moves it
+    if (!player || !state || state.playerId !== args.playerId) {
+      return;
+    }
+
+    // Only a real change to a map the player can be on, and the player lands on its
+    // arrival point: anything else would be a move that skipped isValidMove
+    const arrival = player.mapId !== args.mapId ? mapArrival(args.playerId, args.mapId) : null;
+    if (arrival) {
+      player.playerPosition = [...arrival];
+      leaveMap(socket, player);
+      enterMap(socket, player, args.mapId);
+    } else {
+      state.rejected = (state.rejected || 0) + 1;
     }
+
+    // The client numbers map changes like moves, its moves after it start from
+    // here; a refused one is acked with the current position
+    if (Number.isInteger(args.seq) && args.seq > state.seq) {
+      state.seq = args.seq;
+    }
+    pendingAcks.add(socket);
   });
 
   socket.on("move", (args) => {
     args = JSON.parse(args);
 
-    const playerIndex = players.findIndex(p => p.playerId === args.playerId);
+    const player = playersById.get(args.playerId);
+    const state = socket.data.moves;
+    // Only the socket that joined as this player moves it
+    if (!player || !state || state.playerId !== args.playerId) {
+      return;
+    }
+
+    // A rejected move is still acked: the client goes back to the position in the ack
+    if (isValidMove(state, player, args.playerPosition, Date.now())) {
+      player.playerPosition = args.playerPosition;
+      getPending(pendingMoves, player.mapId, Map).set(args.playerId, args.playerPosition);
+    } else {
+      state.rejected = (state.rejected || 0) + 1;
+    }
+    if (Number.isInteger(args.seq) && args.seq > state.seq) {
+      state.seq = args.seq;
+    }
+    pendingAcks.add(socket);
+  });
+
+  // Rank board: the client says which window of which ranking it shows and gets
+  // it pushed whenever ranks in it change
+  socket.on('rank_watch', (args) => {
+    const { playerId, type, start, count } = JSON.parse(args);
+    if (!leaderboards[type]) {
+      return;
+    }
 
-    if (playerIndex !== -1) {
-      players[playerIndex].playerPosition = args.playerPosition;
+    const previous = socket.data.rankWatch;
+    if (previous && previous.type !== type) {
+      socket.leave(rankingRoom(previous.type));
     }
+    socket.data.rankWatch = {
+      playerId,
+      type,
+      start: Math.max(parseInt(start) || 0, 0),
+      count: Math.min(Math.max(parseInt(count) || 10, 1), 200)
+    };
+    socket.join(rankingRoom(type));
+    socket.emit('rank_update', rankingSnapshot(type, socket.data.rankWatch));
+  });
 
-    io.emit('moved', players);
+  socket.on('rank_unwatch', () => {
+    const watch = socket.data.rankWatch;
+    if (watch) {
+      socket.leave(rankingRoom(watch.type));
+      socket.data.rankWatch = null;
+    }
   });
 
   // Party System Events
@@ -777,11 +1111,19 @@ io.on("connection", (socket) => {
     }
   });
 
+  // Socket round trip for the client's perf overlay: ack with whatever was sent
+  socket.on('latency_ping', (sentAt, ack) => {
+    if (typeof ack === 'function') {
+      ack(sentAt);
+    }
+  });
+
   socket.on('disconnect', () => {
     // Remove player from tracking
     const disconnectedPlayer = Array.from(playerToSocket.entries())
       .find(([_, socketId]) => socketId === socket.id);
     
+    pendingAcks.delete(socket);
     if (disconnectedPlayer) {
       const playerId = disconnectedPlayer[0];
       playerToSocket.delete(playerId);
@@ -789,8 +1131,10 @@ io.on("connection", (socket) => {
       // Remove from players array
       const playerIndex = players.findIndex(p => p.playerId === playerId);
       if (playerIndex !== -1) {
+        const player = players[playerIndex];
         players.splice(playerIndex, 1);
-        io.emit('joined', players);
+        playersById.delete(playerId);
+        leaveMap(null, player);
       }
     }
   });
@@ -0,0 +1,234 @@
+// In-memory ranking kept sorted by (score DESC, id DESC), the same order as the
+// SQL ranking pages. It's an indexable skip list: every link stores how many
+// entries it skips, so insert, remove, rank lookup and rank -> entry are all
+// O(log n) and a window of k entries costs O(log n + k).
+
+const MAX_LEVEL = 32;
+const LEVEL_PROBABILITY = 0.25;
+
+class Node {
+  constructor(level, id, score, data) {
+    this.id = id;
+    this.score = score;
+    this.data = data;
+    this.next = new Array(level).fill(null);
+    this.span = new Array(level).fill(0);
+  }
+}
+
+// True if node sorts before the (id, score) key
+function precedes(node, id, score) {
+  return node.score > score || (node.score === score && node.id > id);
+}
+
+class Leaderboard {
+  constructor() {
+    this.head = new Node(MAX_LEVEL, null, Infinity, null);
+    this.level = 1;
+    this.length = 0;
+    this.nodes = new Map(); // id -> node
+
+    // Scratch arrays reused by set/remove
+    this.update = new Array(MAX_LEVEL);
+    this.rank = new Array(MAX_LEVEL);
+  }
+
+  randomLevel() {
+    let level = 1;
+    while (level < MAX_LEVEL && Math.random() < LEVEL_PROBABILITY) {
+      level++;
+    }
+    return level;
+  }
+
+  // Replace the contents with entries already in ranking order, in O(n) (startup load)
+  load(entries) {
+    this.head = new Node(MAX_LEVEL, null, Infinity, null);
+    this.level = 1;
+    this.nodes.clear();
+
+    // Last node linked on each level and its 1-based position (the head is 0)
+    const tails = new Array(MAX_LEVEL).fill(this.head);
+    const tailPositions = new Array(MAX_LEVEL).fill(0);
+    let position = 0;
+    for (const { id, score, data } of entries) {
+      position++;
+      const level = this.randomLevel();
+      const node = new Node(level, id, score, data);
+      for (let i = 0; i < level; i++) {
+        tails[i].next[i] = node;
+        tails[i].span[i] = position - tailPositions[i];
+        tails[i] = node;
+        tailPositions[i] = position;
+      }
+      this.level = Math.max(this.level, level);
+      this.nodes.set(id, node);
+    }
+
+    // The last link on each level spans to the end of the list
+    for (let i = 0; i < MAX_LEVEL; i++) {
+      tails[i].span[i] = position - tailPositions[i];
+    }
+    this.length = position;
+  }
+
+  // Add or move an entry, returns its new 0-based rank
+  set(id, score, data) {
+    const existing = this.nodes.get(id);
+    if (existing) {
+      if (existing.score === score) {
+        existing.data = data;
+        return this.rankOf(id);
+      }
+      this.remove(id);
+    }
+
+    const update = this.update;
+    const rank = this.rank;
+    let x = this.head;
+    for (let i = this.level - 1; i >= 0; i--) {
+      rank[i] = i === this.level - 1 ? 0 : rank[i + 1];
+      while (x.next[i] && precedes(x.next[i], id, score)) {
+        rank[i] += x.span[i];
+        x = x.next[i];
+      }
+      update[i] = x;
+    }
+
+    const level = this.randomLevel();
+    if (level > this.level) {
+      for (let i = this.level; i < level; i++) {
+        rank[i] = 0;
+        update[i] = this.head;
+        this.head.span[i] = this.length;
+      }
+      this.level = level;
+    }
+
+    const node = new Node(level, id, score, data);
+    for (let i = 0; i < level; i++) {
+      node.next[i] = update[i].next[i];
+      update[i].next[i] = node;
+      node.span[i] = update[i].span[i] - (rank[0] - rank[i]);
+      update[i].span[i] = rank[0] - rank[i] + 1;
+    }
+    for (let i = level; i < this.level; i++) {
+      update[i].span[i]++;
+    }
+
+    this.length++;
+    this.nodes.set(id, node);
+    return rank[0];
+  }
+
+  remove(id) {
+    const node = this.nodes.get(id);
+    if (!node) {
+      return false;
+    }
+
+    const update = this.update;
+    let x = this.head;
+    for (let i = this.level - 1; i >= 0; i--) {
+      while (x.next[i] && precedes(x.next[i], node.id, node.score)) {
+        x = x.next[i];
+      }
+      update[i] = x;
+    }
+
+    for (let i = 0; i < this.level; i++) {
+      if (update[i].next[i] === node) {
+        update[i].span[i] += node.span[i] - 1;
+        update[i].next[i] = node.next[i];
+      } else {
+        update[i].span[i]--;
+      }
+    }
+    while (this.level > 1 && this.head.next[this.level - 1] === null) {
+      this.level--;
+    }
+
+    this.length--;
+    this.nodes.delete(id);
+    return true;
+  }
+
+  getScore(id) {
+    const node = this.nodes.get(id);
+    return node ? node.score : undefined;
+  }
+
+  // 0-based rank of an entry, or -1
+  rankOf(id) {
+    const node = this.nodes.get(id);
+    if (!node) {
+      return -1;
+    }
+
+    let rank = 0;
+    let x = this.head;
+    for (let i = this.level - 1; i >= 0; i--) {
+      while (x.next[i] && (precedes(x.next[i], node.id, node.score) || x.next[i] === node)) {
+        rank += x.span[i];
+        x = x.next[i];
+      }
+      if (x === node) {
+        return rank - 1;
+      }
+    }
+    return -1;
+  }
+
+  // Node at a 0-based rank, or null
+  nodeAt(rank) {
+    if (rank < 0 || rank >= this.length) {
+      return null;
+    }
+
+    let traversed = 0;
+    let x = this.head;
+    for (let i = this.level - 1; i >= 0; i--) {
+      while (x.next[i] && traversed + x.span[i] <= rank + 1) {
+        traversed += x.span[i];
+        x = x.next[i];
+      }
+      if (traversed === rank + 1) {
+        return x;
+      }
+    }
+    return null;
+  }
+
+  // Entries from a 0-based rank, each with its rank and score as value
+  range(start, count) {
+    const entries = [];
+    let node = this.nodeAt(Math.max(0, start));
+    let rank = Math.max(0, start);
+    while (node && entries.length < count) {
+      entries.push({ ...node.data, value: node.score, rank });
+      node = node.next[0];
+      rank++;
+    }
+    return entries;
+  }
+
+  top(count) {
+    return this.range(0, count);
+  }
+
+  // An entry's rank plus `radius` neighbours on each side
+  around(id, radius) {
+    const rank = this.rankOf(id);
+    if (rank === -1) {
+      return null;
+    }
+    const start = Math.max(0, rank - radius);
+    return { rank, entries: this.range(start, rank - start + radius + 1) };
+  }
+
+  size() {
+    return this.length;
+  }
+}
+
+module.exports = { Leaderboard };